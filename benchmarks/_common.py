@@ -0,0 +1,76 @@
+"""Helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import numpy as np
+
+import pop2net as p2n
+
+
+def add_locations(
+    env: p2n.Environment,
+    actors: list,
+    sizes: list[int],
+    labels: list[str] | None = None,
+    shuffle: bool = True,
+    weighted: bool = False,
+    seed: int = 1,
+) -> None:
+    """Add one location of each size per actor to an environment.
+
+    Args:
+        env: The environment.
+        actors: The actors of the environment.
+        sizes: The number of actors per location, one entry for each kind of location.
+        labels: The label of each kind of location. Defaults to None.
+        shuffle: Whether the actors are assigned to the locations in random order. If False,
+            consecutive actors share a location. Defaults to True.
+        weighted: Whether the memberships get random weights instead of 1. Defaults to False.
+        seed: The seed of the random number generator. Defaults to 1.
+    """
+    rng = np.random.default_rng(seed)
+    n_actors = len(actors)
+    actor_ids = np.array([actor.id_p2n for actor in actors])
+    location_ids = []
+    for i, size in enumerate(sizes):
+        locations = [p2n.Location() for _ in range(-(-n_actors // size))]
+        if labels is not None:
+            for location in locations:
+                location.label = labels[i]
+        env.add_locations(locations)
+        ids = np.array([location.id_p2n for location in locations])
+        order = rng.permutation(n_actors) if shuffle else np.arange(n_actors)
+        location_ids.append(ids[order // size])
+    weights = rng.random(len(sizes) * n_actors) if weighted else 1
+    env.add_memberships(np.tile(actor_ids, len(sizes)), np.concatenate(location_ids), weights)
+
+
+def build_env(
+    n_actors: int,
+    sizes: list[int],
+    backend: str = "networkx",
+    labels: list[str] | None = None,
+    shuffle: bool = True,
+    weighted: bool = False,
+    **kwargs,
+) -> p2n.Environment:
+    """Create an environment in which every actor has one location of each size.
+
+    Args:
+        n_actors: The number of actors.
+        sizes: The number of actors per location, one entry for each kind of location.
+        backend: The network backend. Defaults to "networkx".
+        labels: The label of each kind of location. Defaults to None.
+        shuffle: Whether the actors are assigned to the locations in random order.
+            Defaults to True.
+        weighted: Whether the memberships get random weights instead of 1. Defaults to False.
+        **kwargs: Further arguments of the environment.
+
+    Returns:
+        The environment.
+    """
+    env = p2n.Environment(backend=backend, **kwargs)
+    actors = [p2n.Actor() for _ in range(n_actors)]
+    env.add_actors(actors)
+    add_locations(env, actors, sizes, labels=labels, shuffle=shuffle, weighted=weighted)
+    return env
@@ -0,0 +1,64 @@
+"""Benchmark k-hop reachability queries.
+
+Compares `Environment.actors_within()` with a breadth-first search built from repeated
+`Actor.neighbors()` calls on a population in which every actor has a household, a school and a
+workplace.
+
+Run with:
+
+    python benchmarks/bench_actors_within.py --n-actors 50000 --hops 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from _common import build_env
+
+
+def repeated_neighbors(sources: list, hops: int) -> set:
+    """Explore the network with one `neighbors()` call per reached actor."""
+    visited = set(sources)
+    frontier = list(sources)
+    for _ in range(hops):
+        next_frontier = []
+        for actor in frontier:
+            for neighbor in actor.neighbors():
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return visited - set(sources)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=50_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 200, 20])
+    parser.add_argument("--hops", type=int, default=2)
+    parser.add_argument("--n-sources", type=int, default=10)
+    parser.add_argument("--backend", choices=["networkx", "sparse"], default="networkx")
+    args = parser.parse_args()
+
+    env = build_env(args.n_actors, args.sizes, args.backend)
+    print(f"{env.n_actors} actors, {env.n_locations} locations")
+    sources = env.actors[: args.n_sources]
+
+    expected, t_naive = _timed(lambda: repeated_neighbors(sources, args.hops))
+    reached, t_bfs = _timed(lambda: env.actors_within(sources, args.hops))
+    assert set(reached) == expected
+    print(f"{len(reached)} actors within {args.hops} hops of {len(sources)} actors")
+    print(f"repeated neighbors() {t_naive:8.3f} s")
+    print(f"actors_within()      {t_bfs:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark disconnecting a large group of actors.
+
+Quarantines a random group of actors in a population in which every actor has a household and a
+school, i.e. removes the group from all locations that at least two of its members share.
+
+Run with:
+
+    python benchmarks/bench_disconnect.py --n-actors 100000 --group-size 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+
+from _common import build_env
+import numpy as np
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=100_000)
+    parser.add_argument("--group-size", type=int, default=3000)
+    parser.add_argument("--household-size", type=int, default=4)
+    parser.add_argument("--school-size", type=int, default=500)
+    args = parser.parse_args()
+
+    for backend in ["networkx", "sparse"]:
+        env = build_env(
+            args.n_actors,
+            [args.household_size, args.school_size],
+            backend=backend,
+            labels=["Household", "School"],
+            enable_p2n_warnings=False,
+        )
+        rng = np.random.default_rng(2)
+        actors = env.actors
+        group = [
+            actors[i] for i in rng.choice(len(actors), args.group_size, replace=False).tolist()
+        ]
+        n_memberships = env._backend.number_of_edges()
+
+        gc.collect()
+        start = time.perf_counter()
+        env.disconnect_actors(group)
+        elapsed = time.perf_counter() - start
+        removed = n_memberships - env._backend.number_of_edges()
+        print(
+            f"{backend:<9} disconnected {len(group)} actors in {elapsed * 1000:8.1f} ms, "
+            f"{removed} memberships removed"
+        )
+        del env, actors, group
+
+
+if __name__ == "__main__":
+    main()
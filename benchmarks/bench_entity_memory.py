@@ -0,0 +1,86 @@
+"""Benchmark the memory used per actor and location.
+
+Compares `Actor`/`Location` with the slotted `CompactActor`/`CompactLocation` bases. For each
+class, the bytes per entity are measured with `tracemalloc`, once for the objects alone and once
+after adding them to an environment with the sparse backend.
+
+Run with:
+
+    python benchmarks/bench_entity_memory.py --n 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+
+import pop2net as p2n
+
+
+class Person(p2n.Actor):
+    """An actor with an instance dict."""
+
+
+class CompactPerson(p2n.CompactActor):
+    """A slotted actor."""
+
+    __slots__ = ()
+
+
+class Home(p2n.Location):
+    """A location with an instance dict."""
+
+
+class CompactHome(p2n.CompactLocation):
+    """A slotted location."""
+
+    __slots__ = ()
+
+
+def _bytes_per_entity(func, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    result = func()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return (end - start) / n
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.n
+
+    def create(cls):
+        return [cls() for _ in range(n)]
+
+    def create_in_env(cls, add):
+        env = p2n.Environment(backend="sparse")
+        objects = [cls() for _ in range(n)]
+        add(env, objects)
+        return env
+
+    cases = {
+        "Actor": (Person, p2n.Environment.add_actors),
+        "CompactActor": (CompactPerson, p2n.Environment.add_actors),
+        "Location": (Home, p2n.Environment.add_locations),
+        "CompactLocation": (CompactHome, p2n.Environment.add_locations),
+    }
+
+    print(f"{n} entities per class")
+    for name, (cls, add) in cases.items():
+        objects_only = _bytes_per_entity(lambda cls=cls: create(cls), n)
+        in_env = _bytes_per_entity(lambda cls=cls, add=add: create_in_env(cls, add), n)
+        print(
+            f"{name:<16} objects={objects_only:7.1f} bytes/entity  "
+            f"in environment={in_env:7.1f} bytes/entity"
+        )
+
+
+if __name__ == "__main__":
+    main()
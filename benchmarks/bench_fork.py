@@ -0,0 +1,95 @@
+"""Benchmark forking an environment.
+
+Compares `Environment.fork()` with `copy.deepcopy()` on a population of columnar actors with a
+household and a school each, stored in the sparse backend. After branching, one percent of the
+weights and ages are changed in the branch, which copies the changed arrays.
+
+Run with:
+
+    python benchmarks/bench_fork.py --n-actors 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import time
+import tracemalloc
+
+from _common import add_locations
+import numpy as np
+import pandas as pd
+
+import pop2net as p2n
+
+
+def build_env(n_actors: int, household_size: int, school_size: int) -> p2n.Environment:
+    """Create an environment in which every actor has a household and a school."""
+    rng = np.random.default_rng(1)
+    env = p2n.Environment(backend="sparse", enable_p2n_warnings=False)
+    creator = p2n.Creator(env=env)
+    df = pd.DataFrame(
+        {"age": rng.integers(0, 90, n_actors), "income": rng.normal(2000, 500, n_actors)}
+    )
+    actors = creator.create_actors(df=df, columnar=True)
+
+    add_locations(env, actors, [household_size, school_size], shuffle=False, weighted=True)
+    return env
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _allocated(func):
+    # megabytes allocated by func that are still in use afterwards
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, memory / 1e6
+
+
+def _change(env: p2n.Environment, fraction: float) -> None:
+    """Change the weights and ages of a fraction of the actors in their households."""
+    rng = np.random.default_rng(2)
+    actors = env.actors
+    n = int(len(actors) * fraction)
+    selected = [actors[i] for i in rng.choice(len(actors), n, replace=False).tolist()]
+    for actor in selected:
+        actor.age += 1
+    homes = [actor.locations[0] for actor in selected]
+    env.set_weights(selected, homes, 0.5)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=200_000)
+    parser.add_argument("--household-size", type=int, default=4)
+    parser.add_argument("--school-size", type=int, default=500)
+    parser.add_argument("--changed", type=float, default=0.01)
+    args = parser.parse_args()
+
+    env = build_env(args.n_actors, args.household_size, args.school_size)
+    print(f"{env.n_actors} actors, {env.n_locations} locations")
+
+    for name, branch in [("fork", lambda: env.fork()), ("deepcopy", lambda: copy.deepcopy(env))]:
+        child, t_branch = _timed(branch)
+        _, t_change = _timed(lambda child=child: _change(child, args.changed))
+        del child
+        child, m_branch = _allocated(branch)
+        _, m_change = _allocated(lambda child=child: _change(child, args.changed))
+        del child
+        print(
+            f"{name:<9} branch={t_branch:6.2f} s {m_branch:8.1f} MB  "
+            f"change {args.changed:.0%}={t_change:6.2f} s {m_change:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
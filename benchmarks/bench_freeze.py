@@ -0,0 +1,78 @@
+"""Benchmark parallel steps on a frozen environment.
+
+Every actor counts its neighbors and records the count as an attribute. The serial step reads
+`Actor.neighbors()` from the environment. The parallel step reads a frozen snapshot from a
+thread pool, records the changes in one `MutationBuffer` per chunk of actors and applies the
+buffers with `Environment.apply_mutations()`.
+
+Run with:
+
+    python benchmarks/bench_freeze.py --n-actors 50000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from _common import build_env
+
+import pop2net as p2n
+
+
+def serial_step(env: p2n.Environment) -> None:
+    """Count the neighbors of every actor one after another."""
+    for actor in env.actors:
+        actor.n_neighbors = len(actor.neighbors())
+
+
+def parallel_step(env: p2n.Environment, workers: int) -> None:
+    """Count the neighbors on a frozen snapshot and apply the buffered changes."""
+    frozen = env.freeze()
+
+    def step(chunk: range) -> p2n.MutationBuffer:
+        buffer = p2n.MutationBuffer()
+        for index in chunk:
+            buffer.set_attribute(
+                int(frozen.actor_ids[index]), "n_neighbors", len(frozen.neighbor_indices(index))
+            )
+        return buffer
+
+    size = -(-frozen.n_actors // (workers * 4))
+    chunks = [range(i, min(i + size, frozen.n_actors)) for i in range(0, frozen.n_actors, size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        buffers = list(pool.map(step, chunks))
+    env.apply_mutations(buffers)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=50_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 20])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backend", choices=["networkx", "sparse"], default="networkx")
+    args = parser.parse_args()
+
+    env = build_env(args.n_actors, args.sizes, args.backend)
+    print(f"{env.n_actors} actors, {env.n_locations} locations")
+
+    t_serial = _timed(lambda: serial_step(env))
+    expected = [actor.n_neighbors for actor in env.actors]
+    t_freeze = _timed(env.freeze)
+    t_parallel = _timed(lambda: parallel_step(env, args.workers))
+    assert [actor.n_neighbors for actor in env.actors] == expected
+    print(f"serial step          {t_serial:8.3f} s")
+    print(f"freeze()             {t_freeze:8.3f} s")
+    print(f"frozen parallel step {t_parallel:8.3f} s (including freeze)")
+
+
+if __name__ == "__main__":
+    main()
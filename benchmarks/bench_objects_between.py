@@ -0,0 +1,103 @@
+"""Benchmark the lookup of connecting objects between two entities.
+
+Compares the adjacency intersection used by `Environment.locations_between_actors` and
+`Environment.actors_between_locations` with the former path enumeration via
+`networkx.all_simple_paths(cutoff=2)` on a dense household/school network.
+
+Run with:
+
+    python benchmarks/bench_objects_between.py --n-actors 5000 --school-size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import networkx as nx
+
+import pop2net as p2n
+
+
+def build_env(n_actors: int, household_size: int, school_size: int) -> p2n.Environment:
+    """Create an environment in which every actor has a household and a school."""
+
+    class Household(p2n.LocationDesigner):
+        n_actors = household_size
+
+    class School(p2n.LocationDesigner):
+        n_actors = school_size
+
+    env = p2n.Environment(enable_p2n_warnings=False)
+    creator = p2n.Creator(env=env, seed=1)
+    creator.create_actors(n=n_actors)
+    creator.create_locations(location_designers=[Household, School])
+    return env
+
+
+def paths_between(env: p2n.Environment, object1, object2) -> list:
+    """The former implementation based on path enumeration."""
+    paths = nx.all_simple_paths(G=env.g, source=object1.id_p2n, target=object2.id_p2n, cutoff=2)
+    return [env.g.nodes[path[1]]["_obj"] for path in paths]
+
+
+def _time_per_pair(func, pairs: list) -> float:
+    start = time.perf_counter()
+    for a, b in pairs:
+        func(a, b)
+    return (time.perf_counter() - start) / len(pairs)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=5000)
+    parser.add_argument("--household-size", type=int, default=4)
+    parser.add_argument("--school-size", type=int, default=500)
+    parser.add_argument("--n-pairs", type=int, default=2000)
+    args = parser.parse_args()
+
+    env = build_env(args.n_actors, args.household_size, args.school_size)
+    rng = random.Random(1)
+
+    # pairs of co-located actors, so that there is something to find
+    actor_pairs = []
+    for _ in range(args.n_pairs):
+        actor = rng.choice(env.actors)
+        neighbors = actor.neighbors()
+        actor_pairs.append((actor, rng.choice(neighbors) if neighbors else rng.choice(env.actors)))
+
+    schools = env.locations_by_label("School")
+    location_pairs = [tuple(rng.sample(list(schools), 2)) for _ in range(args.n_pairs // 10)]
+
+    cases = {
+        "locations_between_actors": (
+            actor_pairs,
+            lambda a, b: env._locations_between_actors(a, b),
+        ),
+        "actors_between_locations": (
+            location_pairs,
+            lambda a, b: env._objects_between_objects(a, b, [env._actors]),
+        ),
+    }
+
+    print(f"{env.n_actors} actors, {env.n_locations} locations, {env.g.number_of_edges()} edges")
+    for name, (pairs, intersect) in cases.items():
+        for a, b in pairs:
+            assert {o.id_p2n for o in intersect(a, b)} == {
+                o.id_p2n for o in paths_between(env, a, b)
+            }
+
+        t_paths = _time_per_pair(lambda a, b: paths_between(env, a, b), pairs)
+        t_intersect = _time_per_pair(intersect, pairs)
+        print(
+            f"{name:<28} pairs={len(pairs):<6} "
+            f"all_simple_paths={t_paths * 1e6:9.1f} us/pair  "
+            f"intersection={t_intersect * 1e6:7.1f} us/pair  "
+            f"speedup={t_paths / t_intersect:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark partitioning a population into shards.
+
+Partitions a population in which every actor has a household, a school and a workplace,
+keeping the households intact, and compares the edge cut with a random assignment of whole
+households to shards.
+
+Run with:
+
+    python benchmarks/bench_partition.py --n-actors 100000 --n-shards 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from _common import add_locations
+from _common import build_env
+import numpy as np
+
+import pop2net as p2n
+
+
+def random_edge_cut(env: p2n.Environment, household_size: int, n_shards: int) -> int:
+    """Return the edge cut of assigning whole households to random shards."""
+    rng = np.random.default_rng(2)
+    n_households = -(-env.n_actors // household_size)
+    actor_shards = rng.integers(0, n_shards, n_households)[
+        np.arange(env.n_actors) // household_size
+    ]
+    actor_ids, location_ids, _ = env._backend.memberships(env._actors)
+    rows = env.actor_indices(env._actors[i] for i in actor_ids.tolist())
+    cols = env.location_indices(env._locations[i] for i in location_ids.tolist())
+    counts = np.zeros((env.n_locations, n_shards), dtype=np.int64)
+    np.add.at(counts, (cols, actor_shards[rows]), 1)
+    return int((actor_shards[rows] != counts.argmax(axis=1)[cols]).sum())
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=100_000)
+    parser.add_argument("--household-size", type=int, default=4)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 20])
+    parser.add_argument("--n-shards", type=int, default=8)
+    args = parser.parse_args()
+
+    env = build_env(
+        args.n_actors,
+        [args.household_size],
+        backend="sparse",
+        labels=["Household"],
+        shuffle=False,
+    )
+    add_locations(env, env.actors, args.sizes)
+    print(f"{env.n_actors} actors, {env.n_locations} locations")
+
+    start = time.perf_counter()
+    partition = env.partition(args.n_shards, keep_together=["Household"])
+    t_partition = time.perf_counter() - start
+    print(f"partition()      {t_partition:8.3f} s")
+    print(f"edge cut         {partition.edge_cut:8d} (balance {partition.balance:.3f})")
+    print(f"random edge cut  {random_edge_cut(env, args.household_size, args.n_shards):8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark drawing weighted random contacts for every actor.
+
+Compares three ways to draw k contacts per actor, weighted by the contact weights, on a
+population in which every actor has a household and a school:
+
+- `neighbors()` plus `get_actor_weight()` for each neighbor and `random.choices()`,
+- `Actor.sample_neighbors()` for each actor,
+- one call of `Environment.sample_neighbors_bulk()` for the whole population.
+
+The first tick of the sampling methods builds the weight tables, later ticks reuse them.
+
+Run with:
+
+    python benchmarks/bench_sample_neighbors.py --n-actors 10000 --backend sparse
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from _common import build_env
+import numpy as np
+
+import pop2net as p2n
+
+
+def naive(env: p2n.Environment, k: int, rng: random.Random) -> list:
+    """Draw the contacts of every actor with the neighbor and weight queries."""
+    contacts = []
+    for actor in env.actors:
+        neighbors = actor.neighbors()
+        weights = [actor.get_actor_weight(neighbor) for neighbor in neighbors]
+        contacts.append(rng.choices(neighbors, weights=weights, k=k))
+    return contacts
+
+
+def per_actor(env: p2n.Environment, k: int, rng: np.random.Generator) -> list:
+    """Draw the contacts of every actor with `Actor.sample_neighbors()`."""
+    return [actor.sample_neighbors(k, rng=rng) for actor in env.actors]
+
+
+def bulk(env: p2n.Environment, k: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw the contacts of all actors with one call."""
+    return env.sample_neighbors_bulk(None, k, rng=rng)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=10_000)
+    parser.add_argument("--household-size", type=int, default=4)
+    parser.add_argument("--school-size", type=int, default=50)
+    parser.add_argument("--backend", choices=["networkx", "sparse"], default="sparse")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--ticks", type=int, default=3)
+    args = parser.parse_args()
+
+    env = build_env(
+        args.n_actors,
+        [args.household_size, args.school_size],
+        backend=args.backend,
+        labels=["Household", "School"],
+        weighted=True,
+    )
+    print(f"{env.n_actors} actors, {env.n_locations} locations, k={args.k}")
+
+    for name, method, rng in [
+        ("naive", naive, random.Random(2)),
+        ("per actor", per_actor, np.random.default_rng(2)),
+        ("bulk", bulk, np.random.default_rng(2)),
+    ]:
+        env.clear_weight_cache()
+        times = [
+            _timed(lambda method=method, rng=rng: method(env, args.k, rng))
+            for _ in range(args.ticks)
+        ]
+        print(f"{name:<10} first tick={times[0]:8.3f} s  later ticks={min(times[1:]):8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
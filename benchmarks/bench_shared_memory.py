@@ -0,0 +1,78 @@
+"""Benchmark the startup of worker processes with shared memory.
+
+Compares passing the whole environment to every worker of a process pool with passing a
+`SharedEnvironment` created by `Environment.to_shared_memory()`, which only pickles the name
+of its shared memory block. Every worker answers neighbor queries for a chunk of actors.
+
+Run with:
+
+    python benchmarks/bench_shared_memory.py --n-actors 100000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+import time
+
+from _common import build_env
+import numpy as np
+
+_state = None
+
+
+def _initialize(state) -> None:
+    global _state
+    _state = state
+
+
+def _total_neighbor_age_env(chunk: range) -> int:
+    actors = _state.actors
+    return sum(sum(neighbor.age for neighbor in actors[i].neighbors()) for i in chunk)
+
+
+def _total_neighbor_age_shared(chunk: range) -> int:
+    ages = _state.actor_attribute("age")
+    return sum(int(ages[_state.neighbor_indices(i)].sum()) for i in chunk)
+
+
+def run_pool(state, func, n_actors: int, workers: int) -> tuple[int, float]:
+    """Return the result and the time needed to start the pool and process all actors."""
+    size = -(-n_actors // workers)
+    chunks = [range(i, min(i + size, n_actors)) for i in range(0, n_actors, size)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_initialize, initargs=(state,)) as pool:
+        total = sum(pool.map(func, chunks))
+    return total, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=100_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 20])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    env = build_env(args.n_actors, args.sizes)
+    rng = np.random.default_rng(1)
+    for actor, age in zip(env.actors, rng.integers(0, 90, args.n_actors).tolist()):
+        actor.age = age
+    print(f"{env.n_actors} actors, {env.n_locations} locations, {args.workers} workers")
+
+    start = time.perf_counter()
+    with env.to_shared_memory(attributes=["age"]) as shared:
+        t_share = time.perf_counter() - start
+        print(f"pickled environment   {len(pickle.dumps(env)) / 1e6:10.2f} MB")
+        print(f"pickled shared handle {len(pickle.dumps(shared)) / 1e6:10.6f} MB")
+        print(f"to_shared_memory()    {t_share:8.3f} s")
+        expected, t_env = run_pool(env, _total_neighbor_age_env, args.n_actors, args.workers)
+        total, t_shared = run_pool(shared, _total_neighbor_age_shared, args.n_actors, args.workers)
+    assert total == expected
+    print(f"pool with environment {t_env:8.3f} s")
+    print(f"pool with shared      {t_shared:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
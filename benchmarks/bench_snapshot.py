@@ -0,0 +1,88 @@
+"""Benchmark saving and loading an environment.
+
+Compares `Environment.save()`/`Environment.load()` with pickling the whole environment on a
+population in which every actor has a few attributes, a household and a school.
+
+Run with:
+
+    python benchmarks/bench_snapshot.py --n-actors 100000 --backend sparse
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import pickle
+import tempfile
+import time
+
+from _common import build_env
+import numpy as np
+
+import pop2net as p2n
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=100_000)
+    parser.add_argument("--household-size", type=int, default=4)
+    parser.add_argument("--school-size", type=int, default=500)
+    parser.add_argument("--backend", choices=["networkx", "sparse"], default="sparse")
+    args = parser.parse_args()
+
+    env = build_env(
+        args.n_actors,
+        [args.household_size, args.school_size],
+        backend=args.backend,
+        labels=["Household", "School"],
+        shuffle=False,
+        weighted=True,
+    )
+    rng = np.random.default_rng(1)
+    for actor, age, income in zip(
+        env.actors,
+        rng.integers(0, 90, args.n_actors).tolist(),
+        rng.normal(2000, 500, args.n_actors).tolist(),
+    ):
+        actor.age = age
+        actor.income = income
+        actor.status = "adult" if age >= 18 else "child"
+    print(f"{env.n_actors} actors, {env.n_locations} locations")
+
+    with tempfile.TemporaryDirectory() as directory:
+        npz_path = Path(directory) / "env.npz"
+        pickle_path = Path(directory) / "env.pickle"
+
+        def dump():
+            with pickle_path.open("wb") as file:
+                pickle.dump(env, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def undump():
+            with pickle_path.open("rb") as file:
+                return pickle.load(file)
+
+        _, t_save = _timed(lambda: env.save(npz_path))
+        loaded, t_load = _timed(lambda: p2n.Environment.load(npz_path))
+        assert loaded.n_actors == env.n_actors
+        _, t_dump = _timed(dump)
+        _, t_undump = _timed(undump)
+
+        for name, t_write, t_read, path in [
+            ("save/load", t_save, t_load, npz_path),
+            ("pickle", t_dump, t_undump, pickle_path),
+        ]:
+            print(
+                f"{name:<10} write={t_write:7.2f} s  read={t_read:7.2f} s  "
+                f"size={path.stat().st_size / 1e6:8.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark read-only views of actors and locations.
+
+Compares environments returning new containers with environments created with
+`lazy_views=True` on typical read-only queries: counting the actors, iterating over the
+members of every location and testing whether an actor is a neighbor of another one. With
+mesa, every container is an `AgentSet`.
+
+Run with:
+
+    python benchmarks/bench_views.py --n-actors 20000 --framework mesa
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+import pop2net as p2n
+
+
+def build_env(n_actors: int, location_size: int, framework: str, lazy_views: bool):
+    """Create an environment in which every actor has one location."""
+    if framework == "mesa":
+        import mesa
+
+        class Actor(p2n.Actor, mesa.Agent):
+            pass
+
+        class Location(p2n.Location, mesa.Agent):
+            pass
+
+        model = mesa.Model()
+        env = p2n.Environment(model=model, framework="mesa", lazy_views=lazy_views)
+        actors = list(Actor.create_agents(model=model, n=n_actors))
+        locations = list(Location.create_agents(model=model, n=-(-n_actors // location_size)))
+    else:
+        env = p2n.Environment(lazy_views=lazy_views)
+        actors = [p2n.Actor() for _ in range(n_actors)]
+        locations = [p2n.Location() for _ in range(-(-n_actors // location_size))]
+
+    env.add_actors(actors)
+    env.add_locations(locations)
+    actor_ids = np.array([actor.id_p2n for actor in actors])
+    location_ids = np.array([location.id_p2n for location in locations])
+    env.add_memberships(actor_ids, location_ids[np.arange(n_actors) // location_size])
+    return env
+
+
+def queries(env: p2n.Environment, repeat: int) -> dict:
+    """Time the queries."""
+    actors = list(env._actors.values())
+    locations = list(env._locations.values())
+    times = {}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        len(env.actors)
+    times["len(env.actors)"] = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for location in locations:
+        for _ in location.actors:
+            pass
+    times["iterate location.actors"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for actor, other in zip(actors, actors[1:]):
+        _ = other in actor.neighbors()
+    times["other in actor.neighbors()"] = time.perf_counter() - start
+    return times
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-actors", type=int, default=20_000)
+    parser.add_argument("--location-size", type=int, default=10)
+    parser.add_argument("--framework", choices=["none", "mesa"], default="none")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+    for lazy_views in [False, True]:
+        env = build_env(args.n_actors, args.location_size, args.framework, lazy_views)
+        results[lazy_views] = queries(env, args.repeat)
+
+    print(f"{args.n_actors} actors, framework={args.framework}")
+    for name in results[False]:
+        print(f"{name:<28} lists={results[False][name]:8.4f} s  views={results[True][name]:8.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,41 @@
 """Pop2net. An extension package for location-based simulations based on AgentPy."""
 
 from .actor import Actor
+from .actor import CompactActor
 from .creator import Creator
 from .entity_list import EntityList
+from .entity_list import EntityView
 from .environment import Environment
+from .exceptions import JournalOverflowError
 from .exceptions import Pop2netException
+from .frozen import FrozenEnvironment
+from .frozen import MutationBuffer
 from .inspector import NetworkInspector
+from .location import CompactLocation
 from .location import Location
 from .location_designer import LocationDesigner
 from .location_designer import MeltLocationDesigner
+from .partition import Partition
+from .shared import SharedEnvironment
 
 # from .sequences import LocationList
 
 __all__ = [
     "Actor",
+    "CompactActor",
+    "CompactLocation",
     "EntityList",
+    "EntityView",
+    "FrozenEnvironment",
+    "JournalOverflowError",
     "Pop2netException",
     "Location",
     "LocationDesigner",
     "MeltLocationDesigner",
+    "MutationBuffer",
     "NetworkInspector",
+    "Partition",
+    "SharedEnvironment",
     "Environment",
     "LocationList",
     "Creator",
@@ -9,20 +9,10 @@ if typing.TYPE_CHECKING:
     from . import location as _location
 
 
-class Actor:
-    """This is a Base class to represent actors in the simulation.
+class ActorBase:
+    """The methods shared by `Actor` and `CompactActor`."""
 
-    Actors' behavior can be implemented in classes that inherit from this.
-    """
-
-    def __init__(self, *args, **kwargs) -> None:
-        """Actor Constructor."""
-        self.env = None
-        self.id_p2n = None
-        self.model = None
-        self.type = type(self).__name__
-
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def neighbors(self, location_labels: list[str] | None = None) -> list:
         """Return all neighbors of an actor.
@@ -38,6 +28,33 @@ class Actor:
         """
         return self.env.neighbors_of_actor(self, location_labels=location_labels)
 
+    def sample_neighbors(
+        self,
+        k: int,
+        location_labels: list[str] | None = None,
+        weighted: bool = True,
+        rng=None,
+    ) -> list:
+        """Draw k random neighbors of this actor, with replacement.
+
+        If weighted is True, the neighbors are drawn proportional to their contact weights.
+        See `Environment.sample_neighbors()`.
+
+        Args:
+            k: The number of draws.
+            location_labels: A list of location_labels.
+            weighted: Should the neighbors be drawn proportional to their contact weights?
+                Defaults to True.
+            rng (numpy.random.Generator | int | None, optional): A random number generator or a
+                seed. Defaults to None.
+
+        Returns:
+            The drawn neighbors.
+        """
+        return self.env.sample_neighbors(
+            self, k, location_labels=location_labels, weighted=weighted, rng=rng
+        )
+
     def shared_locations(self, actor, location_labels: list[str] | None = None) -> list:
         """Returns all locations that this actor shares with another actor.
         Use location_labels to specify which type of locations should be included in the search
@@ -84,7 +101,7 @@ class Actor:
         Args:
             location: Remove actor from this location.
         """
-        self.env.remove_actor_from_location(self, location)
+        self.env.remove_actor_from_location(location=location, actor=self)
 
     def remove_locations(self, locations: list) -> None:
         """Remove this Actor from the given locations.
@@ -92,7 +109,7 @@ class Actor:
         Args:
             locations (list): A list of location instances.
         """
-        for location in locations:
+        for location in list(locations):
             self.remove_location(location)
 
     @property
@@ -126,10 +143,7 @@ class Actor:
         Returns:
             A weight of the contact between the two actors.
         """
-        weight = 0
-        for location in self.shared_locations(actor=actor, location_labels=location_labels):
-            weight += location.project_weights(actor1=self, actor2=actor)
-        return weight
+        return self.env._actor_weight(self, actor, location_labels=location_labels)
 
     def get_location_weight(self, location) -> float:
         """Return the edge weight between this actor and a given location.
@@ -200,7 +214,7 @@ class Actor:
                     msg = (
                         "There are other actors at the location from which you have removed actors."
                     )
-                    warnings.warn(msg)
+                    warnings.warn(msg, stacklevel=2)
 
             if remove_neighbor:
                 location.remove_actor(neighbor)
@@ -209,11 +223,53 @@ class Actor:
                     msg = (
                         "There are other actors at the location from which you have removed actors."
                     )
-                    warnings.warn(msg)
+                    warnings.warn(msg, stacklevel=2)
 
             if remove_locations:
                 self.env.remove_location(location)
 
                 if warn:
                     msg = "You have removed a location to which other actors were still connected."
-                    warnings.warn(msg)
+                    warnings.warn(msg, stacklevel=2)
+
+
+class Actor(ActorBase):
+    """This is a Base class to represent actors in the simulation.
+
+    Actors' behavior can be implemented in classes that inherit from this.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Actor Constructor."""
+        self.env = None
+        self.id_p2n = None
+        self.model = None
+        self.type = type(self).__name__
+
+        super().__init__(*args, **kwargs)
+
+
+class CompactActor(ActorBase):
+    """A memory-efficient base class for actors in simulations without a framework.
+
+    The core fields are stored in `__slots__` instead of an instance dict and `type` is a class
+    attribute. Subclasses must declare `__slots__` for their own attributes to keep instances
+    free of an instance dict; subclasses without `__slots__` work like `Actor`.
+    CompactActors cannot be used together with agentpy or mesa.
+    """
+
+    __slots__ = ("env", "id_p2n", "model")
+
+    type = "CompactActor"
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Set the `type` of each subclass to its name."""
+        super().__init_subclass__(**kwargs)
+        if "type" not in cls.__dict__:
+            cls.type = cls.__name__
+
+    def __init__(self) -> None:
+        """CompactActor Constructor."""
+        self.env = None
+        self.id_p2n = None
+        self.model = None
@@ -0,0 +1,768 @@
+"""Storage backends for the bipartite network of an Environment.
+
+A backend stores which actor is affiliated with which location (the memberships) and the
+weights of these memberships. The Environment keeps the actor and location objects itself and
+refers to them by their `id_p2n` when talking to the backend.
+"""
+
+from __future__ import annotations
+
+import copy
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+
+class NetworkxBackend:
+    """Stores the bipartite network as a networkx graph.
+
+    This is the default backend. The graph is used directly as `Environment.g`.
+    """
+
+    name = "networkx"
+
+    def __init__(self) -> None:
+        """Create an empty backend."""
+        self.graph = nx.Graph()
+        # The raw adjacency dict avoids the per-lookup overhead of networkx's AtlasView.
+        self._adj = self.graph._adj
+
+    def add_actor(self, actor_id: int, actor) -> None:
+        """Add an actor node without memberships."""
+        self.graph.add_node(actor_id, bipartite=0, _obj=actor)
+
+    def add_location(self, location_id: int, location) -> None:
+        """Add a location node without memberships."""
+        self.graph.add_node(location_id, bipartite=1, _obj=location)
+
+    def add_actors(self, actor_ids: list, actors: list) -> None:
+        """Add many actor nodes without memberships."""
+        add_node = self.graph.add_node
+        for actor_id, actor in zip(actor_ids, actors):
+            add_node(actor_id, bipartite=0, _obj=actor)
+
+    def add_locations(self, location_ids: list, locations: list) -> None:
+        """Add many location nodes without memberships."""
+        add_node = self.graph.add_node
+        for location_id, location in zip(location_ids, locations):
+            add_node(location_id, bipartite=1, _obj=location)
+
+    def remove_node(self, node_id: int) -> None:
+        """Remove an actor or location node together with all its memberships."""
+        self.graph.remove_node(node_id)
+
+    def fork(self, actors: dict, locations: dict) -> NetworkxBackend:
+        """Return a copy of the backend whose nodes refer to the given objects.
+
+        networkx graphs cannot share their adjacency dicts, so the graph is copied.
+        """
+        child = NetworkxBackend()
+        objects = {**actors, **locations}
+        child.graph.add_nodes_from(
+            (node_id, {**data, "_obj": objects[node_id]})
+            for node_id, data in self.graph.nodes(data=True)
+        )
+        child.graph.add_edges_from(self.graph.edges(data=True))
+        return child
+
+    def add_edge(self, actor_id: int, location_id: int, **attrs) -> None:
+        """Add a membership. Additional keyword arguments are stored as edge attributes."""
+        self.graph.add_edge(actor_id, location_id, **attrs)
+
+    def add_edges(self, actor_ids: np.ndarray, location_ids: np.ndarray, weights) -> np.ndarray:
+        """Add or update many memberships at once and return which of them are new.
+
+        All ids have to exist and each pair may only occur once. The adjacency dicts are written
+        directly, which skips the per-edge node checks of `nx.Graph.add_edges_from()`.
+        """
+        adj = self._adj
+        added = np.zeros(len(actor_ids), dtype=bool)
+        for i, (actor_id, location_id, weight) in enumerate(
+            zip(actor_ids.tolist(), location_ids.tolist(), weights)
+        ):
+            neighbors = adj[actor_id]
+            data = neighbors.get(location_id)
+            if data is None:
+                data = {}
+                neighbors[location_id] = data
+                adj[location_id][actor_id] = data
+                added[i] = True
+            data["weight"] = weight
+        return added
+
+    def remove_edge(self, actor_id: int, location_id: int) -> None:
+        """Remove a membership if it exists."""
+        if self.graph.has_edge(actor_id, location_id):
+            self.graph.remove_edge(actor_id, location_id)
+
+    def remove_nodes(self, node_ids) -> None:
+        """Remove many actor or location nodes together with all their memberships."""
+        self.graph.remove_nodes_from(node_ids)
+
+    def remove_edges(self, actor_ids: np.ndarray, location_ids: np.ndarray) -> int:
+        """Remove many memberships at once and return how many of them existed."""
+        adj = self._adj
+        n_removed = 0
+        for actor_id, location_id in zip(actor_ids.tolist(), location_ids.tolist()):
+            if adj[actor_id].pop(location_id, None) is not None:
+                del adj[location_id][actor_id]
+                n_removed += 1
+        return n_removed
+
+    def compact(self) -> None:
+        """Release unused storage. The networkx graph does not hold any."""
+
+    def has_edge(self, actor_id: int, location_id: int) -> bool:
+        """Check whether an actor is affiliated with a location."""
+        return location_id in self._adj.get(actor_id, ())
+
+    def neighbors(self, node_id: int):
+        """Return the ids of the nodes connected to the given node."""
+        return self._adj[node_id]
+
+    def degree(self, node_id: int) -> int:
+        """Return the number of memberships of the given node."""
+        return len(self._adj[node_id])
+
+    def common_neighbors(self, node_id1: int, node_id2: int):
+        """Return the ids of the nodes connected to both given nodes."""
+        neighbors1 = self._adj[node_id1]
+        neighbors2 = self._adj[node_id2]
+        if len(neighbors2) < len(neighbors1):
+            neighbors1, neighbors2 = neighbors2, neighbors1
+        return (node for node in neighbors1 if node in neighbors2)
+
+    def get_weight(self, actor_id: int, location_id: int) -> float:
+        """Return the weight of a membership."""
+        return self._adj[actor_id][location_id]["weight"]
+
+    def set_weight(self, actor_id: int, location_id: int, weight: float) -> None:
+        """Set the weight of a membership."""
+        self._adj[actor_id][location_id]["weight"] = weight
+
+    def get_weights(self, actor_ids: np.ndarray, location_ids: np.ndarray) -> np.ndarray:
+        """Return the weights of many memberships as an array."""
+        adj = self._adj
+        return np.asarray(
+            [
+                adj[actor_id][location_id]["weight"]
+                for actor_id, location_id in zip(actor_ids.tolist(), location_ids.tolist())
+            ]
+        )
+
+    def set_weights(self, actor_ids: np.ndarray, location_ids: np.ndarray, weights) -> None:
+        """Set the weights of many memberships."""
+        adj = self._adj
+        if isinstance(weights, np.ndarray):
+            weights = weights.tolist()
+        for actor_id, location_id, weight in zip(
+            actor_ids.tolist(), location_ids.tolist(), weights
+        ):
+            adj[actor_id][location_id]["weight"] = weight
+
+    def memberships_of(self, location_ids) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the actor ids, location ids and weights of the memberships of some locations."""
+        adj = self._adj
+        actor_ids = []
+        member_location_ids = []
+        weights = []
+        for location_id in location_ids:
+            for actor_id, data in adj[location_id].items():
+                actor_ids.append(actor_id)
+                member_location_ids.append(location_id)
+                weights.append(data["weight"])
+        return (
+            np.asarray(actor_ids, dtype=np.int64),
+            np.asarray(member_location_ids, dtype=np.int64),
+            np.asarray(weights),
+        )
+
+    def number_of_edges(self) -> int:
+        """Return the number of memberships."""
+        return self.graph.number_of_edges()
+
+    def memberships(self, actors: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the actor ids, location ids and weights of all memberships as arrays."""
+        adj = self._adj
+        n = self.graph.number_of_edges()
+        actor_ids = np.empty(n, dtype=np.int64)
+        location_ids = np.empty(n, dtype=np.int64)
+        weights = np.empty(n, dtype=np.float64)
+        i = 0
+        for actor_id in actors:
+            for location_id, data in adj[actor_id].items():
+                actor_ids[i] = actor_id
+                location_ids[i] = location_id
+                weights[i] = data["weight"]
+                i += 1
+        return actor_ids[:i], location_ids[:i], weights[:i]
+
+    def edge_data(self, actors: dict) -> tuple[list, list[dict] | None]:
+        """Return the weights and other edge attributes of all memberships.
+
+        The memberships are in the order of `memberships()`. The weights keep their Python types.
+        The other attributes are None if no membership has any.
+        """
+        adj = self._adj
+        weights = []
+        attributes = []
+        for actor_id in actors:
+            for data in adj[actor_id].values():
+                weights.append(data["weight"])
+                attributes.append({key: value for key, value in data.items() if key != "weight"})
+        return weights, attributes if any(attributes) else None
+
+    def to_networkx(self, actors: dict, locations: dict) -> nx.Graph:  # noqa: ARG002
+        """Return the bipartite network as a networkx graph."""
+        return self.graph
+
+
+class SparseBackend:
+    """Stores the bipartite network as a sparse incidence matrix.
+
+    Each actor is a row and each location is a column of the matrix. The memberships are kept
+    in flat numpy arrays (row, column, weight) indexed by an internal edge id. A CSR matrix (the
+    locations of an actor) and a CSC matrix (the actors of a location) whose data is the edge id
+    + 1 make lookups slice operations. Memberships added after the last rebuild of the matrices
+    are kept in small pending dicts and removed memberships are only marked as dead, so that
+    single mutations do not require rebuilding the matrices.
+
+    This needs a fraction of the memory networkx needs per membership. Weights have to be
+    numeric. The networkx graph is only created when it is requested and is a read-only snapshot.
+
+    Forked backends share their arrays and dicts. Each of them copies a shared array or dict the
+    first time it writes to it.
+    """
+
+    name = "sparse"
+
+    # minimum number of pending or dead memberships before the matrices are rebuilt
+    rebuild_threshold = 4096
+
+    # the state that is shared with forked backends until it is written to
+    _forked_state = (
+        "_actor_pos",
+        "_actor_ids",
+        "_location_pos",
+        "_location_ids",
+        "_edge_row",
+        "_edge_col",
+        "_alive",
+        "_weights",
+        "_edge_attrs",
+        "_pending_rows",
+        "_pending_cols",
+    )
+
+    def __init__(self) -> None:
+        """Create an empty backend."""
+        # row and column positions of the actors and locations (-1 marks a removed entity)
+        self._actor_pos: dict[int, int] = {}
+        self._actor_ids = np.empty(0, dtype=np.int64)
+        self._n_rows = 0
+        self._location_pos: dict[int, int] = {}
+        self._location_ids = np.empty(0, dtype=np.int64)
+        self._n_cols = 0
+
+        # membership arrays, indexed by edge id
+        self._n_edges = 0
+        self._edge_row = np.empty(0, dtype=np.int64)
+        self._edge_col = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._weights = np.empty(0, dtype=np.float64)
+        self._edge_attrs: dict[int, dict] = {}
+        self._n_dead = 0
+
+        # compressed indexes over the edges [0, self._n_indexed)
+        self._csr = sp.csr_matrix((0, 0), dtype=np.int64)
+        self._csc = sp.csc_matrix((0, 0), dtype=np.int64)
+        # sorted (row, col) keys of the CSR matrix for bulk lookups, built on first use
+        self._csr_keys: np.ndarray | None = None
+        self._n_indexed = 0
+
+        # edges added after the last rebuild: row -> {col: edge id} and col -> {row: edge id}
+        self._pending_rows: dict[int, dict[int, int]] = {}
+        self._pending_cols: dict[int, dict[int, int]] = {}
+
+        self._graph: nx.Graph | None = None
+
+        # names of the arrays and dicts that are shared with a forked backend
+        self._shared: set[str] = set()
+
+    @staticmethod
+    def _grow(array: np.ndarray, size: int) -> np.ndarray:
+        if size <= len(array):
+            return array
+        new = np.zeros(max(size, 2 * len(array), 16), dtype=array.dtype)
+        new[: len(array)] = array
+        return new
+
+    def _own(self, *names: str) -> None:
+        """Copy the given arrays or dicts if they are shared with a forked backend."""
+        if not self._shared:
+            return
+        for name in names:
+            if name not in self._shared:
+                continue
+            self._shared.discard(name)
+            value = getattr(self, name)
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            elif name in ("_edge_attrs", "_pending_rows", "_pending_cols"):
+                value = {key: dict(inner) for key, inner in value.items()}
+            else:
+                value = dict(value)
+            setattr(self, name, value)
+
+    def _own_edges(self) -> None:
+        self._own(
+            "_edge_row",
+            "_edge_col",
+            "_alive",
+            "_weights",
+            "_edge_attrs",
+            "_pending_rows",
+            "_pending_cols",
+        )
+
+    def fork(self, actors: dict, locations: dict) -> SparseBackend:  # noqa: ARG002
+        """Return a backend that shares all arrays with this one until either of them changes.
+
+        The compressed matrices are never changed in place, so they are always shared.
+        """
+        child = copy.copy(self)
+        child._graph = None
+        self._shared = set(self._forked_state)
+        child._shared = set(self._forked_state)
+        return child
+
+    def _slice(self, matrix, position: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the alive (positions, edge ids) of a CSR row or a CSC column."""
+        indptr = matrix.indptr
+        if position + 1 >= len(indptr):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        start, stop = indptr[position], indptr[position + 1]
+        edges = matrix.data[start:stop] - 1
+        alive = self._alive[edges]
+        return matrix.indices[start:stop][alive], edges[alive]
+
+    def _row(self, row: int) -> tuple[np.ndarray, np.ndarray]:
+        cols, edges = self._slice(self._csr, row)
+        pending = self._pending_rows.get(row)
+        if pending:
+            cols = np.concatenate([cols, np.fromiter(pending.keys(), np.int64, len(pending))])
+            edges = np.concatenate([edges, np.fromiter(pending.values(), np.int64, len(pending))])
+        return cols, edges
+
+    def _col(self, col: int) -> tuple[np.ndarray, np.ndarray]:
+        rows, edges = self._slice(self._csc, col)
+        pending = self._pending_cols.get(col)
+        if pending:
+            rows = np.concatenate([rows, np.fromiter(pending.keys(), np.int64, len(pending))])
+            edges = np.concatenate([edges, np.fromiter(pending.values(), np.int64, len(pending))])
+        return rows, edges
+
+    def _find_edge(self, row: int, col: int) -> int | None:
+        pending = self._pending_rows.get(row)
+        if pending is not None and col in pending:
+            return pending[col]
+        indptr = self._csr.indptr
+        if row + 1 < len(indptr):
+            start, stop = indptr[row], indptr[row + 1]
+            if start == stop:
+                return None
+            pos = start + self._csr.indices[start:stop].searchsorted(col)
+            if pos < stop and self._csr.indices[pos] == col:
+                edge = int(self._csr.data[pos]) - 1
+                if self._alive[edge]:
+                    return edge
+        return None
+
+    def _indexed_keys(self) -> np.ndarray:
+        """Return the sorted (row, col) keys of the CSR matrix, computed once per rebuild."""
+        if self._csr_keys is None:
+            n_cols = max(self._csr.shape[1], 1)
+            rows = np.repeat(np.arange(self._csr.shape[0]), np.diff(self._csr.indptr))
+            self._csr_keys = rows * n_cols + self._csr.indices
+        return self._csr_keys
+
+    def _find_edges(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Return the alive edge ids of many (row, col) pairs, -1 if a pair has no edge."""
+        edges = np.full(len(rows), -1, dtype=np.int64)
+
+        # the CSR matrix is sorted by (row, col), so its keys can be searched directly
+        indexed_keys = self._indexed_keys()
+        if len(indexed_keys):
+            n_rows, n_cols = self._csr.shape
+            indexed = np.flatnonzero((rows < n_rows) & (cols < n_cols))
+            keys = rows[indexed] * n_cols + cols[indexed]
+            pos = np.minimum(np.searchsorted(indexed_keys, keys), len(indexed_keys) - 1)
+            hit = indexed_keys[pos] == keys
+            candidates = self._csr.data[pos[hit]] - 1
+            alive = self._alive[candidates]
+            edges[indexed[hit][alive]] = candidates[alive]
+
+        # memberships added since the last rebuild are only in the pending dicts
+        if self._pending_rows:
+            pending_rows = self._pending_rows
+            for i in np.flatnonzero(edges < 0).tolist():
+                pending = pending_rows.get(int(rows[i]))
+                if pending is not None:
+                    edges[i] = pending.get(int(cols[i]), -1)
+        return edges
+
+    def _edge(self, actor_id: int, location_id: int) -> int:
+        edge = self._find_edge(self._actor_pos[actor_id], self._location_pos[location_id])
+        if edge is None:
+            raise KeyError((actor_id, location_id))
+        return edge
+
+    def _kill_edges(self, edges) -> None:
+        self._own("_alive", "_edge_attrs")
+        self._alive[edges] = False
+        self._n_dead += len(edges)
+        if self._edge_attrs:
+            for edge in np.asarray(edges).tolist():
+                self._edge_attrs.pop(edge, None)
+
+    def _changed(self) -> None:
+        self._graph = None
+        threshold = max(self.rebuild_threshold, self._n_indexed // 4)
+        if self._n_edges - self._n_indexed > threshold or self._n_dead > threshold:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Drop dead memberships and rebuild the compressed matrices."""
+        keep = np.flatnonzero(self._alive[: self._n_edges])
+        if self._edge_attrs:
+            new_edges = np.full(self._n_edges, -1, dtype=np.int64)
+            new_edges[keep] = np.arange(len(keep))
+            self._own("_edge_attrs")
+            self._edge_attrs = {
+                int(new_edges[edge]): attrs for edge, attrs in self._edge_attrs.items()
+            }
+
+        self._edge_row = self._edge_row[keep]
+        self._edge_col = self._edge_col[keep]
+        self._weights = self._weights[keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._n_edges = len(keep)
+        self._n_dead = 0
+
+        self._csr = sp.csr_matrix(
+            (np.arange(1, self._n_edges + 1), (self._edge_row, self._edge_col)),
+            shape=(self._n_rows, self._n_cols),
+        )
+        self._csr.sort_indices()
+        self._csr_keys = None
+        self._csc = self._csr.tocsc()
+        self._csc.sort_indices()
+        self._n_indexed = self._n_edges
+        self._pending_rows = {}
+        self._pending_cols = {}
+        # the edge arrays were replaced by new ones
+        self._shared -= {"_edge_row", "_edge_col", "_alive", "_weights"}
+        self._shared -= {"_pending_rows", "_pending_cols"}
+
+    def add_actor(self, actor_id: int, actor) -> None:  # noqa: ARG002
+        """Add an actor node without memberships."""
+        self._own("_actor_pos", "_actor_ids")
+        self._actor_ids = self._grow(self._actor_ids, self._n_rows + 1)
+        self._actor_ids[self._n_rows] = actor_id
+        self._actor_pos[actor_id] = self._n_rows
+        self._n_rows += 1
+        self._graph = None
+
+    def add_location(self, location_id: int, location) -> None:  # noqa: ARG002
+        """Add a location node without memberships."""
+        self._own("_location_pos", "_location_ids")
+        self._location_ids = self._grow(self._location_ids, self._n_cols + 1)
+        self._location_ids[self._n_cols] = location_id
+        self._location_pos[location_id] = self._n_cols
+        self._n_cols += 1
+        self._graph = None
+
+    def add_actors(self, actor_ids: list, actors: list) -> None:  # noqa: ARG002
+        """Add many actor nodes without memberships."""
+        self._own("_actor_pos", "_actor_ids")
+        n = len(actor_ids)
+        self._actor_ids = self._grow(self._actor_ids, self._n_rows + n)
+        self._actor_ids[self._n_rows : self._n_rows + n] = actor_ids
+        self._actor_pos.update(zip(actor_ids, range(self._n_rows, self._n_rows + n)))
+        self._n_rows += n
+        self._graph = None
+
+    def add_locations(self, location_ids: list, locations: list) -> None:  # noqa: ARG002
+        """Add many location nodes without memberships."""
+        self._own("_location_pos", "_location_ids")
+        n = len(location_ids)
+        self._location_ids = self._grow(self._location_ids, self._n_cols + n)
+        self._location_ids[self._n_cols : self._n_cols + n] = location_ids
+        self._location_pos.update(zip(location_ids, range(self._n_cols, self._n_cols + n)))
+        self._n_cols += n
+        self._graph = None
+
+    def remove_node(self, node_id: int) -> None:
+        """Remove an actor or location node together with all its memberships."""
+        self._own("_actor_pos", "_actor_ids", "_location_pos", "_location_ids")
+        self._own_edges()
+        if node_id in self._actor_pos:
+            row = self._actor_pos.pop(node_id)
+            cols, edges = self._row(row)
+            for col in self._pending_rows.pop(row, {}):
+                del self._pending_cols[col][row]
+            self._actor_ids[row] = -1
+        else:
+            col = self._location_pos.pop(node_id)
+            rows, edges = self._col(col)
+            for row in self._pending_cols.pop(col, {}):
+                del self._pending_rows[row][col]
+            self._location_ids[col] = -1
+        self._kill_edges(edges)
+        self._changed()
+
+    def add_edge(self, actor_id: int, location_id: int, **attrs) -> None:
+        """Add a membership. Additional keyword arguments are stored as edge attributes."""
+        self._own_edges()
+        row = self._actor_pos[actor_id]
+        col = self._location_pos[location_id]
+        edge = self._find_edge(row, col)
+        if edge is None:
+            edge = self._n_edges
+            size = edge + 1
+            if size > len(self._alive):
+                self._edge_row = self._grow(self._edge_row, size)
+                self._edge_col = self._grow(self._edge_col, size)
+                self._alive = self._grow(self._alive, size)
+                self._weights = self._grow(self._weights, size)
+            self._edge_row[edge] = row
+            self._edge_col[edge] = col
+            self._alive[edge] = True
+            self._weights[edge] = np.nan
+            self._n_edges = size
+            self._pending_rows.setdefault(row, {})[col] = edge
+            self._pending_cols.setdefault(col, {})[row] = edge
+        if "weight" in attrs:
+            self._weights[edge] = attrs.pop("weight")
+        if attrs:
+            self._edge_attrs.setdefault(edge, {}).update(attrs)
+        self._changed()
+
+    def add_edges(self, actor_ids: np.ndarray, location_ids: np.ndarray, weights) -> np.ndarray:
+        """Add or update many memberships at once and return which of them are new.
+
+        All ids have to exist and each pair may only occur once. The matrices are rebuilt once
+        for the whole batch instead of collecting the new memberships as pending ones.
+        """
+        rows = np.fromiter(map(self._actor_pos.__getitem__, actor_ids.tolist()), np.int64)
+        cols = np.fromiter(map(self._location_pos.__getitem__, location_ids.tolist()), np.int64)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), rows.shape)
+        edges = self._find_edges(rows, cols)
+        self._own_edges()
+        existing = edges >= 0
+        self._weights[edges[existing]] = weights[existing]
+
+        added = ~existing
+        n_added = int(added.sum())
+        if n_added:
+            start = self._n_edges
+            size = start + n_added
+            self._edge_row = self._grow(self._edge_row, size)
+            self._edge_col = self._grow(self._edge_col, size)
+            self._alive = self._grow(self._alive, size)
+            self._weights = self._grow(self._weights, size)
+            self._edge_row[start:size] = rows[added]
+            self._edge_col[start:size] = cols[added]
+            self._alive[start:size] = True
+            self._weights[start:size] = weights[added]
+            self._n_edges = size
+            self.rebuild()
+        self._graph = None
+        return added
+
+    def remove_edge(self, actor_id: int, location_id: int) -> None:
+        """Remove a membership if it exists."""
+        row = self._actor_pos[actor_id]
+        col = self._location_pos[location_id]
+        edge = self._find_edge(row, col)
+        if edge is not None:
+            self._own_edges()
+            pending = self._pending_rows.get(row)
+            if pending is not None and col in pending:
+                del pending[col]
+                del self._pending_cols[col][row]
+            self._kill_edges([edge])
+            self._changed()
+
+    def remove_nodes(self, node_ids) -> None:
+        """Remove many actor or location nodes together with all their memberships."""
+        self._own("_actor_pos", "_actor_ids", "_location_pos", "_location_ids")
+        removed_rows = np.zeros(self._n_rows, dtype=bool)
+        removed_cols = np.zeros(self._n_cols, dtype=bool)
+        for node_id in node_ids:
+            if node_id in self._actor_pos:
+                removed_rows[self._actor_pos.pop(node_id)] = True
+            else:
+                removed_cols[self._location_pos.pop(node_id)] = True
+        self._actor_ids[: self._n_rows][removed_rows] = -1
+        self._location_ids[: self._n_cols][removed_cols] = -1
+
+        n = self._n_edges
+        removed = self._alive[:n] & (
+            removed_rows[self._edge_row[:n]] | removed_cols[self._edge_col[:n]]
+        )
+        self._kill_edges(np.flatnonzero(removed))
+        if self._n_edges > self._n_indexed:
+            # pending dicts may still refer to the removed memberships
+            self.rebuild()
+        else:
+            self._changed()
+
+    def remove_edges(self, actor_ids: np.ndarray, location_ids: np.ndarray) -> int:
+        """Remove many memberships at once and return how many of them existed."""
+        rows = np.fromiter(map(self._actor_pos.__getitem__, actor_ids.tolist()), np.int64)
+        cols = np.fromiter(map(self._location_pos.__getitem__, location_ids.tolist()), np.int64)
+        edges = self._find_edges(rows, cols)
+        edges = np.unique(edges[edges >= 0])
+        pending = edges[edges >= self._n_indexed]
+        if len(pending):
+            self._own("_pending_rows", "_pending_cols")
+            for row, col in zip(self._edge_row[pending].tolist(), self._edge_col[pending].tolist()):
+                del self._pending_rows[row][col]
+                del self._pending_cols[col][row]
+        self._kill_edges(edges)
+        self._changed()
+        return len(edges)
+
+    def compact(self) -> None:
+        """Drop removed memberships and rebuild the compressed matrices."""
+        self.rebuild()
+
+    def has_edge(self, actor_id: int, location_id: int) -> bool:
+        """Check whether an actor is affiliated with a location."""
+        row = self._actor_pos.get(actor_id)
+        col = self._location_pos.get(location_id)
+        return row is not None and col is not None and self._find_edge(row, col) is not None
+
+    def neighbors(self, node_id: int) -> list[int]:
+        """Return the ids of the nodes connected to the given node."""
+        if node_id in self._actor_pos:
+            cols, _ = self._row(self._actor_pos[node_id])
+            return self._location_ids[cols].tolist()
+        rows, _ = self._col(self._location_pos[node_id])
+        return self._actor_ids[rows].tolist()
+
+    def degree(self, node_id: int) -> int:
+        """Return the number of memberships of the given node."""
+        if node_id in self._actor_pos:
+            return len(self._row(self._actor_pos[node_id])[0])
+        return len(self._col(self._location_pos[node_id])[0])
+
+    def common_neighbors(self, node_id1: int, node_id2: int) -> list[int]:
+        """Return the ids of the nodes connected to both given nodes."""
+        neighbors1 = self.neighbors(node_id1)
+        neighbors2 = set(self.neighbors(node_id2))
+        return [node for node in neighbors1 if node in neighbors2]
+
+    def get_weight(self, actor_id: int, location_id: int) -> float:
+        """Return the weight of a membership."""
+        return self._weights[self._edge(actor_id, location_id)].item()
+
+    def set_weight(self, actor_id: int, location_id: int, weight: float) -> None:
+        """Set the weight of a membership."""
+        edge = self._edge(actor_id, location_id)
+        self._own("_weights")
+        self._weights[edge] = weight
+        self._graph = None
+
+    def _edges(self, actor_ids: np.ndarray, location_ids: np.ndarray) -> np.ndarray:
+        """Return the edge ids of many memberships and raise a KeyError if one does not exist."""
+        rows = np.fromiter(map(self._actor_pos.__getitem__, actor_ids.tolist()), np.int64)
+        cols = np.fromiter(map(self._location_pos.__getitem__, location_ids.tolist()), np.int64)
+        edges = self._find_edges(rows, cols)
+        missing = np.flatnonzero(edges < 0)
+        if len(missing):
+            raise KeyError((int(actor_ids[missing[0]]), int(location_ids[missing[0]])))
+        return edges
+
+    def get_weights(self, actor_ids: np.ndarray, location_ids: np.ndarray) -> np.ndarray:
+        """Return the weights of many memberships as an array."""
+        edges = self._edges(actor_ids, location_ids)
+        return self._weights[edges]
+
+    def set_weights(self, actor_ids: np.ndarray, location_ids: np.ndarray, weights) -> None:
+        """Set the weights of many memberships."""
+        edges = self._edges(actor_ids, location_ids)
+        self._own("_weights")
+        self._weights[edges] = weights
+        self._graph = None
+
+    def memberships_of(self, location_ids) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the actor ids, location ids and weights of the memberships of some locations."""
+        if self._n_edges > self._n_indexed:
+            self.rebuild()
+        cols = np.fromiter(map(self._location_pos.__getitem__, location_ids), np.int64)
+        indptr = self._csc.indptr
+        if len(indptr) <= self._n_cols:
+            # locations added since the last rebuild have no indexed memberships
+            indptr = np.r_[indptr, np.full(self._n_cols + 1 - len(indptr), indptr[-1])]
+        starts = indptr[cols]
+        sizes = indptr[cols + 1] - starts
+        # positions of all entries of the selected columns in the CSC arrays
+        positions = np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        edges = self._csc.data[positions] - 1
+        alive = self._alive[edges]
+        edges = edges[alive]
+        return (
+            self._actor_ids[self._csc.indices[positions][alive]],
+            self._location_ids[np.repeat(cols, sizes)[alive]],
+            self._weights[edges],
+        )
+
+    def number_of_edges(self) -> int:
+        """Return the number of memberships."""
+        return self._n_edges - self._n_dead
+
+    def memberships(self, actors: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:  # noqa: ARG002
+        """Return the actor ids, location ids and weights of all memberships as arrays."""
+        edges = np.flatnonzero(self._alive[: self._n_edges])
+        return (
+            self._actor_ids[self._edge_row[edges]],
+            self._location_ids[self._edge_col[edges]],
+            self._weights[edges],
+        )
+
+    def edge_data(self, actors: dict) -> tuple[np.ndarray, list[dict] | None]:
+        """Return the weights and other edge attributes of all memberships.
+
+        The memberships are in the order of `memberships()`. The other attributes are None if
+        no membership has any.
+        """
+        edges = np.flatnonzero(self._alive[: self._n_edges])
+        _, _, weights = self.memberships(actors)
+        if not self._edge_attrs:
+            return weights, None
+        return weights, [self._edge_attrs.get(edge, {}) for edge in edges.tolist()]
+
+    def to_networkx(self, actors: dict, locations: dict) -> nx.Graph:
+        """Return the bipartite network as a networkx graph."""
+        if self._graph is not None:
+            return self._graph
+
+        graph = nx.Graph()
+        graph.add_nodes_from((i, {"bipartite": 0, "_obj": actor}) for i, actor in actors.items())
+        graph.add_nodes_from(
+            (i, {"bipartite": 1, "_obj": location}) for i, location in locations.items()
+        )
+        edges = np.flatnonzero(self._alive[: self._n_edges])
+        actor_ids = self._actor_ids[self._edge_row[edges]].tolist()
+        location_ids = self._location_ids[self._edge_col[edges]].tolist()
+        weights = self._weights[edges].tolist()
+        for edge, actor_id, location_id, weight in zip(
+            edges.tolist(), actor_ids, location_ids, weights
+        ):
+            graph.add_edge(actor_id, location_id, **self._edge_attrs.get(edge, {}), weight=weight)
+
+        self._graph = nx.freeze(graph)
+        return self._graph
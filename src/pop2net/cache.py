@@ -0,0 +1,231 @@
+"""Caches for repeated queries on the network of an Environment."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+
+class _LRUCache:
+    """Size-bounded storage of entries that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: The maximum number of cached entries. The least recently used entry is
+                evicted if the cache is full.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def _store(self, key: tuple, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self._evicted(old_key, old_entry)
+            self.evictions += 1
+
+    def _evicted(self, key: tuple, entry: tuple) -> None:
+        """Called for each entry that is evicted from the cache."""
+
+    def info(self) -> dict:
+        """Return the statistics of the cache.
+
+        Returns:
+            A dict with the number of `hits`, `misses` and `evictions` and the `maxsize` and the
+            current size (`currsize`) of the cache.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "maxsize": self.maxsize,
+            "currsize": len(self._entries),
+        }
+
+
+class NeighborCache(_LRUCache):
+    """A size-bounded LRU cache of the neighbors of actors.
+
+    The entries are keyed by the id of an actor and the location labels the neighbors were
+    filtered by. Each entry is stamped with the mutation count of the environment at the time it
+    was stored. The environment reports which actors are affected by a mutation together with
+    the new mutation count, and an entry is only valid if none of these mutations is newer than
+    the entry. Outdated entries are dropped when they are looked up or evicted. Mutations that
+    affect many actors at once clear the whole cache instead. Stamps are only kept for actors
+    with cached entries, so their number is bounded by the size of the cache.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: The maximum number of cached entries. The least recently used entry is
+                evicted if the cache is full.
+        """
+        super().__init__(maxsize)
+        # actor id -> mutation count of the last mutation that affected the actor
+        self._stamps: dict[int, int] = {}
+        # actor id -> number of cached entries of the actor
+        self._n_entries: dict[int, int] = {}
+
+    def get(self, key: tuple) -> tuple | None:
+        """Return the cached neighbors of a key, or None if they are not cached or outdated.
+
+        Args:
+            key: The (actor id, location labels) pair.
+
+        Returns:
+            The cached neighbors or None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] < self._stamps.get(key[0], -1):
+            del self._entries[key]
+            self._forget(key[0])
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, count: int, neighbors: tuple) -> None:
+        """Store the neighbors of a key and evict the least recently used entry if necessary.
+
+        Args:
+            key: The (actor id, location labels) pair.
+            count: The current mutation count of the environment.
+            neighbors: The neighbors to be cached.
+        """
+        if key not in self._entries:
+            self._n_entries[key[0]] = self._n_entries.get(key[0], 0) + 1
+        self._store(key, (count, neighbors))
+
+    def invalidate(self, actor_ids, count: int) -> None:
+        """Mark the entries of the given actors as outdated.
+
+        Args:
+            actor_ids: The ids of the affected actors.
+            count: The mutation count of the environment after the mutation.
+        """
+        stamps = self._stamps
+        n_entries = self._n_entries
+        for actor_id in actor_ids:
+            # entries stored later are newer than the mutation anyway
+            if actor_id in n_entries:
+                stamps[actor_id] = count
+
+    def clear(self) -> None:
+        """Remove all entries. The statistics are kept."""
+        self._stamps.clear()
+        self._n_entries.clear()
+        self._entries.clear()
+
+    def _evicted(self, key: tuple, entry: tuple) -> None:  # noqa: ARG002
+        self._forget(key[0])
+
+    def _forget(self, actor_id: int) -> None:
+        """Count a removed entry of an actor and drop its stamp with its last entry."""
+        n = self._n_entries[actor_id] - 1
+        if n:
+            self._n_entries[actor_id] = n
+        else:
+            del self._n_entries[actor_id]
+            self._stamps.pop(actor_id, None)
+
+
+class WeightCache(_LRUCache):
+    """A size-bounded LRU cache of the contact weights between pairs of actors.
+
+    The entries are keyed by the ids of both actors and the location labels the shared locations
+    were filtered by. Each entry remembers the ids of the locations its weight was summed over,
+    so that changes of a location only remove the entries of this location. Changes of the
+    memberships of an actor also remove the entries of the actor, because the actor may now
+    share other locations with other actors.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: The maximum number of cached entries. The least recently used entry is
+                evicted if the cache is full.
+        """
+        super().__init__(maxsize)
+        # location id or actor id -> keys of the entries that depend on it
+        self._by_location: dict[int, set[tuple]] = {}
+        self._by_actor: dict[int, set[tuple]] = {}
+
+    def get(self, key: tuple) -> tuple | None:
+        """Return the cached entry of a key, or None if it is not cached.
+
+        Args:
+            key: The (actor id, actor id, location labels) triple.
+
+        Returns:
+            A tuple whose first element is the cached weight, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: tuple, weight: float, location_ids: tuple) -> None:
+        """Store the weight of a pair of actors and evict the least recently used entry if needed.
+
+        Args:
+            key: The (actor id, actor id, location labels) triple.
+            weight: The weight to be cached.
+            location_ids: The ids of the locations the weight was summed over.
+        """
+        self._store(key, (weight, location_ids))
+        for location_id in location_ids:
+            self._by_location.setdefault(location_id, set()).add(key)
+        self._by_actor.setdefault(key[0], set()).add(key)
+        self._by_actor.setdefault(key[1], set()).add(key)
+
+    def invalidate_location(self, location_id: int) -> None:
+        """Remove all entries whose weight depends on the given location."""
+        for key in list(self._by_location.get(location_id, ())):
+            self._remove(key)
+
+    def invalidate_actor(self, actor_id: int) -> None:
+        """Remove all entries of the given actor."""
+        for key in list(self._by_actor.get(actor_id, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries. The statistics are kept."""
+        self._entries.clear()
+        self._by_location.clear()
+        self._by_actor.clear()
+
+    def _remove(self, key: tuple) -> None:
+        self._evicted(key, self._entries.pop(key))
+
+    def _evicted(self, key: tuple, entry: tuple) -> None:
+        for location_id in entry[1]:
+            self._discard(self._by_location, location_id, key)
+        self._discard(self._by_actor, key[0], key)
+        self._discard(self._by_actor, key[1], key)
+
+    @staticmethod
+    def _discard(index: dict, node_id: int, key: tuple) -> None:
+        keys = index.get(node_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[node_id]
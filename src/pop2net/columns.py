@@ -0,0 +1,256 @@
+"""Columnar storage of actor attributes."""
+
+from __future__ import annotations
+
+import numpy as np
+
+_NUMERIC_KINDS = "iuf"
+
+
+class ColumnAttribute:
+    """Descriptor that exposes one column of the environment's `ColumnStore` as an attribute.
+
+    Values that are stored on the instance itself take precedence. This is the case before the
+    actor is added to an environment and after it was removed from it.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Create a descriptor for the column with the given name."""
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        """Return the value of the column in the row of the actor."""
+        if obj is None:
+            return self
+        values = obj.__dict__
+        if self.name in values:
+            return values[self.name]
+        # env and id_p2n are slots of compact actors
+        env = getattr(obj, "env", None)
+        obj_id = getattr(obj, "id_p2n", None)
+        if env is None or not env._columns.has_row(obj_id):
+            msg = f"'{type(obj).__name__}' object has no attribute '{self.name}'"
+            raise AttributeError(msg)
+        return env._columns.get(self.name, obj_id)
+
+    def __set__(self, obj, value) -> None:
+        """Write the value into the row of the actor."""
+        values = obj.__dict__
+        env = getattr(obj, "env", None)
+        obj_id = getattr(obj, "id_p2n", None)
+        if self.name in values or env is None or not env._columns.has_row(obj_id):
+            values[self.name] = value
+        else:
+            env._columns.set(self.name, obj_id, value)
+
+    def __delete__(self, obj) -> None:
+        """Delete the value stored on the instance itself."""
+        try:
+            del obj.__dict__[self.name]
+        except KeyError:
+            msg = f"'{type(obj).__name__}' object has no attribute '{self.name}'"
+            raise AttributeError(msg) from None
+
+
+class ColumnStore:
+    """Stores actor attributes as one typed numpy array per attribute.
+
+    Each actor with columnar attributes owns one row of the store. Removed actors leave unused
+    rows behind until `compact()` is called. Forked stores share their columns and copy a column
+    the first time they write to it.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self._columns: dict[str, np.ndarray] = {}
+        self._filled: dict[str, np.ndarray] = {}
+        self._rows: dict[int, int] = {}
+        self._n_rows = 0
+        self._classes: dict[tuple, type] = {}
+        # names of the columns that are shared with a forked store, "" stands for the rows
+        self._shared: set[str] = set()
+
+    def __len__(self) -> int:
+        """Return the number of actors with a row in the store."""
+        return len(self._rows)
+
+    @property
+    def names(self) -> list[str]:
+        """The names of all columns."""
+        return list(self._columns)
+
+    def columnar_class(self, cls: type, names) -> type:
+        """Return a subclass of `cls` whose attributes `names` are read from this store.
+
+        The subclass keeps the name of `cls`. It is created once per class and set of names.
+
+        Args:
+            cls: The actor class.
+            names: The names of the columnar attributes.
+
+        Returns:
+            The subclass.
+        """
+        names = tuple(names)
+        key = (cls, names)
+        if key not in self._classes:
+            namespace = {name: ColumnAttribute(name) for name in names}
+            namespace["_p2n_columns"] = tuple(
+                dict.fromkeys([*getattr(cls, "_p2n_columns", ()), *names])
+            )
+            namespace["__module__"] = cls.__module__
+            namespace["__qualname__"] = cls.__qualname__
+            self._classes[key] = type(cls.__name__, (cls,), namespace)
+        return self._classes[key]
+
+    def fork(self) -> ColumnStore:
+        """Return a store that shares all columns with this one until either of them changes."""
+        child = ColumnStore()
+        child._columns = dict(self._columns)
+        child._filled = dict(self._filled)
+        child._rows = self._rows
+        child._n_rows = self._n_rows
+        child._classes = self._classes
+        self._shared = {"", *self._columns}
+        child._shared = {"", *self._columns}
+        return child
+
+    def select(self, obj_ids) -> ColumnStore:
+        """Return a new store with copies of the rows of some actors.
+
+        Args:
+            obj_ids: The ids of the actors. Actors without a row are skipped.
+
+        Returns:
+            The new store.
+        """
+        obj_ids = [obj_id for obj_id in obj_ids if obj_id in self._rows]
+        rows = np.fromiter(map(self._rows.__getitem__, obj_ids), dtype=np.int64, count=len(obj_ids))
+        child = ColumnStore()
+        child._columns = {name: column[rows] for name, column in self._columns.items()}
+        child._filled = {name: filled[rows] for name, filled in self._filled.items()}
+        child._rows = {obj_id: i for i, obj_id in enumerate(obj_ids)}
+        child._n_rows = len(obj_ids)
+        child._classes = self._classes
+        return child
+
+    def _own_rows(self) -> None:
+        if "" in self._shared:
+            self._shared.discard("")
+            self._rows = dict(self._rows)
+
+    def has_row(self, obj_id: int | None) -> bool:
+        """Check whether an actor has a row in the store."""
+        return obj_id in self._rows
+
+    def add_rows(self, obj_ids, data: dict[str, np.ndarray]) -> None:
+        """Append one row per actor.
+
+        Columns that do not exist yet are created. Columns that are missing in `data` are left
+        empty for the new rows.
+
+        Args:
+            obj_ids: The ids of the actors.
+            data: A dict of column name -> array with one value per actor.
+        """
+        obj_ids = list(obj_ids)
+        n_new = len(obj_ids)
+        for name, values in data.items():
+            if len(values) != n_new:
+                msg = f"Column {name!r} has {len(values)} values for {n_new} actors."
+                raise ValueError(msg)
+
+        for name in set(self._columns) | set(data):
+            values = np.asarray(data[name]) if name in data else None
+            column = self._columns.get(name)
+            if column is None:
+                dtype = values.dtype
+                column = _empty(self._n_rows, dtype)
+            else:
+                dtype = column.dtype if values is None else _promote(column.dtype, values.dtype)
+            if values is None:
+                values = _empty(n_new, dtype)
+            self._columns[name] = np.concatenate([column.astype(dtype, copy=False), values])
+            self._filled[name] = np.concatenate(
+                [
+                    self._filled.get(name, np.zeros(self._n_rows, dtype=bool)),
+                    np.full(n_new, name in data),
+                ]
+            )
+
+        # all columns were replaced by new ones
+        self._shared.intersection_update({""})
+        self._own_rows()
+        for i, obj_id in enumerate(obj_ids):
+            self._rows[obj_id] = self._n_rows + i
+        self._n_rows += n_new
+
+    def get(self, name: str, obj_id: int):
+        """Return the value of a column in the row of an actor."""
+        return self._columns[name][self._rows[obj_id]]
+
+    def set(self, name: str, obj_id: int, value) -> None:
+        """Write a value into the row of an actor.
+
+        If the value does not fit into the type of the column, the column is converted to a type
+        that can hold both.
+        """
+        if name in self._shared:
+            self._shared.discard(name)
+            self._columns[name] = self._columns[name].copy()
+            self._filled[name] = self._filled[name].copy()
+        column = self._columns[name]
+        value_dtype = np.asarray(value).dtype if np.ndim(value) == 0 else np.dtype(object)
+        dtype = _promote(column.dtype, value_dtype)
+        if dtype != column.dtype:
+            column = self._columns[name] = column.astype(dtype)
+        row = self._rows[obj_id]
+        column[row] = value
+        self._filled[name][row] = True
+
+    def column(self, name: str, obj_ids) -> np.ndarray:
+        """Return the values of a column for the given actors.
+
+        Raises:
+            KeyError: Raised if the column does not exist or one of the actors has no value in it.
+        """
+        rows = np.fromiter(map(self._rows.__getitem__, obj_ids), dtype=np.int64)
+        if not self._filled[name][rows].all():
+            raise KeyError(name)
+        return self._columns[name][rows]
+
+    def detach(self, obj_id: int) -> dict:
+        """Remove the row of an actor and return its values as a dict."""
+        self._own_rows()
+        row = self._rows.pop(obj_id)
+        return {
+            name: column[row] for name, column in self._columns.items() if self._filled[name][row]
+        }
+
+    def compact(self) -> None:
+        """Drop the unused rows of removed actors."""
+        if len(self._rows) == self._n_rows:
+            return
+        rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        for name, column in self._columns.items():
+            self._columns[name] = column[rows]
+            self._filled[name] = self._filled[name][rows]
+        self._rows = {obj_id: i for i, obj_id in enumerate(self._rows)}
+        self._n_rows = len(self._rows)
+        self._shared.clear()
+
+
+def _promote(dtype: np.dtype, other: np.dtype) -> np.dtype:
+    if dtype == other or dtype.kind == "O":
+        return dtype
+    if dtype.kind in _NUMERIC_KINDS and other.kind in _NUMERIC_KINDS:
+        return np.result_type(dtype, other)
+    return np.dtype(object)
+
+
+def _empty(n: int, dtype: np.dtype) -> np.ndarray:
+    if dtype.kind == "f":
+        return np.full(n, np.nan, dtype=dtype)
+    if dtype.kind == "O":
+        return np.full(n, None, dtype=object)
+    return np.zeros(n, dtype=dtype)
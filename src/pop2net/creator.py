@@ -146,6 +146,7 @@ class Creator:
         df: pd.DataFrame | None = None,
         n: int | None = None,
         clear: bool = False,
+        columnar: bool = False,
     ):
         """Creates actors from a pandas DataFrame.
 
@@ -162,6 +163,10 @@ class Creator:
             df: The DataFrame from which the actors should be created from.
             n: The number of actors that should be created. Defaults to None.
             clear (bool): Should the actors already included in the model be removed?
+            columnar (bool): Should the columns of the df be stored as typed arrays by the
+                environment instead of being copied onto each actor? The actors still expose
+                them as attributes, but need much less memory and their attributes can be read
+                at once with `Environment.actor_column()`. Defaults to False.
 
         Returns:
             A list of actors.
@@ -183,6 +188,12 @@ class Creator:
 
                 actor_class = MixedActor
 
+        if df is not None and columnar:
+            actors = self._create_columnar_actors(
+                actor_class, actor_class_attr, actor_class_dict, df
+            )
+            return self.env._to_framework(actors)
+
         if df is not None:
             df = df.copy()
 
@@ -224,18 +235,61 @@ class Creator:
 
         return self.env._to_framework(actors)
 
+    def _create_columnar_actors(self, actor_class, actor_class_attr, actor_class_dict, df) -> list:
+        if "id" in df.columns:
+            msg = "You are not allowed to set an actor attribute called `id`."
+            raise Exception(msg)
+
+        store = self.env._columns
+        names = list(df.columns)
+        if actor_class_dict is None:
+            classes = [store.columnar_class(actor_class, names)] * len(df)
+        else:
+            columnar_classes = {
+                value: store.columnar_class(cls, names) for value, cls in actor_class_dict.items()
+            }
+            classes = [columnar_classes[value] for value in df[actor_class_attr]]
+
+        actors = []
+        for cls in classes:
+            if self.env.framework is None:
+                actor = cls()
+                actor.model = self.model
+            else:
+                actor = cls(model=self.model)
+            actors.append(actor)
+
+        self.env.add_actors(actors)
+
+        # values that were set by the constructor are overwritten by the df
+        overwritten = [name for name in names if actors and name in vars(actors[0])]
+        for actor in actors:
+            for name in overwritten:
+                del actor.__dict__[name]
+
+        store.add_rows(
+            [actor.id_p2n for actor in actors],
+            {name: df[name].to_numpy() for name in names},
+        )
+        return actors
+
     def _get_affiliated_actors(self, actors, dummy_location) -> list:
         temp_filter_attr = "_P2NTEMP_filter_" + dummy_location.label
         self._temp_actor_attrs.append(temp_filter_attr)
 
-        affiliated_actors = []
-        for actor in actors:
-            if not hasattr(actor, temp_filter_attr):
-                setattr(actor, temp_filter_attr, dummy_location.filter(actor))
-                self._temp_actor_attrs.append(temp_filter_attr)
+        unfiltered_actors = [actor for actor in actors if not hasattr(actor, temp_filter_attr)]
+        if unfiltered_actors:
+            results = dummy_location.filter_batch(unfiltered_actors)
+            if len(results) != len(unfiltered_actors):
+                msg = (
+                    f"{dummy_location.label}.filter_batch() returned {len(results)} values "
+                    f"for {len(unfiltered_actors)} actors."
+                )
+                raise ValueError(msg)
+            for actor, result in zip(unfiltered_actors, results):
+                setattr(actor, temp_filter_attr, bool(result))
 
-            if getattr(actor, temp_filter_attr):
-                affiliated_actors.append(actor)
+        affiliated_actors = [actor for actor in actors if getattr(actor, temp_filter_attr)]
 
         return affiliated_actors
 
@@ -945,6 +999,7 @@ class Creator:
         clear: bool = False,
         delete_magic_actor_attributes: bool = True,
         return_elements=False,
+        columnar: bool = False,
     ) -> tuple:
         """Creates actors and locations based on a given dataset.
 
@@ -975,6 +1030,8 @@ class Creator:
                 removed after the creation of the location instances.
             delete_magic_actor_attributes (bool): If True, all magic actor attributes will be
                 removed after the creation of the location instances.
+            columnar (bool): Should the columns of `df` be stored as typed arrays by the
+                environment? See `create_actors()`. Defaults to False.
 
         Returns:
             tuple: A list of actors and a list of locations.
@@ -995,6 +1052,7 @@ class Creator:
             actor_class_attr=actor_class_attr,
             actor_class_dict=actor_class_dict,
             clear=clear,
+            columnar=columnar,
         )
 
         # create locations
@@ -1031,7 +1089,7 @@ class Creator:
             msg = "There are no actors."
             raise Pop2netException(msg)
 
-        df = pd.DataFrame([vars(actor) for actor in self.actors])
+        df = pd.DataFrame([utils._get_attributes(actor) for actor in self.actors])
 
         if drop_agentpy_columns:
             df = df.drop(
@@ -1,5 +1,7 @@
-from .actor import Actor
-from .location import Location
+import collections.abc
+
+from .actor import ActorBase
+from .location import LocationBase
 
 
 class EntityList(list):
@@ -10,8 +12,8 @@ class EntityList(list):
         if n == 0:
             return "EntityList [ ]"
 
-        actor_count = sum(isinstance(o, Actor) for o in self)
-        location_count = sum(isinstance(o, Location) for o in self)
+        actor_count = sum(isinstance(o, ActorBase) for o in self)
+        location_count = sum(isinstance(o, LocationBase) for o in self)
         unknown = n - actor_count - location_count
 
         parts = []
@@ -26,3 +28,131 @@ class EntityList(list):
 
     def __repr__(self):
         return self.__str__()
+
+
+# methods of the framework containers that add or remove objects
+_MUTATORS = frozenset(["add", "append", "clear", "discard", "extend", "insert", "pop", "remove"])
+
+
+class EntityView(collections.abc.Sequence):
+    """A read-only view of actors or locations of an environment.
+
+    Environments created with `lazy_views=True` return views instead of new lists. A view
+    reads the indexes of the environment whenever it is used, so it always shows the current
+    actors or locations. `len()`, iteration and membership tests never copy. Like with
+    `dict.values()`, changing the environment while iterating over a view can fail; iterate
+    over `list(view)` instead. Views of the actors of a location or the locations of an actor
+    raise a KeyError once that location or actor is removed from the environment.
+
+    Indexing and all other methods, e.g. `AgentList.select()` of agentpy or `AgentSet.do()` of
+    mesa, are applied to a container of the framework of the environment. The container is
+    created on first use and reused until the network of the environment changes.
+    """
+
+    __slots__ = ("_cached", "_contains", "_env", "_ids", "_index", "_positions", "_stamp")
+
+    def __init__(self, env, index: dict, ids=None, contains=None, positions=None) -> None:
+        """Create a view.
+
+        Args:
+            env: The environment.
+            index: The id -> object index of the environment the viewed objects belong to.
+            ids: A callable returning the ids of the viewed objects. Ids that are missing in
+                the index are skipped. If None, the view shows all objects of the index.
+            contains: A callable that checks whether the id of an object of the index belongs to
+                the view. If None, the ids are searched.
+            positions: The `DenseIndex` of the index, used to look up objects by their position
+                if the view shows all objects of the index.
+        """
+        self._env = env
+        self._index = index
+        self._ids = ids
+        self._contains = contains
+        self._positions = positions
+        self._cached = None
+        self._stamp = None
+
+    def __len__(self) -> int:
+        """Return the number of viewed objects."""
+        if self._ids is None:
+            return len(self._index)
+        index = self._index
+        return sum(map(index.__contains__, self._ids()))
+
+    def __iter__(self):
+        """Iterate over the viewed objects."""
+        index = self._index
+        if self._ids is None:
+            return iter(index.values())
+        return map(index.__getitem__, filter(index.__contains__, self._ids()))
+
+    def __contains__(self, obj) -> bool:
+        """Check whether an object belongs to the view."""
+        obj_id = getattr(obj, "id_p2n", None)
+        if obj_id is None or self._index.get(obj_id) is not obj:
+            return False
+        if self._ids is None:
+            return True
+        if self._contains is not None:
+            return self._contains(obj_id)
+        return any(other_id == obj_id for other_id in self._ids())
+
+    def __getitem__(self, item):
+        """Return the object at a position, or apply the index to the framework container."""
+        if self._ids is None and self._positions is not None and isinstance(item, int):
+            n = len(self._index)
+            if not -n <= item < n:
+                msg = "EntityView index out of range."
+                raise IndexError(msg)
+            return self._positions.at(item % n)
+        return self.materialize()[item]
+
+    def __getattr__(self, name: str):
+        """Look up all other attributes in the framework container."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in _MUTATORS:
+            msg = f"EntityView is read-only and has no attribute '{name}'."
+            raise AttributeError(msg)
+        return getattr(self.materialize(), name)
+
+    def __eq__(self, other) -> bool:
+        """Compare the framework container with another object."""
+        if isinstance(other, EntityView):
+            other = other.materialize()
+        return self.materialize() == other
+
+    __hash__ = None
+
+    def __add__(self, other) -> list:
+        """Concatenate the viewed objects with another iterable."""
+        return [*self, *other]
+
+    def __radd__(self, other) -> list:
+        """Concatenate another iterable with the viewed objects."""
+        return [*other, *self]
+
+    def __str__(self) -> str:
+        """Print the view like the framework container."""
+        if self._env.framework is None:
+            return EntityList.__str__(self)
+        return str(self.materialize())
+
+    def __repr__(self) -> str:
+        """Print the view like the framework container."""
+        return self.__str__()
+
+    def materialize(self):
+        """Return the viewed objects in a container of the framework of the environment.
+
+        The container is a copy. It is reused until the network of the environment changes
+        and must not be modified.
+
+        Returns:
+            An `EntityList`, an agentpy `AgentList` or a mesa `AgentSet`.
+        """
+        env = self._env
+        if self._cached is None or self._stamp != env._mutation_count:
+            self._cached = env._to_framework(list(self))
+            self._stamp = env._mutation_count
+        return self._cached
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-import itertools
+import gc
 import typing
 import warnings
 
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 
 if typing.TYPE_CHECKING:
     from . import actor as _actor
@@ -14,11 +16,35 @@ if typing.TYPE_CHECKING:
 
 import pop2net as p2n
 
+from . import backends
+from . import cache
+from . import columns
+from . import frozen as _frozen
+from . import indexing
+from . import journal as _journal
+from . import partition as _partition
+from . import projection
+from . import sampling
+from . import shared as _shared
+from . import snapshot
+from . import utils
+
 
 class Environment:
     """Class that organizes actors and locations."""
 
-    def __init__(self, model=None, framework: str | None = None, enable_p2n_warnings=True):
+    def __init__(
+        self,
+        model=None,
+        framework: str | None = None,
+        enable_p2n_warnings=True,
+        backend: str = "networkx",
+        neighbor_cache: int | None = None,
+        weight_cache: int | None = None,
+        live_projection: bool = False,
+        journal: int | None = None,
+        lazy_views: bool = False,
+    ):
         """Initialize a new environment.
 
         Args:
@@ -26,6 +52,33 @@ class Environment:
             framework (str | None, optional): The ABM-framework you you want to use.
                 Options are: "agentpy" & "mesa". Defaults to None.
             enable_p2n_warnings (bool, optional): Should pop2net warnings be shown? Defaults to True.
+            backend (str, optional): How the bipartite network is stored. Options are:
+                "networkx", which stores it as a networkx graph, & "sparse", which stores it as
+                a sparse incidence matrix and needs much less memory for large populations.
+                Defaults to "networkx".
+            neighbor_cache (int | None, optional): The maximum number of neighbor lists that are
+                cached by `neighbors_of_actor()`. The cache only pays off if neighbors are
+                requested more often than the network is changed. Defaults to None, which
+                disables the cache.
+            weight_cache (int | None, optional): The maximum number of contact weights between
+                pairs of actors that are cached by `Actor.get_actor_weight()`. Cached weights stay
+                valid until the memberships or weights of one of the involved locations change.
+                If `Location.project_weights()` depends on other attributes of the actors, call
+                `clear_weight_cache()` after changing them. Defaults to None, which disables the
+                cache.
+            live_projection (bool, optional): Should the projection of the network onto the
+                actors be kept up to date? If True, `actor_network()` returns the projection
+                and only reprojects the locations that changed since its last call.
+                Defaults to False.
+            journal (int | None, optional): The number of changes that are kept in the journal
+                of the environment. If set, all changes of actors, locations, memberships and
+                weights are recorded and can be read with `journal_cursor()`. Defaults to None,
+                which disables the journal.
+            lazy_views (bool, optional): Should `actors`, `locations`, `actors_of_location()`,
+                `locations_of_actor()` and `neighbors_of_actor()` return read-only
+                `EntityView` objects instead of new lists? Views do not copy the objects and
+                only create a container of the framework when a method of it is used.
+                Defaults to False.
 
         Raises:
             ValueError: _description_
@@ -47,11 +100,55 @@ class Environment:
 
             self._framework = mesa
         else:
-            raise ValueError(f"Invalid framework selected: {self.framework}")
+            msg = f"Invalid framework selected: {self.framework}"
+            raise ValueError(msg)
+
+        # select the storage backend of the bipartite network
+        self.backend: str = backend
+        if self.backend == "networkx":
+            self._backend = backends.NetworkxBackend()
+        elif self.backend == "sparse":
+            self._backend = backends.SparseBackend()
+        else:
+            msg = f"Invalid backend selected: {self.backend}"
+            raise ValueError(msg)
 
         # connected objects
         self.model = model
-        self.g = nx.Graph()
+
+        # insertion-ordered indexes of the objects on each side of the bipartite graph
+        self._actors: dict[int, _actor.Actor] = {}
+        self._locations: dict[int, _location.Location] = {}
+
+        # location label -> insertion-ordered index of the locations with this label
+        self._locations_by_label: dict[str | None, dict[int, _location.Location]] = {}
+
+        # dense positions 0..n-1 of the actors and locations
+        self._actor_positions = indexing.DenseIndex(self._actors)
+        self._location_positions = indexing.DenseIndex(self._locations)
+
+        # ids of removed objects that are still stored in the backend until compact() is called
+        self._tombstones: set[int] = set()
+
+        # number of changes of the network structure so far
+        self._mutation_count = 0
+        self._neighbor_cache = cache.NeighborCache(neighbor_cache) if neighbor_cache else None
+        self._weight_cache = cache.WeightCache(weight_cache) if weight_cache else None
+
+        # cumulative contact weight tables for sampling neighbors
+        self._sampler = sampling.NeighborSampler(self)
+
+        # actor attributes that are stored as columns instead of instance attributes
+        self._columns = columns.ColumnStore()
+
+        # incrementally updated projection onto the actors
+        self._live_projection = projection.LiveProjection(self) if live_projection else None
+
+        # bounded record of the changes for incremental consumers
+        self._journal = _journal.Journal(journal) if journal else None
+
+        # return read-only views of the indexes instead of new lists
+        self._lazy_views = lazy_views
 
         # TODO: should we add creator and inspector as attributes?
         # self.creator = Creator(env=self)
@@ -60,6 +157,23 @@ class Environment:
         # a unique id that is added to the objects of this environment
         self._fresh_id = 0
 
+    @property
+    def g(self) -> nx.Graph:
+        """The bipartite network of actors and locations as a networkx graph.
+
+        With the "sparse" backend, the graph is created when it is requested and is a
+        read-only snapshot of the current state of the environment.
+
+        Returns:
+            nx.Graph: The bipartite network.
+        """
+        if self._tombstones:
+            self.compact()
+        return self._backend.to_networkx(self._actors, self._locations)
+
+    def _has_node(self, node_id: int) -> bool:
+        return node_id in self._actors or node_id in self._locations
+
     def _attach_fresh_id(self, obj):
         obj.id_p2n = self._fresh_id
         self._fresh_id += 1
@@ -72,7 +186,8 @@ class Environment:
         elif self.framework == "mesa":
             return self._framework.agent.AgentSet(agents=objects, random=self.model.random)
         else:
-            raise ValueError("Invalid framework.")
+            msg = "Invalid framework."
+            raise ValueError(msg)
 
     @property
     def actors(self) -> list:
@@ -83,11 +198,12 @@ class Environment:
         Environment.add_actor() or Environment.remove_actor(), for instance.
 
         Returns:
-            list: A non-mutable list of all actors in the environment.
+            list: A non-mutable list of all actors in the environment, or a view of them if the
+                environment was created with `lazy_views=True`.
         """
-        return self._to_framework(
-            [data["_obj"] for _, data in self.g.nodes(data=True) if data["bipartite"] == 0]
-        )
+        if self._lazy_views:
+            return p2n.EntityView(self, self._actors, positions=self._actor_positions)
+        return self._to_framework(list(self._actors.values()))
 
     @property
     def locations(self) -> list:
@@ -98,11 +214,268 @@ class Environment:
         Environment.add_location() or Environment.remove_location(), for instance.
 
         Returns:
-            LocationList: a non-mutable LocationList of all locations in the environment.
+            LocationList: a non-mutable LocationList of all locations in the environment, or a
+                view of them if the environment was created with `lazy_views=True`.
         """
-        return self._to_framework(
-            [data["_obj"] for _, data in self.g.nodes(data=True) if data["bipartite"] == 1]
-        )
+        if self._lazy_views:
+            return p2n.EntityView(self, self._locations, positions=self._location_positions)
+        return self._to_framework(list(self._locations.values()))
+
+    @property
+    def mutation_count(self) -> int:
+        """A counter that is increased by every change of the network structure.
+
+        Adding or removing actors, locations and memberships and relabeling locations changes
+        the network structure. Changes of weights do not.
+
+        Returns:
+            int: The number of changes so far.
+        """
+        return self._mutation_count
+
+    def neighbor_cache_info(self) -> dict | None:
+        """Return the statistics of the neighbor cache.
+
+        Returns:
+            A dict with the number of `hits`, `misses` and `evictions` and the `maxsize` and the
+            current size (`currsize`) of the cache, or None if the cache is disabled.
+        """
+        if self._neighbor_cache is None:
+            return None
+        return self._neighbor_cache.info()
+
+    def weight_cache_info(self) -> dict | None:
+        """Return the statistics of the contact weight cache.
+
+        Returns:
+            A dict with the number of `hits`, `misses` and `evictions` and the `maxsize` and the
+            current size (`currsize`) of the cache, or None if the cache is disabled.
+        """
+        if self._weight_cache is None:
+            return None
+        return self._weight_cache.info()
+
+    def clear_weight_cache(self) -> None:
+        """Remove all cached contact weights between actors.
+
+        This includes the tables used by `sample_neighbors()` and `sample_neighbors_bulk()`.
+        """
+        if self._weight_cache is not None:
+            self._weight_cache.clear()
+        self._sampler.clear()
+
+    def _weights_changed(self, location_id: int | None = None, actor_id: int | None = None) -> None:
+        """Invalidate the cached contact weights.
+
+        Args:
+            location_id: The id of the location whose memberships or weights changed. If None,
+                all cached weights are invalidated.
+            actor_id: The id of an actor whose memberships changed.
+        """
+        weight_cache = self._weight_cache
+        if weight_cache is None or not len(weight_cache):
+            return
+        if location_id is None:
+            weight_cache.clear()
+            return
+        weight_cache.invalidate_location(location_id)
+        if actor_id is not None:
+            weight_cache.invalidate_actor(actor_id)
+
+    def _network_changed(self, affected_actors=None) -> None:
+        """Count a change of the network structure and invalidate the cached neighbors.
+
+        Args:
+            affected_actors: A callable returning the ids of the actors whose neighbors changed.
+                It is only called if there are cached neighbors. If None, all cached neighbors
+                are invalidated.
+        """
+        self._mutation_count += 1
+        self._sampler.clear()
+        neighbor_cache = self._neighbor_cache
+        if neighbor_cache is None or not len(neighbor_cache):
+            return
+        if affected_actors is None:
+            neighbor_cache.clear()
+        else:
+            neighbor_cache.invalidate(affected_actors(), self._mutation_count)
+
+    def _projection_changed(self, location_ids=(), actor_ids=()) -> None:
+        """Mark changed locations and added actors in the live projection."""
+        if self._live_projection is not None:
+            self._live_projection.mark(location_ids, actor_ids)
+
+    def _journal_changes(self, kind: str, actor_ids=None, location_ids=None, weights=None) -> None:
+        """Record changes in the journal, if it is enabled."""
+        if self._journal is not None:
+            self._journal.record(kind, actor_ids, location_ids, weights)
+
+    def _members(self, location_id: int) -> list[int]:
+        actors = self._actors
+        return [node for node in self._backend.neighbors(location_id) if node in actors]
+
+    def _co_members(self, actor_id: int) -> list[int]:
+        locations = self._locations
+        return [
+            member
+            for location_id in self._backend.neighbors(actor_id)
+            if location_id in locations
+            for member in self._members(location_id)
+        ]
+
+    @property
+    def index_generation(self) -> int:
+        """A counter that is increased whenever the dense positions of actors or locations change.
+
+        The positions returned by `actor_index()` and `location_index()` stay the same while
+        objects are added. After objects are removed, the positions are remapped to close the
+        gaps and this counter is increased. Arrays aligned with the positions have to be
+        realigned if the counter has changed.
+
+        Returns:
+            int: The number of remappings so far.
+        """
+        return self._actor_positions.generation + self._location_positions.generation
+
+    def actor_index(self, actor: _actor.Actor) -> int:
+        """Return the dense position of an actor.
+
+        The positions of all actors are 0..n-1 in the order of `Environment.actors`, so they can
+        be used as offsets into numpy arrays aligned with the population.
+
+        Args:
+            actor: The actor.
+
+        Raises:
+            Exception: Raised if the actor does not exist in the environment.
+
+        Returns:
+            int: The position of the actor.
+        """
+        try:
+            return self._actor_positions.position(actor.id_p2n)
+        except KeyError:
+            msg = f"Actor {actor} does not exist in Environment!"
+            raise Exception(msg) from None
+
+    def actor_indices(self, actors) -> np.ndarray:
+        """Return the dense positions of many actors as an array.
+
+        Args:
+            actors: An iterable of actors.
+
+        Raises:
+            Exception: Raised if one of the actors does not exist in the environment.
+
+        Returns:
+            An array of positions.
+        """
+        try:
+            return self._actor_positions.positions(actor.id_p2n for actor in actors)
+        except KeyError as error:
+            msg = f"Actor with id {error.args[0]} does not exist in Environment!"
+            raise Exception(msg) from None
+
+    def actor_at(self, index: int) -> _actor.Actor:
+        """Return the actor at a dense position.
+
+        Args:
+            index: A position between 0 and the number of actors - 1.
+
+        Returns:
+            The actor.
+        """
+        return self._actor_positions.at(index)
+
+    def location_index(self, location: _location.Location) -> int:
+        """Return the dense position of a location.
+
+        The positions of all locations are 0..n-1 in the order of `Environment.locations`.
+
+        Args:
+            location: The location.
+
+        Raises:
+            Exception: Raised if the location does not exist in the environment.
+
+        Returns:
+            int: The position of the location.
+        """
+        try:
+            return self._location_positions.position(location.id_p2n)
+        except KeyError:
+            msg = f"Location {location} does not exist in Environment!"
+            raise Exception(msg) from None
+
+    def location_indices(self, locations) -> np.ndarray:
+        """Return the dense positions of many locations as an array.
+
+        Args:
+            locations: An iterable of locations.
+
+        Raises:
+            Exception: Raised if one of the locations does not exist in the environment.
+
+        Returns:
+            An array of positions.
+        """
+        try:
+            return self._location_positions.positions(location.id_p2n for location in locations)
+        except KeyError as error:
+            msg = f"Location with id {error.args[0]} does not exist in Environment!"
+            raise Exception(msg) from None
+
+    def location_at(self, index: int) -> _location.Location:
+        """Return the location at a dense position.
+
+        Args:
+            index: A position between 0 and the number of locations - 1.
+
+        Returns:
+            The location.
+        """
+        return self._location_positions.at(index)
+
+    def actor_column(self, name: str, actors=None) -> np.ndarray:
+        """Return the values of an actor attribute as an array.
+
+        If the attribute of all requested actors is stored in a column, which is the case for
+        actors created with `Creator.create_actors(columnar=True)`, the values are taken from
+        the column without touching the actors. Otherwise, they are collected with `getattr()`.
+
+        Args:
+            name: The name of the attribute.
+            actors: The actors. Defaults to None, which selects all actors of the environment.
+
+        Returns:
+            An array with the value of each actor, in the order of `actors`.
+        """
+        if actors is None:
+            actors = list(self._actors.values())
+        if name in self._columns.names:
+            try:
+                return self._columns.column(name, [actor.id_p2n for actor in actors])
+            except KeyError:
+                pass
+        return np.array([getattr(actor, name) for actor in actors])
+
+    @property
+    def n_actors(self) -> int:
+        """Return the number of actors in the environment without building a list.
+
+        Returns:
+            int: The number of actors.
+        """
+        return len(self._actors)
+
+    @property
+    def n_locations(self) -> int:
+        """Return the number of locations in the environment without building a list.
+
+        Returns:
+            int: The number of locations.
+        """
+        return len(self._locations)
 
     # TODO: def add_obj as a common parent method for add_actor & add_location
     def add_actor(self, actor: _actor.Actor) -> None:
@@ -116,21 +489,54 @@ class Environment:
         """
         if actor.id_p2n is None:
             self._attach_fresh_id(actor)
-
-        if not self.g.has_node(actor.id_p2n):
-            self.g.add_node(actor.id_p2n, bipartite=0, _obj=actor)
+        elif actor.id_p2n in self._tombstones:
+            self.compact()
+
+        if not self._has_node(actor.id_p2n):
+            self._backend.add_actor(actor.id_p2n, actor)
+            self._actors[actor.id_p2n] = actor
+            self._actor_positions.add(actor.id_p2n, actor)
+            self._network_changed(lambda: ())
+            self._projection_changed(actor_ids=(actor.id_p2n,))
+            self._journal_changes(_journal.ADD_ACTOR, actor_ids=(actor.id_p2n,))
             actor.env = self
         else:
-            raise ValueError("This environment already has an entity with this id.")
+            msg = "This environment already has an entity with this id."
+            raise ValueError(msg)
+
+    def _new_node_ids(self, objects: list) -> list[int]:
+        """Attach ids to new actors or locations and check that the ids are not taken yet."""
+        ids = []
+        for obj in objects:
+            if obj.id_p2n is None:
+                self._attach_fresh_id(obj)
+            ids.append(obj.id_p2n)
+        if self._tombstones and not self._tombstones.isdisjoint(ids):
+            self.compact()
+        if len(set(ids)) != len(ids) or any(map(self._has_node, ids)):
+            msg = "This environment already has an entity with this id."
+            raise ValueError(msg)
+        return ids
 
     def add_actors(self, actors: list) -> None:
         """Add actors to the environment.
 
+        The actors are added in a single batch. If one of them is already in the environment,
+        none of them is added.
+
         Args:
             actors (list): A list of the actors to be added.
         """
+        actors = list(actors)
+        actor_ids = self._new_node_ids(actors)
+        self._backend.add_actors(actor_ids, actors)
+        self._actors.update(zip(actor_ids, actors))
+        self._actor_positions.extend(actor_ids, actors)
+        self._network_changed(lambda: ())
+        self._projection_changed(actor_ids=actor_ids)
+        self._journal_changes(_journal.ADD_ACTOR, actor_ids=actor_ids)
         for actor in actors:
-            self.add_actor(actor)
+            actor.env = self
 
     def add_location(self, location: _location.Location) -> None:
         """Add a location to the environment.
@@ -143,21 +549,41 @@ class Environment:
         """
         if location.id_p2n is None:
             self._attach_fresh_id(location)
-
-        if not self.g.has_node(location.id_p2n):
-            self.g.add_node(location.id_p2n, bipartite=1, _obj=location)
+        elif location.id_p2n in self._tombstones:
+            self.compact()
+
+        if not self._has_node(location.id_p2n):
+            self._backend.add_location(location.id_p2n, location)
+            self._locations[location.id_p2n] = location
+            self._location_positions.add(location.id_p2n, location)
+            self._network_changed(lambda: ())
+            self._locations_by_label.setdefault(location.label, {})[location.id_p2n] = location
+            self._journal_changes(_journal.ADD_LOCATION, location_ids=(location.id_p2n,))
             location.env = self
         else:
-            raise ValueError("This environment already has an entity with this id.")
+            msg = "This environment already has an entity with this id."
+            raise ValueError(msg)
 
     def add_locations(self, locations: list) -> None:
         """Add multiple locations to the environment at once.
 
+        The locations are added in a single batch. If one of them is already in the environment,
+        none of them is added.
+
         Args:
             locations (list): An iterable over multiple locations.
         """
-        for location in locations:
-            self.add_location(location)
+        locations = list(locations)
+        location_ids = self._new_node_ids(locations)
+        self._backend.add_locations(location_ids, locations)
+        self._locations.update(zip(location_ids, locations))
+        self._location_positions.extend(location_ids, locations)
+        self._network_changed(lambda: ())
+        self._journal_changes(_journal.ADD_LOCATION, location_ids=location_ids)
+        locations_by_label = self._locations_by_label
+        for location_id, location in zip(location_ids, locations):
+            locations_by_label.setdefault(location.label, {})[location_id] = location
+            location.env = self
 
     def add_actor_to_location(
         self,
@@ -182,15 +608,131 @@ class Environment:
             Exception: Raised if the actor does not exist in the environment.
         """
         # TODO: Create custom exceptions
-        if not self.g.has_node(location.id_p2n):
+        if location.id_p2n not in self._locations:
             msg = f"Location {location} does not exist in Environment!"
             raise Exception(msg)
-        if not self.g.has_node(actor.id_p2n):
+        if actor.id_p2n not in self._actors:
             msg = f"Actor {actor} does not exist in Environment!"
             raise Exception(msg)
 
-        self.g.add_edge(actor.id_p2n, location.id_p2n, **kwargs)
-        self.set_weight(actor=actor, location=location, weight=weight)
+        existed = self._journal is not None and self._backend.has_edge(
+            actor.id_p2n, location.id_p2n
+        )
+        self._backend.add_edge(actor.id_p2n, location.id_p2n, **kwargs)
+        weight = self._set_weight(actor, location, weight)
+        self._network_changed(lambda: self._members(location.id_p2n))
+        self._weights_changed(location.id_p2n, actor.id_p2n)
+        self._projection_changed((location.id_p2n,))
+        self._journal_changes(
+            _journal.SET_WEIGHT if existed else _journal.ADD_MEMBERSHIP,
+            (actor.id_p2n,),
+            (location.id_p2n,),
+            (weight,),
+        )
+
+    @staticmethod
+    def _as_id_array(ids) -> np.ndarray:
+        if not isinstance(ids, np.ndarray):
+            ids = list(ids)
+        return np.asarray(ids, dtype=np.int64)
+
+    def _known_ids(
+        self,
+        actor_ids: np.ndarray,
+        location_ids: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        known_actors = np.isin(actor_ids, np.fromiter(self._actors, np.int64, len(self._actors)))
+        known_locations = np.isin(
+            location_ids,
+            np.fromiter(self._locations, np.int64, len(self._locations)),
+        )
+        return known_actors, known_locations
+
+    def add_memberships(self, actor_ids, location_ids, weights=None) -> dict:
+        """Add many actors to locations at once.
+
+        The i-th actor id is added to the i-th location id. This does the same as calling
+        `add_actor_to_location()` for each pair, but checks all pairs at once and inserts the
+        memberships into the network in a single batch. Invalid pairs are skipped instead of
+        raising an error and are reported in the returned summary. If a pair occurs more than once,
+        only its last occurrence is used. Existing memberships get the new weight.
+
+        Args:
+            actor_ids: An array or iterable of the `id_p2n` of the actors.
+            location_ids: An array or iterable of the `id_p2n` of the locations.
+            weights: An optional array, iterable or single value of weights. If None,
+                location.weight() is used to generate the weight of each membership.
+
+        Raises:
+            ValueError: Raised if the inputs do not have the same length.
+
+        Returns:
+            A dict with the number of `added` and `updated` memberships, the number of skipped
+            `duplicates` and the `unknown_actor_ids` and `unknown_location_ids` whose pairs were
+            skipped.
+        """
+        actor_ids = self._as_id_array(actor_ids)
+        location_ids = self._as_id_array(location_ids)
+        if weights is not None:
+            weights = np.asarray(weights if np.ndim(weights) == 0 else list(weights))
+            if weights.ndim == 0:
+                weights = np.broadcast_to(weights, actor_ids.shape)
+        if len(actor_ids) != len(location_ids) or (
+            weights is not None and len(weights) != len(actor_ids)
+        ):
+            msg = "actor_ids, location_ids and weights must have the same length."
+            raise ValueError(msg)
+
+        known_actors, known_locations = self._known_ids(actor_ids, location_ids)
+        valid = known_actors & known_locations
+
+        # keep the last occurrence of each pair
+        order = np.lexsort((location_ids, actor_ids))
+        sorted_actors, sorted_locations = actor_ids[order], location_ids[order]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = (sorted_actors[1:] != sorted_actors[:-1]) | (
+            sorted_locations[1:] != sorted_locations[:-1]
+        )
+        unique = np.zeros(len(actor_ids), dtype=bool)
+        unique[order[last]] = True
+        selected = np.flatnonzero(valid & unique)
+
+        actor_ids_sel = actor_ids[selected]
+        location_ids_sel = location_ids[selected]
+        if weights is None:
+            weights = [
+                self._locations[location_id].weight(self._actors[actor_id])
+                for actor_id, location_id in zip(actor_ids_sel.tolist(), location_ids_sel.tolist())
+            ]
+        else:
+            weights = weights[selected].tolist()
+
+        added = self._backend.add_edges(actor_ids_sel, location_ids_sel, weights)
+        self._network_changed()
+        self._weights_changed()
+        self._projection_changed(np.unique(location_ids_sel).tolist())
+        if self._journal is not None:
+            weights = np.asarray(weights)
+            self._journal_changes(
+                _journal.ADD_MEMBERSHIP,
+                actor_ids_sel[added],
+                location_ids_sel[added],
+                weights[added],
+            )
+            self._journal_changes(
+                _journal.SET_WEIGHT,
+                actor_ids_sel[~added],
+                location_ids_sel[~added],
+                weights[~added],
+            )
+        n_added = int(added.sum())
+        return {
+            "added": n_added,
+            "updated": len(selected) - n_added,
+            "duplicates": int((valid & ~unique).sum()),
+            "unknown_actor_ids": np.unique(actor_ids[~known_actors]).tolist(),
+            "unknown_location_ids": np.unique(location_ids[~known_locations]).tolist(),
+        }
 
     def remove_actor(self, actor: _actor.Actor) -> None:
         """Remove an actor from the environment.
@@ -200,17 +742,111 @@ class Environment:
         Args:
             actor: Actor to be removed.
         """
-        if self.g.has_node(actor.id_p2n):
-            self.g.remove_node(actor.id_p2n)
+        if self._has_node(actor.id_p2n):
+            self._remove_node(actor.id_p2n)
+
+    def _remove_node(self, node_id: int) -> None:
+        if self._neighbor_cache is not None and len(self._neighbor_cache):
+            affected = (
+                self._co_members(node_id) if node_id in self._actors else self._members(node_id)
+            )
+        else:
+            affected = ()
+        if self._live_projection is not None:
+            self._live_projection.mark_removed((node_id,))
+        if node_id in self._actors:
+            self._journal_changes(_journal.REMOVE_ACTOR, actor_ids=(node_id,))
+        else:
+            self._journal_changes(_journal.REMOVE_LOCATION, location_ids=(node_id,))
+        self._backend.remove_node(node_id)
+        self._unregister_node(node_id)
+        self._network_changed(lambda: affected)
+        self._weights_changed()
+
+    def _unregister_node(self, node_id: int) -> None:
+        actor = self._actors.pop(node_id, None)
+        if actor is not None:
+            self._actor_positions.remove()
+            if self._columns.has_row(node_id):
+                actor.__dict__.update(self._columns.detach(node_id))
+        location = self._locations.pop(node_id, None)
+        if location is not None:
+            self._location_positions.remove()
+            self._unregister_label(location, location.label)
+
+    def _remove_nodes(self, node_ids: list[int], defer: bool) -> None:
+        if self._live_projection is not None:
+            self._live_projection.mark_removed(node_ids)
+        if self._journal is not None:
+            self._journal_changes(
+                _journal.REMOVE_ACTOR,
+                actor_ids=[node_id for node_id in node_ids if node_id in self._actors],
+            )
+            self._journal_changes(
+                _journal.REMOVE_LOCATION,
+                location_ids=[node_id for node_id in node_ids if node_id in self._locations],
+            )
+        for node_id in node_ids:
+            self._unregister_node(node_id)
+        if defer:
+            self._tombstones.update(node_ids)
+        elif node_ids:
+            self._backend.remove_nodes(node_ids)
+        self._network_changed()
+        self._weights_changed()
+
+    def compact(self) -> None:
+        """Remove the objects that were removed with `defer=True` from the network storage.
+
+        Objects removed with `defer=True` disappear from the environment immediately, but their
+        memberships are only dropped from the underlying network when this method is called.
+        It is called automatically when the networkx graph is requested or exported.
+        """
+        if self._tombstones:
+            self._backend.remove_nodes(list(self._tombstones))
+            self._tombstones.clear()
+        self._backend.compact()
+        self._columns.compact()
 
-    def remove_actors(self, actors: list[_actor.Actor]) -> None:
+    def _unregister_label(self, location: _location.Location, label: str | None) -> None:
+        labeled = self._locations_by_label.get(label)
+        if labeled is not None:
+            labeled.pop(location.id_p2n, None)
+            if not labeled:
+                del self._locations_by_label[label]
+
+    def _relabel_location(self, location: _location.Location, old_label: str | None) -> None:
+        """Move a location to its new label in the label index.
+
+        Called by Location whenever its label is changed.
+
+        Args:
+            location: The relabeled location.
+            old_label: The label of the location before the change.
+        """
+        if self._locations.get(location.id_p2n) is not location:
+            return
+        self._unregister_label(location, old_label)
+        self._locations_by_label.setdefault(location.label, {})[location.id_p2n] = location
+        self._network_changed(lambda: self._members(location.id_p2n))
+        # entries filtered by location labels might now include or exclude this location
+        self._weights_changed()
+
+    def remove_actors(self, actors: list[_actor.Actor], defer: bool = False) -> None:
         """Remove multiple actors from the environment at once.
 
+        The memberships of all actors are removed from the network in a single batch. Actors that
+        do not exist in the environment are ignored.
+
         Args:
             actors (list): An iterable over multiple actors.
+            defer (bool): If True, the actors are removed from the environment immediately, but
+                their memberships stay in the network storage as tombstones until `compact()` is
+                called. This makes removing large parts of the population between scenario runs
+                cheap. Defaults to False.
         """
-        for actor in actors:
-            self.remove_actor(actor)
+        node_ids = [actor.id_p2n for actor in actors if actor.id_p2n in self._actors]
+        self._remove_nodes(node_ids, defer=defer)
 
     def remove_location(self, location: _location.Location) -> None:
         """Remove a location from the environment.
@@ -220,17 +856,23 @@ class Environment:
         Args:
             location: Location to be removed.
         """
-        if self.g.has_node(location.id_p2n):
-            self.g.remove_node(location.id_p2n)
+        if self._has_node(location.id_p2n):
+            self._remove_node(location.id_p2n)
 
-    def remove_locations(self, locations: list[_location.Location]) -> None:
+    def remove_locations(self, locations: list[_location.Location], defer: bool = False) -> None:
         """Remove multiple locations at once.
 
+        The memberships of all locations are removed from the network in a single batch.
+        Locations that do not exist in the environment are ignored.
+
         Args:
             locations (list): An iterable over locations.
+            defer (bool): If True, the locations are removed from the environment immediately,
+                but their memberships stay in the network storage as tombstones until `compact()`
+                is called. Defaults to False.
         """
-        for location in locations:
-            self.remove_location(location)
+        node_ids = [location.id_p2n for location in locations if location.id_p2n in self._locations]
+        self._remove_nodes(node_ids, defer=defer)
 
     def remove_actor_from_location(
         self,
@@ -248,15 +890,71 @@ class Environment:
             Exception: Raised if the actor does not exist in the environment.
         """
         # TODO: use custom exceptions
-        if not self.g.has_node(location.id_p2n):
+        if location.id_p2n not in self._locations:
             msg = f"Location {location} does not exist in Environment!"
             raise Exception(msg)
-        if not self.g.has_node(actor.id_p2n):
+        if actor.id_p2n not in self._actors:
             msg = f"Actor {actor} does not exist in Environment!"
             raise Exception(msg)
 
-        if self.g.has_edge(actor.id_p2n, location.id_p2n):
-            self.g.remove_edge(actor.id_p2n, location.id_p2n)
+        if self._journal is not None and self._backend.has_edge(actor.id_p2n, location.id_p2n):
+            self._journal_changes(_journal.REMOVE_MEMBERSHIP, (actor.id_p2n,), (location.id_p2n,))
+        self._backend.remove_edge(actor.id_p2n, location.id_p2n)
+        self._network_changed(lambda: [actor.id_p2n, *self._members(location.id_p2n)])
+        self._weights_changed(location.id_p2n, actor.id_p2n)
+        self._projection_changed((location.id_p2n,))
+
+    def remove_memberships(self, actor_ids, location_ids) -> dict:
+        """Remove many actors from locations at once.
+
+        The i-th actor id is removed from the i-th location id. All pairs are removed from the
+        network in a single batch. Pairs with unknown ids are skipped and reported in the
+        returned summary.
+
+        Args:
+            actor_ids: An array or iterable of the `id_p2n` of the actors.
+            location_ids: An array or iterable of the `id_p2n` of the locations.
+
+        Raises:
+            ValueError: Raised if the inputs do not have the same length.
+
+        Returns:
+            A dict with the number of `removed` memberships, the number of pairs that were
+            `missing` in the network and the `unknown_actor_ids` and `unknown_location_ids` whose
+            pairs were skipped.
+        """
+        actor_ids = self._as_id_array(actor_ids)
+        location_ids = self._as_id_array(location_ids)
+        if len(actor_ids) != len(location_ids):
+            msg = "actor_ids and location_ids must have the same length."
+            raise ValueError(msg)
+
+        known_actors, known_locations = self._known_ids(actor_ids, location_ids)
+        valid = known_actors & known_locations
+        if self._journal is not None:
+            has_edge = self._backend.has_edge
+            existing = list(
+                dict.fromkeys(
+                    pair
+                    for pair in zip(actor_ids[valid].tolist(), location_ids[valid].tolist())
+                    if has_edge(*pair)
+                )
+            )
+            self._journal_changes(
+                _journal.REMOVE_MEMBERSHIP,
+                [actor_id for actor_id, _ in existing],
+                [location_id for _, location_id in existing],
+            )
+        n_removed = self._backend.remove_edges(actor_ids[valid], location_ids[valid])
+        self._network_changed()
+        self._weights_changed()
+        self._projection_changed(np.unique(location_ids[valid]).tolist())
+        return {
+            "removed": n_removed,
+            "missing": int(valid.sum()) - n_removed,
+            "unknown_actor_ids": np.unique(actor_ids[~known_actors]).tolist(),
+            "unknown_location_ids": np.unique(location_ids[~known_locations]).tolist(),
+        }
 
     def actors_of_location(self, location: _location.Location):
         """Return the list of actors associated with a specific location.
@@ -267,11 +965,18 @@ class Environment:
         Returns:
             A list of actors.
         """
-        nodes = self.g.neighbors(location.id_p2n)
-        actors = [
-            self.g.nodes[node]["_obj"] for node in nodes if self.g.nodes[node]["bipartite"] == 0
-        ]
-        return self._to_framework(actors)
+        actors = self._actors
+        location_id = location.id_p2n
+        if self._lazy_views:
+            return p2n.EntityView(
+                self,
+                actors,
+                ids=self._view_ids(self._locations, location_id, "location"),
+                contains=lambda actor_id: self._backend.has_edge(actor_id, location_id),
+            )
+        return self._to_framework(
+            [actors[node] for node in self._backend.neighbors(location_id) if node in actors]
+        )
 
     def locations_of_actor(self, actor: _actor.Actor) -> list[_location.Location]:
         """Return the list of locations associated with a specific actor.
@@ -282,11 +987,46 @@ class Environment:
         Returns:
             A list of locations.
         """
-        nodes = self.g.neighbors(actor.id_p2n)
-        locations = [
-            self.g.nodes[node]["_obj"] for node in nodes if self.g.nodes[node]["bipartite"] == 1
-        ]
-        return self._to_framework(locations)
+        locations = self._locations
+        actor_id = actor.id_p2n
+        if self._lazy_views:
+            return p2n.EntityView(
+                self,
+                locations,
+                ids=self._view_ids(self._actors, actor_id, "actor"),
+                contains=lambda location_id: self._backend.has_edge(actor_id, location_id),
+            )
+        return self._to_framework(
+            [locations[node] for node in self._backend.neighbors(actor_id) if node in locations]
+        )
+
+    def locations_by_label(self, label: str) -> list[_location.Location]:
+        """Return all locations with a specific label.
+
+        Args:
+            label: The desired location label.
+
+        Returns:
+            A list of locations.
+        """
+        return self._to_framework(list(self._locations_by_label.get(label, {}).values()))
+
+    def actors_by_label(self, label: str) -> list[_actor.Actor]:
+        """Return all actors that are affiliated with at least one location of a specific label.
+
+        Args:
+            label: The desired location label.
+
+        Returns:
+            A list of actors.
+        """
+        actors = self._actors
+        found = {}
+        for location_id in self._locations_by_label.get(label, {}):
+            for node in self._backend.neighbors(location_id):
+                if node in actors:
+                    found[node] = actors[node]
+        return self._to_framework(list(found.values()))
 
     def neighbors_of_actor(
         self,
@@ -304,48 +1044,309 @@ class Environment:
         Returns:
             The list of neighbors for the specified actor.
         """
+        neighbor_cache = self._neighbor_cache
+        if neighbor_cache is not None:
+            key = (actor.id_p2n, tuple(location_labels) if location_labels else None)
+            cached = neighbor_cache.get(key)
+            if cached is not None:
+                if self._lazy_views:
+                    return self._neighbor_view({neighbor.id_p2n for neighbor in cached})
+                return self._to_framework(list(cached))
+
         if location_labels:
+            labeled = [self._locations_by_label.get(label, {}) for label in location_labels]
             locations = (
                 node
-                for node in self.g.neighbors(actor.id_p2n)
-                if self.g.nodes[node]["bipartite"] == 1
-                and self.g.nodes[node]["_obj"].label in location_labels
+                for node in self._backend.neighbors(actor.id_p2n)
+                if any(node in location_ids for location_ids in labeled)
             )
         else:
             locations = (
-                node
-                for node in self.g.neighbors(actor.id_p2n)
-                if self.g.nodes[node]["bipartite"] == 1
+                node for node in self._backend.neighbors(actor.id_p2n) if node in self._locations
             )
 
+        actors = self._actors
         neighbor_actors = {
             actor_id
             for location_id in locations
-            for actor_id in self.g.neighbors(location_id)
-            if self.g.nodes[actor_id]["bipartite"] == 0
+            for actor_id in self._backend.neighbors(location_id)
+            if actor_id in actors
         }
 
-        return self._to_framework(
-            [
-                self.g.nodes[actor_id]["_obj"]
-                for actor_id in neighbor_actors
-                if actor_id != actor.id_p2n
-            ]
+        neighbor_actors.discard(actor.id_p2n)
+        if self._lazy_views:
+            if neighbor_cache is not None:
+                neighbors = tuple(actors[actor_id] for actor_id in neighbor_actors)
+                neighbor_cache.put(key, self._mutation_count, neighbors)
+            return self._neighbor_view(neighbor_actors)
+
+        neighbors = [actors[actor_id] for actor_id in neighbor_actors]
+        if neighbor_cache is not None:
+            neighbor_cache.put(key, self._mutation_count, tuple(neighbors))
+        return self._to_framework(neighbors)
+
+    def _view_ids(self, index: dict, node_id: int, kind: str):
+        """Return a callable returning the ids of the neighbors of a node for a view.
+
+        The callable raises a KeyError if the node was removed from the environment after the
+        view was created.
+        """
+
+        def ids():
+            if node_id not in index:
+                msg = f"The {kind} of this view was removed from the environment."
+                raise KeyError(msg)
+            return self._backend.neighbors(node_id)
+
+        return ids
+
+    def _neighbor_view(self, neighbor_ids: set[int]) -> p2n.EntityView:
+        """Return a view of the actors with the given ids, which were found at the call."""
+        return p2n.EntityView(
+            self, self._actors, ids=lambda: neighbor_ids, contains=neighbor_ids.__contains__
         )
 
-    def _objects_between_objects(self, object1, object2) -> list:
-        if object1 is object2:
-            raise ValueError("Entity 1 and entity 2 are identical.")
-
-        paths = list(
-            nx.all_simple_paths(
-                G=self.g,
-                source=object1.id_p2n,
-                target=object2.id_p2n,
-                cutoff=2,
-            ),
+    def sample_neighbors(
+        self,
+        actor: _actor.Actor,
+        k: int,
+        location_labels: list | None = None,
+        weighted: bool = True,
+        rng=None,
+    ) -> list[_actor.Actor]:
+        """Draw random neighbors of an actor.
+
+        The neighbors are drawn with replacement. If weighted is True, the probability of each
+        neighbor is proportional to its contact weight (see `Actor.get_actor_weight()`) and
+        neighbors with a contact weight of 0 or less are never drawn.
+
+        The cumulative contact weights of the neighbors are computed at the first draw and
+        reused until any membership or weight in the environment changes. If
+        `Location.project_weights()` depends on other attributes of the actors, call
+        `clear_weight_cache()` after changing them.
+
+        Args:
+            actor: The actor whose neighbors are drawn.
+            k: The number of draws.
+            location_labels: A list of location_labels. Only neighbors at these locations are
+                considered. Defaults to None, which considers all locations.
+            weighted: Should the neighbors be drawn proportional to their contact weights?
+                Defaults to True.
+            rng (numpy.random.Generator | int | None, optional): A random number generator or a
+                seed. Defaults to None, which uses fresh entropy.
+
+        Raises:
+            Exception: Raised if the actor does not exist in the environment.
+
+        Returns:
+            The drawn neighbors. The list is empty if the actor has no neighbors (with a positive
+            contact weight).
+        """
+        if actor.id_p2n not in self._actors:
+            msg = f"Actor {actor} does not exist in Environment!"
+            raise Exception(msg)
+        positions = self._sampler.sample(
+            actor.id_p2n, k, location_labels, weighted, np.random.default_rng(rng)
+        )
+        return self._to_framework(list(map(self._actor_positions.at, positions.tolist())))
+
+    def sample_neighbors_bulk(
+        self,
+        actors,
+        k: int,
+        location_labels: list | None = None,
+        weighted: bool = True,
+        rng=None,
+    ) -> np.ndarray:
+        """Draw random neighbors of many actors at once.
+
+        Works like `sample_neighbors()`, but returns the dense positions of the drawn neighbors
+        (see `actor_index()`) as an array. If a large part of the population draws, the
+        contact weights of all actors are computed in one pass like in
+        `export_actor_network()`.
+
+        Args:
+            actors: An iterable of actors. If None, all actors draw.
+            k: The number of draws per actor.
+            location_labels: A list of location_labels. Only neighbors at these locations are
+                considered. Defaults to None, which considers all locations.
+            weighted: Should the neighbors be drawn proportional to their contact weights?
+                Defaults to True.
+            rng (numpy.random.Generator | int | None, optional): A random number generator or a
+                seed. Defaults to None, which uses fresh entropy.
+
+        Raises:
+            Exception: Raised if one of the actors does not exist in the environment.
+
+        Returns:
+            An array of shape (number of actors, k) with the positions of the drawn neighbors.
+            Actors without neighbors (with a positive contact weight) get rows of -1.
+        """
+        if actors is None:
+            actor_ids = list(self._actors)
+        else:
+            actor_ids = [actor.id_p2n for actor in actors]
+            missing = [actor_id for actor_id in actor_ids if actor_id not in self._actors]
+            if missing:
+                msg = f"Actor with id {missing[0]} does not exist in Environment!"
+                raise Exception(msg)
+        return self._sampler.sample_bulk(
+            actor_ids, k, location_labels, weighted, np.random.default_rng(rng)
         )
-        return [self.g.nodes[path[1]]["_obj"] for path in paths]
+
+    def actors_within(
+        self,
+        actors,
+        hops: int | None,
+        location_labels: list | None = None,
+        return_distances: bool = False,
+    ) -> list[_actor.Actor] | dict:
+        """Return all actors that can be reached from some actors within a number of hops.
+
+        One hop leads from an actor to all other actors at its locations, so the actors within
+        one hop are the neighbors. The network is explored breadth-first from all given actors
+        at once. Every location is visited only once, so the running time is linear in the
+        number of visited memberships.
+
+        Args:
+            actors: An actor or an iterable of actors to start from.
+            hops: The maximum number of hops. If None, all reachable actors are returned.
+            location_labels: A list of location_labels. Only locations with these labels are
+                crossed. Defaults to None, which considers all locations.
+            return_distances: Should the number of hops to each actor be returned?
+                Defaults to False.
+
+        Raises:
+            ValueError: Raised if hops is negative.
+            Exception: Raised if one of the actors does not exist in the environment.
+
+        Returns:
+            The reached actors in the order in which they were reached, without the actors
+            started from. If return_distances is True, a dict of the reached actors and the
+            smallest number of hops to them.
+        """
+        if hops is not None and hops < 0:
+            msg = "hops must not be negative."
+            raise ValueError(msg)
+        if hasattr(actors, "id_p2n"):
+            actors = [actors]
+
+        all_actors = self._actors
+        frontier = []
+        for actor in actors:
+            if actor.id_p2n not in all_actors:
+                msg = f"Actor {actor} does not exist in Environment!"
+                raise Exception(msg)
+            frontier.append(actor.id_p2n)
+
+        if location_labels:
+            labeled = [self._locations_by_label.get(label, {}) for label in location_labels]
+            locations = {node for location_ids in labeled for node in location_ids}
+        else:
+            locations = self._locations
+
+        neighbors = self._backend.neighbors
+        # actor id -> number of hops
+        distances = dict.fromkeys(frontier, 0)
+        visited_locations = set()
+        hop = 0
+        while frontier and (hops is None or hop < hops):
+            hop += 1
+            next_frontier = []
+            for actor_id in frontier:
+                for location_id in neighbors(actor_id):
+                    if location_id in visited_locations or location_id not in locations:
+                        continue
+                    visited_locations.add(location_id)
+                    for member_id in neighbors(location_id):
+                        if member_id not in distances and member_id in all_actors:
+                            distances[member_id] = hop
+                            next_frontier.append(member_id)
+            frontier = next_frontier
+
+        reached = {
+            all_actors[actor_id]: distance for actor_id, distance in distances.items() if distance
+        }
+        if return_distances:
+            return reached
+        return self._to_framework(list(reached))
+
+    def _objects_between_objects(self, object1, object2, candidates: list[dict]) -> list:
+        """Return all objects that are directly connected to both given objects.
+
+        On the bipartite graph, these are the objects in the intersection of the two neighbor
+        sets, which the backend computes lazily. Only nodes contained in one of the given
+        candidate indexes are kept, so that filters (e.g. by location label) are applied during
+        the intersection.
+
+        Args:
+            object1: Entity 1.
+            object2: Entity 2.
+            candidates: A list of id -> object indexes the connecting objects must belong to.
+
+        Raises:
+            ValueError: Raised if both entities are identical.
+
+        Returns:
+            list: The connecting objects.
+        """
+        if object1 is object2:
+            msg = "Entity 1 and entity 2 are identical."
+            raise ValueError(msg)
+
+        common_neighbors = self._backend.common_neighbors(object1.id_p2n, object2.id_p2n)
+
+        if len(candidates) == 1:
+            index = candidates[0]
+            return [index[node] for node in common_neighbors if node in index]
+
+        objects = []
+        for node in common_neighbors:
+            for index in candidates:
+                if node in index:
+                    objects.append(index[node])
+                    break
+        return objects
+
+    def _actor_weight(
+        self,
+        actor1: _actor.Actor,
+        actor2: _actor.Actor,
+        location_labels: list | None = None,
+    ) -> float:
+        """Return the contact weight between two actors, summed over all shared locations."""
+        weight_cache = self._weight_cache
+        if weight_cache is not None:
+            key = (
+                actor1.id_p2n,
+                actor2.id_p2n,
+                tuple(location_labels) if location_labels else None,
+            )
+            entry = weight_cache.get(key)
+            if entry is not None:
+                return entry[0]
+
+        locations = self._locations_between_actors(actor1, actor2, location_labels=location_labels)
+        weight = 0
+        for location in locations:
+            weight += location.project_weights(actor1=actor1, actor2=actor2)
+
+        if weight_cache is not None:
+            weight_cache.put(key, weight, tuple(location.id_p2n for location in locations))
+        return weight
+
+    def _locations_between_actors(
+        self, actor1, actor2, location_labels: list[str] | None = None
+    ) -> list:
+        if location_labels is None:
+            candidates = [self._locations]
+        else:
+            candidates = [
+                self._locations_by_label[label]
+                for label in dict.fromkeys(location_labels)
+                if label in self._locations_by_label
+            ]
+        return self._objects_between_objects(actor1, actor2, candidates)
 
     def locations_between_actors(
         self, actor1, actor2, location_labels: list[str] | None = None
@@ -361,12 +1362,9 @@ class Environment:
         Returns:
             LocationList: A list of locations.
         """
-        locations = self._objects_between_objects(object1=actor1, object2=actor2)
-
-        if location_labels is not None:
-            locations = [location for location in locations if location.label in location_labels]
-
-        return self._to_framework(locations)
+        return self._to_framework(
+            self._locations_between_actors(actor1, actor2, location_labels=location_labels)
+        )
 
     def actors_between_locations(
         self, location1, location2, actor_types: list[str] | None = None
@@ -382,7 +1380,7 @@ class Environment:
         Returns:
             List: A list of actors.
         """
-        actors = self._objects_between_objects(location1, location2)
+        actors = self._objects_between_objects(location1, location2, [self._actors])
 
         if actor_types is not None:
             actors = [actor for actor in actors if actor.type in actor_types]
@@ -399,9 +1397,23 @@ class Environment:
             location (Location): The location.
             weight (int): The weight
         """
-        self.g[actor.id_p2n][location.id_p2n]["weight"] = (
-            location.weight(actor) if weight is None else weight
-        )
+        weight = self._set_weight(actor, location, weight)
+        self._journal_changes(_journal.SET_WEIGHT, (actor.id_p2n,), (location.id_p2n,), (weight,))
+
+    def _set_weight(self, actor, location, weight: float | None) -> float:
+        if weight is None:
+            weight = location.weight(actor)
+        if self._weight_cache is not None and len(self._weight_cache):
+            try:
+                changed = self._backend.get_weight(actor.id_p2n, location.id_p2n) != weight
+            except KeyError:
+                changed = True
+            if changed:
+                self._weights_changed(location.id_p2n)
+        self._sampler.clear()
+        self._projection_changed((location.id_p2n,))
+        self._backend.set_weight(actor.id_p2n, location.id_p2n, weight)
+        return weight
 
     def get_weight(self, actor, location) -> int:
         """Get the weight of an actor at a location.
@@ -413,7 +1425,107 @@ class Environment:
         Returns:
             int: The weight.
         """
-        return self.g[actor.id_p2n][location.id_p2n]["weight"]
+        return self._backend.get_weight(actor.id_p2n, location.id_p2n)
+
+    def _membership_ids(self, actors, locations) -> tuple[np.ndarray, np.ndarray]:
+        actor_ids = np.fromiter((actor.id_p2n for actor in actors), dtype=np.int64)
+        location_ids = np.fromiter((location.id_p2n for location in locations), dtype=np.int64)
+        if len(actor_ids) != len(location_ids):
+            msg = "actors and locations must have the same length."
+            raise ValueError(msg)
+        return actor_ids, location_ids
+
+    def get_weights(self, actors, locations) -> np.ndarray:
+        """Get the weights of many actors at many locations at once.
+
+        The weight of the i-th actor at the i-th location is returned at position i. With the
+        "sparse" backend, the weights are read from the weight array in a single vectorized
+        operation.
+
+        Args:
+            actors: An iterable of actors.
+            locations: An iterable of locations of the same length.
+
+        Raises:
+            ValueError: Raised if the inputs do not have the same length.
+            KeyError: Raised if one of the actors is not affiliated with its location.
+
+        Returns:
+            An array of the weights.
+        """
+        actor_ids, location_ids = self._membership_ids(actors, locations)
+        return self._backend.get_weights(actor_ids, location_ids)
+
+    def set_weights(self, actors, locations, weights=None) -> None:
+        """Set the weights of many actors at many locations at once.
+
+        The weight of the i-th actor at the i-th location is set to the i-th weight. With the
+        "sparse" backend, the weights are written to the weight array in a single vectorized
+        operation.
+
+        Args:
+            actors: An iterable of actors.
+            locations: An iterable of locations of the same length.
+            weights: An array, iterable or single value of weights. If None, location.weight()
+                is used to generate the weight of each membership.
+
+        Raises:
+            ValueError: Raised if the inputs do not have the same length.
+            KeyError: Raised if one of the actors is not affiliated with its location.
+        """
+        if weights is None:
+            actors = list(actors)
+            locations = list(locations)
+        actor_ids, location_ids = self._membership_ids(actors, locations)
+        if weights is None:
+            weights = [location.weight(actor) for actor, location in zip(actors, locations)]
+        elif np.ndim(weights) == 0:
+            weights = np.broadcast_to(weights, actor_ids.shape)
+        elif len(weights) != len(actor_ids):
+            msg = "weights must have the same length as actors and locations."
+            raise ValueError(msg)
+
+        self._set_weights(actor_ids, location_ids, weights)
+
+    def _set_weights(self, actor_ids: np.ndarray, location_ids: np.ndarray, weights) -> None:
+        if self._weight_cache is not None and len(self._weight_cache):
+            old_weights = self._backend.get_weights(actor_ids, location_ids)
+            changed = [old != new for old, new in zip(old_weights.tolist(), list(weights))]
+            for location_id in np.unique(location_ids[np.asarray(changed, dtype=bool)]).tolist():
+                self._weights_changed(location_id)
+        self._sampler.clear()
+        if self._live_projection is not None:
+            self._projection_changed(np.unique(location_ids).tolist())
+        self._backend.set_weights(actor_ids, location_ids, weights)
+        if self._journal is not None:
+            self._journal_changes(
+                _journal.SET_WEIGHT,
+                actor_ids,
+                location_ids,
+                np.broadcast_to(np.asarray(weights, dtype=float), actor_ids.shape),
+            )
+
+    def weights_by_label(self, label: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return all weights at the locations of a specific label as arrays.
+
+        The weights are returned together with the `id_p2n` of the corresponding actors and
+        locations, so that they can be modified with numpy and written back with
+        `set_weights()` or `add_memberships()`.
+
+        Args:
+            label: The desired location label.
+
+        Returns:
+            The actor ids, the location ids and the weights of all memberships at these
+            locations.
+        """
+        actor_ids, location_ids, weights = self._backend.memberships_of(
+            list(self._locations_by_label.get(label, {}))
+        )
+        if self._tombstones:
+            alive = ~np.isin(actor_ids, list(self._tombstones))
+            actor_ids, location_ids, weights = actor_ids[alive], location_ids[alive], weights[alive]
+        return actor_ids, location_ids, weights
 
     def connect_actors(self, actors: list, location_cls: type, weight: float | None = None):
         """Connects multiple actors via an instance of a given location class.
@@ -458,47 +1570,86 @@ class Environment:
         the environment could have even more sideeffects to those actors still connected with this
         location!
 
+        The shared locations are found by counting the memberships of the given actors per
+        location, and all memberships are removed in a single batch, so large groups of actors
+        can be disconnected at once. Locations that override `remove_actors()` or
+        `remove_actor()` remove the actors through these methods instead.
+
         Args:
             actors (list): A list of actors.
             location_labels (list | None, optional): A list of location types to specify which
             shared locations are considered. Defaults to None.
             remove_locations (bool, optional): A bool that determines whether the shared locations
                 shall be removed from the environment. Defaults to False.
-        """
-        pairs = list(itertools.combinations(actors, 2))
 
-        shared_locations = []
+        Raises:
+            Exception: Raised if one of the actors does not exist in the environment.
+        """
+        actors = list(actors)
+        locations = self._locations
+        if location_labels is not None:
+            locations = {}
+            for label in location_labels:
+                locations.update(self._locations_by_label.get(label, {}))
 
-        for actor1, actor2 in pairs:
-            shared_locations.extend(
-                self.locations_between_actors(
-                    actor1=actor1,
-                    actor2=actor2,
-                    location_labels=location_labels,
-                )
+        # count the memberships of the given actors per location in one pass
+        members: dict[int, list[int]] = {}
+        for actor in actors:
+            if actor.id_p2n not in self._actors:
+                msg = f"Actor {actor} does not exist in Environment!"
+                raise Exception(msg)
+        for actor_id in dict.fromkeys(actor.id_p2n for actor in actors):
+            for location_id in self._backend.neighbors(actor_id):
+                if location_id in locations:
+                    members.setdefault(location_id, []).append(actor_id)
+        shared = {
+            location_id: actor_ids
+            for location_id, actor_ids in members.items()
+            if len(actor_ids) >= 2
+        }
+        if not shared:
+            return
+
+        # locations with more members than the given actors also connect other actors
+        others = False
+        for location_id, actor_ids in shared.items():
+            n_members = (
+                len(self._members(location_id))
+                if self._tombstones
+                else self._backend.degree(location_id)
             )
+            if n_members > len(actor_ids):
+                others = True
+                break
+
+        if others and self.enable_p2n_warnings:
+            msg = "There are other actors at the location from which you have removed actors."
+            warnings.warn(msg, stacklevel=2)
+
+        # locations that override remove_actors() or remove_actor() are updated through them
+        default_remove_actors = p2n.location.LocationBase.remove_actors
+        default_remove_actor = p2n.location.LocationBase.remove_actor
+        batch = {}
+        for location_id, actor_ids in shared.items():
+            location = self._locations[location_id]
+            if (
+                type(location).remove_actors is default_remove_actors
+                and type(location).remove_actor is default_remove_actor
+            ):
+                batch[location_id] = actor_ids
+            else:
+                location.remove_actors([self._actors[actor_id] for actor_id in actor_ids])
+        self.remove_memberships(
+            [actor_id for actor_ids in batch.values() for actor_id in actor_ids],
+            [location_id for location_id, actor_ids in batch.items() for _ in actor_ids],
+        )
 
-        shared_locations = set(shared_locations)
-
-        for location in shared_locations:
-            warn = False
-            for actor in location.actors:
-                if actor not in actors:
-                    warn = True
-                    break
-
-            if warn and self.enable_p2n_warnings:
-                msg = "There are other actors at the location from which you have removed actors."
-                warnings.warn(msg)
-
-            location.remove_actors(actors)
-
-            if remove_locations:
-                self.remove_location(location=location)
+        if remove_locations:
+            self.remove_locations([self._locations[location_id] for location_id in shared])
 
-                if warn and self.enable_p2n_warnings:
-                    msg = "You have removed a location to which other actors were still connected."
-                    warnings.warn(msg)
+            if others and self.enable_p2n_warnings:
+                msg = "You have removed a location to which other actors were still connected."
+                warnings.warn(msg, stacklevel=2)
 
     def export_bipartite_network(
         self,
@@ -527,39 +1678,124 @@ class Environment:
         self,
         node_attrs: list | None = None,
         include_0_weights: bool = True,
-    ) -> nx.Graph:
+        output: str = "networkx",
+    ) -> nx.Graph | sp.csr_matrix | tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Creates a projection of the environment's bipartite network.
 
+        The projection is computed in one pass with sparse matrix algebra. Locations whose
+        class overrides `Location.project_weights()` without also overriding
+        `Location.project_weights_batch()` are projected pair by pair.
+
         Args:
-            node_attrs: A list of actor attributes
-            include_0_weights: Should edges with weight 0 be displayed?
+            node_attrs: A list of actor attributes. Only used if output is "networkx".
+            include_0_weights: Should edges with a weight of 0 or less be included?
+            output: The format of the projection. Options are: "networkx" for a networkx graph,
+                "scipy" for a symmetric scipy.sparse CSR matrix whose rows and columns follow the
+                order of `Environment.actors`, and "edgelist" for a tuple of three arrays
+                containing the ids of both actors and the weight of each edge.
+                Defaults to "networkx".
 
         Returns:
             A weighted graph created from a environment's actor list. Actors are connected if they are
             neighbors in the environment. Their connecting edge include the contact_weight as "weight"
             attribute.
         """
-        graph = nx.Graph()
+        if self._tombstones:
+            self.compact()
+        actor_ids, first, second, weights = projection.project_actor_network(self)
+
+        if not include_0_weights:
+            keep = weights > 0
+            first, second, weights = first[keep], second[keep], weights[keep]
+
+        if output == "edgelist":
+            return actor_ids[first], actor_ids[second], weights
+
+        if output == "scipy":
+            # edges with a weight of 0 are stored as explicit zeros
+            return sp.csr_matrix(
+                (np.r_[weights, weights], (np.r_[first, second], np.r_[second, first])),
+                shape=(len(actor_ids), len(actor_ids)),
+            )
 
-        # create nodes
-        for actor in self.actors:
-            if not graph.has_node(actor.id_p2n):
-                node_attr_dict = (
-                    {node_attr: vars(actor)[node_attr] for node_attr in node_attrs}
-                    if node_attrs is not None
-                    else {}
+        if output != "networkx":
+            msg = f"Invalid output selected: {output}"
+            raise ValueError(msg)
+
+        graph = nx.Graph()
+        if node_attrs is None:
+            graph.add_nodes_from(self._actors)
+        else:
+            graph.add_nodes_from(
+                (
+                    actor_id,
+                    {node_attr: getattr(actor, node_attr) for node_attr in node_attrs},
                 )
-                graph.add_node(actor.id_p2n, **node_attr_dict)
+                for actor_id, actor in self._actors.items()
+            )
+        graph.add_weighted_edges_from(
+            zip(actor_ids[first].tolist(), actor_ids[second].tolist(), weights.tolist())
+        )
+        return graph
 
-        # create edges
-        for actor in self.actors:
-            for actor_v in actor.neighbors():
-                if not graph.has_edge(actor.id_p2n, actor_v.id_p2n):
-                    weight = actor.get_actor_weight(actor_v)
-                    if include_0_weights or weight > 0:
-                        graph.add_edge(actor.id_p2n, actor_v.id_p2n, weight=weight)
+    def actor_network(self, include_0_weights: bool = True, rebuild: bool = False) -> nx.Graph:
+        """Return the live projection of the environment's bipartite network onto the actors.
 
-        return graph
+        Requires `live_projection=True`. The projection has the same edges and weights as the
+        graph returned by `export_actor_network()`, but it is updated incrementally: only the
+        locations whose memberships or weights changed since the last call are reprojected.
+        The returned graph is owned by the environment and changes with it; do not modify it.
+
+        Args:
+            include_0_weights: Should edges with a weight of 0 or less be included?
+            rebuild: Should all locations be reprojected? Use it if `Location.project_weights()`
+                depends on actor attributes that changed. Defaults to False.
+
+        Raises:
+            ValueError: Raised if the live projection is disabled.
+
+        Returns:
+            A graph whose nodes are the `id_p2n` of the actors and whose edges have the contact
+            weight as "weight" attribute.
+        """
+        if self._live_projection is None:
+            msg = (
+                "The live projection is disabled. Create the environment with live_projection=True."
+            )
+            raise ValueError(msg)
+        if rebuild:
+            self._live_projection.mark_all()
+        graph = self._live_projection.update()
+        if include_0_weights:
+            return graph
+        return nx.subgraph_view(graph, filter_edge=lambda u, v: graph[u][v]["weight"] > 0)
+
+    def journal_cursor(self, from_start: bool = False) -> _journal.JournalCursor:
+        """Return a cursor over the journal of changes of the environment.
+
+        Requires `journal` to be set. The cursor returns the changes that were recorded since
+        its last read as `Change` tuples of (seq, kind, actor_id, location_id, weight). The
+        kinds are "add_actor", "remove_actor", "add_location", "remove_location",
+        "add_membership", "remove_membership" and "set_weight". Removing an actor or a location
+        also removes its memberships, which are not recorded separately. Each consumer should
+        use its own cursor.
+
+        Args:
+            from_start: If True, the cursor starts at the oldest change that is still kept in
+                the journal. Defaults to False, which only returns changes made from now on.
+
+        Raises:
+            ValueError: Raised if the journal is disabled.
+
+        Returns:
+            The cursor.
+        """
+        if self._journal is None:
+            msg = (
+                "The journal is disabled. Create the environment with journal=<number of changes>."
+            )
+            raise ValueError(msg)
+        return self._journal.cursor(from_start=from_start)
 
     def update_weights(self, location_labels: list | None = None) -> None:
         """Updates the edge weights between actors and locations.
@@ -567,15 +1803,312 @@ class Environment:
         If you only want to update the weights of specific types of locations
         specify those types in location_labels.
 
+        The weights of all members of a location are generated with one call of
+        `Location.weight_batch()` and all weights are written at once. Locations whose class
+        overrides `Location.set_weight()` get their weights one actor at a time through it.
+
         Args:
             location_labels (list | None, optional): A list of location classes that specifiy for
                 which location types the weights should be updated.
                 If location_labels is None all locations are considered. Defaults to None.
         """
-        for location in (
-            self.locations
-            if location_labels is None
-            else [location for location in self.locations if location.label in location_labels]
-        ):
-            for actor in location.actors:
-                location.set_weight(actor=actor, weight=location.weight(actor=actor))
+        if location_labels is None:
+            locations = list(self._locations.values())
+        else:
+            locations = [
+                location
+                for label in dict.fromkeys(location_labels)
+                for location in list(self._locations_by_label.get(label, {}).values())
+            ]
+
+        actors = self._actors
+        actor_ids = []
+        location_ids = []
+        weights = []
+        default_set_weight = p2n.location.LocationBase.set_weight
+        for location in locations:
+            members = self._members(location.id_p2n)
+            if not members:
+                continue
+            if type(location).set_weight is not default_set_weight:
+                for actor in [actors[i] for i in members]:
+                    location.set_weight(actor=actor, weight=location.weight(actor=actor))
+                continue
+            location_weights = np.asarray(location.weight_batch([actors[i] for i in members]))
+            if location_weights.shape != (len(members),):
+                msg = (
+                    f"{type(location).__name__}.weight_batch() returned {location_weights.size} "
+                    f"weights for {len(members)} actors."
+                )
+                raise ValueError(msg)
+            actor_ids.extend(members)
+            location_ids.extend([location.id_p2n] * len(members))
+            weights.append(location_weights)
+
+        if weights:
+            self._set_weights(
+                np.array(actor_ids, dtype=np.int64),
+                np.array(location_ids, dtype=np.int64),
+                np.concatenate(weights),
+            )
+
+    def freeze(self) -> _frozen.FrozenEnvironment:
+        """Return a read-only snapshot of the network for parallel steps.
+
+        The snapshot stores the memberships and weights as immutable arrays and does not change
+        when the environment changes, so it can be shared by many threads. Record the changes
+        made during a parallel phase in `MutationBuffer` objects and apply them afterwards with
+        `apply_mutations()`.
+
+        Returns:
+            The frozen environment.
+        """
+        return _frozen.FrozenEnvironment(self)
+
+    def to_shared_memory(self, attributes: list[str] | None = None) -> _shared.SharedEnvironment:
+        """Return a read-only snapshot of the network in shared memory for worker processes.
+
+        The snapshot works like the one returned by `freeze()`, but its arrays and the
+        selected numeric actor attributes are stored in a `multiprocessing.shared_memory`
+        block. Pickling it only transfers the name of the block, and unpickling it in another
+        process attaches to the block without copying the arrays. Call `unlink()` on the
+        returned object, or use it as a context manager, to remove the block afterwards.
+
+        Args:
+            attributes: A list of names of numeric actor attributes to share. Defaults to None.
+
+        Raises:
+            ValueError: Raised if an attribute is not numeric or boolean.
+
+        Returns:
+            The shared environment.
+        """
+        return _shared.SharedEnvironment(self, attributes=attributes)
+
+    def apply_mutations(self, buffers) -> dict:
+        """Apply the changes recorded in mutation buffers.
+
+        The buffers are applied in the given order and the changes of each buffer in the order
+        in which they were recorded, so the result only depends on this order. Consecutive
+        changes of the same kind are applied as one batch with `add_memberships()`,
+        `remove_memberships()` or `set_weights()`.
+
+        Args:
+            buffers: A `MutationBuffer` or an iterable of them.
+
+        Raises:
+            KeyError: Raised if a weight is set for a missing membership or an attribute is set
+                for an unknown actor. The changes recorded before it are already applied.
+
+        Returns:
+            A dict with the number of `added`, `updated` and `removed` memberships, the number of
+            removed memberships that were `missing` and the `unknown_actor_ids` and
+            `unknown_location_ids` of added or removed memberships that were skipped.
+        """
+        if isinstance(buffers, _frozen.MutationBuffer):
+            buffers = [buffers]
+        summary = {"added": 0, "updated": 0, "removed": 0, "missing": 0}
+        unknown_actor_ids = set()
+        unknown_location_ids = set()
+        actors = self._actors
+        locations = self._locations
+
+        for buffer in buffers:
+            for kind, actor_ids, location_ids, values in buffer.runs():
+                if kind == _frozen._ADD_MEMBERSHIP:
+                    weights = None
+                    if any(value is not None for value in values):
+                        weights = [
+                            value
+                            if value is not None
+                            else locations[location_id].weight(actors[actor_id])
+                            if actor_id in actors and location_id in locations
+                            else 0
+                            for actor_id, location_id, value in zip(actor_ids, location_ids, values)
+                        ]
+                    result = self.add_memberships(actor_ids, location_ids, weights)
+                    summary["added"] += result["added"]
+                    summary["updated"] += result["updated"]
+                elif kind == _frozen._REMOVE_MEMBERSHIP:
+                    result = self.remove_memberships(actor_ids, location_ids)
+                    summary["removed"] += result["removed"]
+                    summary["missing"] += result["missing"]
+                elif kind == _frozen._SET_WEIGHT:
+                    self._set_weights(
+                        self._as_id_array(actor_ids), self._as_id_array(location_ids), values
+                    )
+                    continue
+                else:
+                    for actor_id, name, value in zip(actor_ids, location_ids, values):
+                        setattr(actors[actor_id], name, value)
+                    continue
+                unknown_actor_ids.update(result["unknown_actor_ids"])
+                unknown_location_ids.update(result["unknown_location_ids"])
+
+        summary["unknown_actor_ids"] = sorted(unknown_actor_ids)
+        summary["unknown_location_ids"] = sorted(unknown_location_ids)
+        return summary
+
+    def partition(
+        self,
+        n_shards: int,
+        keep_together: list[str] | None = None,
+        imbalance: float = 0.05,
+    ) -> _partition.Partition:
+        """Split the population into shards with few memberships across shards.
+
+        Connected components of the bipartite network are kept together if they fit into a
+        shard. Larger components are split in breadth-first order, so that actors who are close
+        in the network end up in the same shard. The members of locations with a label in
+        `keep_together`, e.g. households, are never split up.
+
+        Args:
+            n_shards: The number of shards.
+            keep_together: A list of location labels whose members must stay in the same shard.
+                Defaults to None.
+            imbalance: How much larger than the mean shard size a shard may become when a
+                whole component is assigned to it. Defaults to 0.05.
+
+        Raises:
+            ValueError: Raised if n_shards is smaller than 1 or the environment uses a framework.
+
+        Returns:
+            The partition with one sub-environment per shard, the memberships that cross the
+            shard boundary and the quality metrics `edge_cut` and `balance`.
+        """
+        return _partition.Partition(
+            self, n_shards, keep_together=keep_together, imbalance=imbalance
+        )
+
+    def save(self, path, compress: bool = False) -> None:
+        """Save the environment to a binary `.npz` file.
+
+        The memberships with their weights and other edge attributes and the attributes of all
+        actors and locations are stored as typed numpy arrays, one per attribute, together with
+        the import paths of their classes. Attributes holding arbitrary Python objects are
+        stored in object arrays that can only be loaded with `allow_pickle=True`. References to
+        the model are not saved. Only environments without a framework can be saved.
+
+        Args:
+            path: The file or path to write to. numpy appends `.npz` if it is missing.
+            compress: Should the file be compressed? Defaults to False.
+        """
+        snapshot.save_environment(self, path, compress=compress)
+
+    @classmethod
+    def load(
+        cls,
+        path,
+        model=None,
+        classes: dict | None = None,
+        allow_pickle: bool = False,
+    ) -> Environment:
+        """Load an environment saved with `Environment.save()`.
+
+        The objects are restored without calling their constructors, like unpickled objects.
+        Classes that cannot be imported, e.g. classes defined inside functions or created by
+        the Creator, have to be passed in `classes`. Otherwise, their instances are restored as
+        instances of their nearest importable base class and a warning is shown.
+
+        Args:
+            path: The file or path to read from.
+            model: The model that is assigned to the environment and all objects.
+                Defaults to None.
+            classes: A dict mapping class names (the qualified name or "module:qualname") to
+                the classes that are used to restore their instances. Defaults to None.
+            allow_pickle: Should attributes holding arbitrary Python objects be loaded? Only
+                enable this for trusted files. Defaults to False.
+
+        Returns:
+            The restored environment.
+        """
+        return snapshot.load_environment(
+            cls,
+            path,
+            model=model,
+            classes=classes,
+            allow_pickle=allow_pickle,
+        )
+
+    def fork(self) -> Environment:
+        """Create a branch of the environment, e.g. to run another scenario on the same population.
+
+        The branch is an independent environment with copies of all actors and locations. Their
+        attribute values are not copied but shared, so mutable values like lists should be
+        replaced instead of changed in place. With the sparse backend, the memberships and
+        weights are shared until one of the environments changes them, and the columns of
+        columnar actors are shared until one of the environments writes to them. Only the
+        changed arrays are copied. The networkx backend copies the graph.
+
+        Only environments without a framework can be forked.
+
+        Raises:
+            ValueError: Raised if the environment uses a framework.
+
+        Returns:
+            The new environment.
+        """
+        if self.framework is not None:
+            msg = "Only environments without a framework can be forked."
+            raise ValueError(msg)
+        if self._tombstones:
+            self.compact()
+
+        child = self._empty_like()
+        child._actors.update(self._fork_objects(self._actors, child))
+        child._locations.update(self._fork_objects(self._locations, child))
+        child._locations_by_label = {
+            label: {location_id: child._locations[location_id] for location_id in labeled}
+            for label, labeled in self._locations_by_label.items()
+        }
+        child._backend = self._backend.fork(child._actors, child._locations)
+        child._columns = self._columns.fork()
+        child._mutation_count = self._mutation_count
+        child._fresh_id = self._fresh_id
+        if child._live_projection is not None:
+            # the projection was created while the child was still empty
+            child._live_projection = projection.LiveProjection(child)
+        return child
+
+    def _empty_like(self) -> Environment:
+        # an empty environment with the same settings
+        return type(self)(
+            model=self.model,
+            enable_p2n_warnings=self.enable_p2n_warnings,
+            backend=self.backend,
+            neighbor_cache=None if self._neighbor_cache is None else self._neighbor_cache.maxsize,
+            weight_cache=None if self._weight_cache is None else self._weight_cache.maxsize,
+            live_projection=self._live_projection is not None,
+            journal=None if self._journal is None else self._journal.maxsize,
+            lazy_views=self._lazy_views,
+        )
+
+    @staticmethod
+    def _fork_objects(objects: dict, env: Environment) -> dict:
+        # shallow copies of the objects that belong to the given environment
+        layouts = {}
+        forked = {}
+        # the garbage collector would run many times over the new objects without finding any
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for obj_id, obj in objects.items():
+                cls = type(obj)
+                layout = layouts.get(cls)
+                if layout is None:
+                    layout = layouts[cls] = utils._instance_layout(cls)
+                slots, descriptor, _ = layout
+                new = cls.__new__(cls)
+                if descriptor is not None:
+                    attributes = descriptor.__get__(obj).copy()
+                    if "env" not in slots:
+                        attributes["env"] = env
+                    descriptor.__set__(new, attributes)
+                for name in slots:
+                    if hasattr(obj, name):
+                        object.__setattr__(new, name, env if name == "env" else getattr(obj, name))
+                forked[obj_id] = new
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return forked
@@ -5,3 +5,9 @@ class Pop2netException(Exception):  # noqa: N818
     """Base class for all exceptions in Pop2net."""
 
     pass
+
+
+class JournalOverflowError(Pop2netException):
+    """Raised if changes were dropped from a journal before a cursor read them."""
+
+    pass
@@ -0,0 +1,350 @@
+"""Read-only snapshots of an Environment and buffered changes for parallel steps."""
+
+from __future__ import annotations
+
+import types
+import typing
+
+import numpy as np
+
+from . import projection
+
+if typing.TYPE_CHECKING:
+    from .environment import Environment
+
+# kinds of buffered changes
+_ADD_MEMBERSHIP = 0
+_REMOVE_MEMBERSHIP = 1
+_SET_WEIGHT = 2
+_SET_ATTRIBUTE = 3
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray, n_rows: int) -> tuple:
+    """Sort memberships by row and return the index pointer, the columns and the weights."""
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return (
+        _read_only(indptr),
+        _read_only(cols[order].astype(np.int64)),
+        _read_only(weights[order].astype(np.float64)),
+    )
+
+
+class FrozenEnvironment:
+    """A read-only snapshot of the network of an environment.
+
+    The memberships are stored twice as immutable CSR arrays: `actor_indptr`,
+    `actor_locations` and `actor_weights` list the location positions and weights of each
+    actor, `location_indptr`, `location_actors` and `location_weights` list the actor
+    positions and weights at each location. Positions are the dense positions of the
+    environment at the time of freezing (see `Environment.actor_index()`).
+
+    Nothing of a frozen environment can change, so it can be read from many threads at the
+    same time while the environment itself is left alone. Pickling a frozen environment, e.g.
+    to send it to a process pool, only transfers its arrays and labels. The actor and location
+    objects stay in the original process, so other processes have to use the array-based
+    methods. The attributes of the objects are not part of the snapshot.
+    """
+
+    def __init__(self, env: Environment) -> None:
+        """Freeze the current network of an environment.
+
+        Args:
+            env: The environment.
+        """
+        if env._tombstones:
+            env.compact()
+        actor_ids = np.fromiter(env._actors, dtype=np.int64, count=len(env._actors))
+        location_ids = np.fromiter(env._locations, dtype=np.int64, count=len(env._locations))
+        member_actor_ids, member_location_ids, weights = env._backend.memberships(env._actors)
+        rows = projection._positions(actor_ids, member_actor_ids)
+        cols = projection._positions(location_ids, member_location_ids)
+        weights = np.asarray(weights, dtype=np.float64)
+        label_names: dict = {}
+        label_codes = [
+            label_names.setdefault(location.label, len(label_names))
+            for location in env._locations.values()
+        ]
+
+        attributes = dict(
+            zip(
+                ["actor_indptr", "actor_locations", "actor_weights"],
+                _csr(rows, cols, weights, len(actor_ids)),
+            )
+        )
+        attributes.update(
+            zip(
+                ["location_indptr", "location_actors", "location_weights"],
+                _csr(cols, rows, weights, len(location_ids)),
+            )
+        )
+        attributes.update(
+            actor_ids=_read_only(actor_ids),
+            location_ids=_read_only(location_ids),
+            location_label_codes=_read_only(np.array(label_codes, dtype=np.int64)),
+            label_names=tuple(label_names),
+            mutation_count=env._mutation_count,
+            _actor_positions=types.MappingProxyType(
+                dict(zip(actor_ids.tolist(), range(len(actor_ids))))
+            ),
+            _location_positions=types.MappingProxyType(
+                dict(zip(location_ids.tolist(), range(len(location_ids))))
+            ),
+            _actors=tuple(env._actors.values()),
+            _locations=tuple(env._locations.values()),
+        )
+        # __setattr__ rejects all changes
+        self.__dict__.update(attributes)
+
+    def __setattr__(self, name: str, value) -> None:
+        """Reject all changes."""
+        msg = "A FrozenEnvironment is read-only."
+        raise AttributeError(msg)
+
+    def __getstate__(self) -> dict:
+        """Return the arrays and labels for pickling, without the objects."""
+        state = dict(self.__dict__)
+        state["_actors"] = None
+        state["_locations"] = None
+        state["_actor_positions"] = dict(self._actor_positions)
+        state["_location_positions"] = dict(self._location_positions)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled snapshot."""
+        self.__dict__.update(state)
+        for name in ["_actor_positions", "_location_positions"]:
+            self.__dict__[name] = types.MappingProxyType(state[name])
+        for value in state.values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+
+    @property
+    def n_actors(self) -> int:
+        """The number of actors."""
+        return len(self.actor_ids)
+
+    @property
+    def n_locations(self) -> int:
+        """The number of locations."""
+        return len(self.location_ids)
+
+    @property
+    def location_labels(self) -> tuple:
+        """The labels of all locations in the order of their positions."""
+        names = self.label_names
+        return tuple(names[code] for code in self.location_label_codes.tolist())
+
+    def _objects(self, objects: tuple | None) -> tuple:
+        if objects is None:
+            msg = (
+                "The actors and locations of a frozen environment are not pickled or shared. "
+                "Use the array-based methods in other processes."
+            )
+            raise ValueError(msg)
+        return objects
+
+    @property
+    def actors(self) -> tuple:
+        """All actors in the order of their positions."""
+        return self._objects(self._actors)
+
+    @property
+    def locations(self) -> tuple:
+        """All locations in the order of their positions."""
+        return self._objects(self._locations)
+
+    def actor_index(self, actor) -> int:
+        """Return the position of an actor.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+
+        Raises:
+            KeyError: Raised if the actor was not in the environment when it was frozen.
+        """
+        return self._actor_positions[getattr(actor, "id_p2n", actor)]
+
+    def location_index(self, location) -> int:
+        """Return the position of a location.
+
+        Args:
+            location: The location or its `id_p2n`.
+
+        Raises:
+            KeyError: Raised if the location was not in the environment when it was frozen.
+        """
+        return self._location_positions[getattr(location, "id_p2n", location)]
+
+    def location_indices_of(self, index: int) -> np.ndarray:
+        """Return the positions of the locations of the actor at a position."""
+        return self.actor_locations[self.actor_indptr[index] : self.actor_indptr[index + 1]]
+
+    def actor_indices_at(self, index: int) -> np.ndarray:
+        """Return the positions of the actors at the location at a position."""
+        return self.location_actors[self.location_indptr[index] : self.location_indptr[index + 1]]
+
+    def neighbor_indices(self, index: int, location_labels: list | None = None) -> np.ndarray:
+        """Return the positions of the neighbors of the actor at a position.
+
+        Args:
+            index: The position of the actor.
+            location_labels: A list of location_labels. Only neighbors at these locations are
+                returned. Defaults to None, which considers all locations.
+
+        Returns:
+            The sorted positions of all other actors that share a location with the actor.
+        """
+        locations = self.location_indices_of(index)
+        if location_labels:
+            codes = [code for code, name in enumerate(self.label_names) if name in location_labels]
+            locations = locations[np.isin(self.location_label_codes[locations], codes)]
+        indptr = self.location_indptr
+        members = [
+            self.location_actors[indptr[location] : indptr[location + 1]]
+            for location in locations.tolist()
+        ]
+        neighbors = np.unique(np.concatenate([np.empty(0, dtype=np.int64), *members]))
+        return neighbors[neighbors != index]
+
+    def actors_of_location(self, location) -> tuple:
+        """Return the actors at a location."""
+        actors = self.actors
+        return tuple(
+            actors[i] for i in self.actor_indices_at(self.location_index(location)).tolist()
+        )
+
+    def locations_of_actor(self, actor) -> tuple:
+        """Return the locations of an actor."""
+        locations = self.locations
+        return tuple(
+            locations[i] for i in self.location_indices_of(self.actor_index(actor)).tolist()
+        )
+
+    def neighbors_of_actor(self, actor, location_labels: list | None = None) -> tuple:
+        """Return the neighbors of an actor.
+
+        Args:
+            actor: The actor.
+            location_labels: A list of location_labels.
+
+        Returns:
+            The other actors that share a location with the actor.
+        """
+        actors = self.actors
+        indices = self.neighbor_indices(self.actor_index(actor), location_labels)
+        return tuple(actors[i] for i in indices.tolist())
+
+    def get_weight(self, actor, location) -> float:
+        """Return the weight of an actor at a location.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+            location: The location or its `id_p2n`.
+
+        Raises:
+            KeyError: Raised if the actor is not affiliated with the location.
+        """
+        index = self.actor_index(actor)
+        location_index = self.location_index(location)
+        start, stop = self.actor_indptr[index], self.actor_indptr[index + 1]
+        found = start + np.searchsorted(self.actor_locations[start:stop], location_index)
+        if found == stop or self.actor_locations[found] != location_index:
+            msg = f"Actor {actor} is not affiliated with location {location}."
+            raise KeyError(msg)
+        return float(self.actor_weights[found])
+
+
+def _node_id(obj) -> int:
+    return getattr(obj, "id_p2n", obj)
+
+
+class MutationBuffer:
+    """Records changes of an environment to apply them later.
+
+    During a parallel phase, every task records its changes in its own buffer instead of
+    changing the environment. At the barrier, `Environment.apply_mutations()` applies the
+    buffers one after another in the given order, and the changes of each buffer in the order
+    in which they were recorded. The result does not depend on the order in which the tasks
+    finished. Buffers only store ids and values, so they can be returned from other processes.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty buffer."""
+        self._kinds: list[int] = []
+        self._actor_ids: list[int] = []
+        self._location_ids: list[int | None] = []
+        self._values: list = []
+
+    def __len__(self) -> int:
+        """Return the number of recorded changes."""
+        return len(self._kinds)
+
+    def _record(self, kind: int, actor, location, value) -> None:
+        self._kinds.append(kind)
+        self._actor_ids.append(_node_id(actor))
+        self._location_ids.append(None if location is None else _node_id(location))
+        self._values.append(value)
+
+    def add_membership(self, actor, location, weight: float | None = None) -> None:
+        """Record adding an actor to a location.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+            location: The location or its `id_p2n`.
+            weight: The weight. If None, location.weight() is used when the change is applied.
+        """
+        self._record(_ADD_MEMBERSHIP, actor, location, weight)
+
+    def remove_membership(self, actor, location) -> None:
+        """Record removing an actor from a location.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+            location: The location or its `id_p2n`.
+        """
+        self._record(_REMOVE_MEMBERSHIP, actor, location, None)
+
+    def set_weight(self, actor, location, weight: float) -> None:
+        """Record setting the weight of an actor at a location.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+            location: The location or its `id_p2n`.
+            weight: The weight.
+        """
+        self._record(_SET_WEIGHT, actor, location, weight)
+
+    def set_attribute(self, actor, name: str, value) -> None:
+        """Record setting an attribute of an actor.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+            name: The name of the attribute.
+            value: The value.
+        """
+        self._record(_SET_ATTRIBUTE, actor, name, value)
+
+    def runs(self):
+        """Yield the kind, actor ids, location ids and values of runs of changes.
+
+        Each run is a maximal sequence of consecutive changes of the same kind. For changed
+        attributes, the attribute names take the place of the location ids.
+        """
+        kinds = self._kinds
+        start = 0
+        for stop in range(1, len(kinds) + 1):
+            if stop == len(kinds) or kinds[stop] != kinds[start]:
+                yield (
+                    kinds[start],
+                    self._actor_ids[start:stop],
+                    self._location_ids[start:stop],
+                    self._values[start:stop],
+                )
+                start = stop
@@ -0,0 +1,73 @@
+"""Dense integer positions for the objects of an Environment."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class DenseIndex:
+    """Maps the objects of one side of the network to the dense positions 0..n-1.
+
+    The positions follow the insertion order of the objects, i.e. the order of `env.actors` or
+    `env.locations`. Adding objects appends them and keeps all existing positions. Removing
+    objects leaves gaps, so the positions are remapped the next time they are requested and the
+    generation of the index is increased, which tells array-based code that arrays aligned with
+    the old positions have to be realigned.
+    """
+
+    def __init__(self, objects: dict) -> None:
+        """Create an index over an insertion-ordered dict of id -> object.
+
+        Args:
+            objects: The dict of the environment holding the objects. It is not copied.
+        """
+        self._objects = objects
+        self._order: list | None = None
+        self._positions: dict[int, int] | None = None
+        self.generation = 0
+
+    def _build(self) -> None:
+        self._order = list(self._objects.values())
+        self._positions = {obj_id: i for i, obj_id in enumerate(self._objects)}
+
+    def add(self, obj_id: int, obj) -> None:
+        """Append a new object."""
+        if self._order is not None:
+            self._positions[obj_id] = len(self._order)
+            self._order.append(obj)
+
+    def extend(self, obj_ids: list, objects: list) -> None:
+        """Append many new objects."""
+        if self._order is not None:
+            self._positions.update(
+                zip(obj_ids, range(len(self._order), len(self._order) + len(obj_ids)))
+            )
+            self._order.extend(objects)
+
+    def remove(self) -> None:
+        """Remap the positions after objects were removed."""
+        if self._order is not None:
+            self._order = None
+            self._positions = None
+            self.generation += 1
+
+    def position(self, obj_id: int) -> int:
+        """Return the position of an object by its id. Raises a KeyError if it is missing."""
+        if self._positions is None:
+            self._build()
+        return self._positions[obj_id]
+
+    def positions(self, obj_ids) -> np.ndarray:
+        """Return the positions of many objects. Raises a KeyError if one of them is missing."""
+        if self._positions is None:
+            self._build()
+        return np.fromiter(map(self._positions.__getitem__, obj_ids), dtype=np.int64)
+
+    def at(self, position: int):
+        """Return the object at the given position. Raises an IndexError if it is out of range."""
+        if self._order is None:
+            self._build()
+        if position < 0:
+            msg = f"Negative position {position}."
+            raise IndexError(msg)
+        return self._order[position]
@@ -437,10 +437,8 @@ class NetworkInspector:
         # determine eligible locations classes
         valid_locations = []
         if location_labels:
-            for location_instance in self.env.locations:
-                for locationtype in location_labels:
-                    if location_instance.label == locationtype:
-                        valid_locations.append(location_instance)
+            for locationtype in location_labels:
+                valid_locations.extend(self.env.locations_by_label(locationtype))
         else:
             valid_locations = list(self.env.locations)
 
@@ -450,7 +448,9 @@ class NetworkInspector:
             if actor_attributes:
                 for i, location_instance in enumerate(valid_locations):
                     title = f"{i + 1}.Location: {str(location_instance.label).split(' ')[0]}"
-                    df = pd.DataFrame([vars(actor) for actor in location_instance.actors])
+                    df = pd.DataFrame(
+                        [utils._get_attributes(actor) for actor in location_instance.actors]
+                    )
                     df = df[list(actor_attributes)]
                     actor_dfs[title] = df
 
@@ -476,7 +476,9 @@ class NetworkInspector:
             for i, location_instance in enumerate(valid_locations):
                 title = f"{i + 1}.Location: {str(location_instance.label).split(' ')[0]}"
                 location_type = str(location_instance.label).split(" ")[0]
-                df = pd.DataFrame([vars(actor) for actor in location_instance.actors])
+                df = pd.DataFrame(
+                    [utils._get_attributes(actor) for actor in location_instance.actors]
+                )
 
                 # only keep wanted columns (actor attributes)
                 df = df[list(actor_attributes)]
@@ -550,10 +552,8 @@ class NetworkInspector:
         # determine eligible locations classes
         valid_locations = []
         if location_labels:
-            for location_instance in self.env.locations:
-                for locationtype in location_labels:
-                    if location_instance.label == locationtype:
-                        valid_locations.append(location_instance)
+            for locationtype in location_labels:
+                valid_locations.extend(self.env.locations_by_label(locationtype))
         else:
             valid_locations = list(self.env.locations)
 
@@ -565,7 +565,9 @@ class NetworkInspector:
                 title = f"{i + 1}.Location: {str(location_instance.label).split(' ')[0]}"
                 location_type = str(location_instance.label).split(" ")[0]
                 # get all actors per location instance, subset df by actor-attributes
-                df = pd.DataFrame([vars(actor) for actor in location_instance.actors])
+                df = pd.DataFrame(
+                    [utils._get_attributes(actor) for actor in location_instance.actors]
+                )
                 df = df[list(actor_attributes)]
                 df["location_type"] = location_type
                 actor_dfs[title] = df
@@ -573,7 +575,9 @@ class NetworkInspector:
             for i, location_instance in enumerate(valid_locations):
                 title = f"{i + 1}.Location: {str(location_instance.label).split(' ')[0]}"
                 location_type = str(location_instance.label).split(" ")[0]
-                df = pd.DataFrame([vars(actor) for actor in location_instance.actors])
+                df = pd.DataFrame(
+                    [utils._get_attributes(actor) for actor in location_instance.actors]
+                )
                 df.drop(df.iloc[:, 0:7], axis=1, inplace=True)
                 df["location_type"] = location_type
                 actor_dfs[title] = df
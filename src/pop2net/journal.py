@@ -0,0 +1,174 @@
+"""A bounded journal of the changes of an Environment."""
+
+from __future__ import annotations
+
+import itertools
+import typing
+
+import numpy as np
+
+from .exceptions import JournalOverflowError
+
+# kinds of changes
+ADD_ACTOR = "add_actor"
+REMOVE_ACTOR = "remove_actor"
+ADD_LOCATION = "add_location"
+REMOVE_LOCATION = "remove_location"
+ADD_MEMBERSHIP = "add_membership"
+REMOVE_MEMBERSHIP = "remove_membership"
+SET_WEIGHT = "set_weight"
+
+
+class Change(typing.NamedTuple):
+    """One change of the environment.
+
+    Attributes:
+        seq: The position of the change in the journal.
+        kind: The kind of the change, e.g. "add_membership".
+        actor_id: The `id_p2n` of the actor, or None if the change concerns a location only.
+        location_id: The `id_p2n` of the location, or None if the change concerns an actor only.
+        weight: The new weight of added memberships and set weights, otherwise None.
+    """
+
+    seq: int
+    kind: str
+    actor_id: int | None
+    location_id: int | None
+    weight: float | None
+
+
+def _values(values, n: int):
+    if values is None:
+        return itertools.repeat(None, n)
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    return values
+
+
+class Journal:
+    """An append-only record of the last `maxsize` changes of an environment.
+
+    Every change gets a sequence number. Consumers read the changes since their last read with a
+    `JournalCursor`. Older changes are dropped, so a consumer that falls more than `maxsize`
+    changes behind can no longer catch up and has to resynchronize with the environment.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty journal.
+
+        Args:
+            maxsize: The number of changes that are kept.
+        """
+        if maxsize < 1:
+            msg = "maxsize must be at least 1."
+            raise ValueError(msg)
+        self.maxsize = maxsize
+        self._entries: list[Change] = []
+        # sequence number of self._entries[0]
+        self._offset = 0
+        self._end = 0
+
+    @property
+    def start(self) -> int:
+        """The sequence number of the oldest change that can still be read."""
+        return max(self._offset, self._end - self.maxsize)
+
+    @property
+    def end(self) -> int:
+        """The sequence number of the next change."""
+        return self._end
+
+    def record(self, kind: str, actor_ids=None, location_ids=None, weights=None) -> None:
+        """Append changes of one kind.
+
+        Args:
+            kind: The kind of the changes.
+            actor_ids: The ids of the actors, or None.
+            location_ids: The ids of the locations, or None. Either `actor_ids` or
+                `location_ids` has to be given.
+            weights: The weights, or None.
+        """
+        n = len(actor_ids if actor_ids is not None else location_ids)
+        if not n:
+            return
+        self._entries.extend(
+            map(
+                Change._make,
+                zip(
+                    range(self._end, self._end + n),
+                    itertools.repeat(kind, n),
+                    _values(actor_ids, n),
+                    _values(location_ids, n),
+                    _values(weights, n),
+                ),
+            )
+        )
+        self._end += n
+        # dropping the oldest entries is amortized over `maxsize` changes
+        if len(self._entries) > 2 * self.maxsize:
+            del self._entries[: len(self._entries) - self.maxsize]
+            self._offset = self._end - len(self._entries)
+
+    def changes(self, start: int, stop: int | None = None) -> list[Change]:
+        """Return the changes with the sequence numbers start..stop-1.
+
+        Raises:
+            JournalOverflowError: Raised if some of the changes were already dropped.
+        """
+        if start < self.start:
+            msg = (
+                f"{self.start - start} changes were dropped from the journal before they were "
+                "read. Resynchronize with the environment and call `JournalCursor.skip()`."
+            )
+            raise JournalOverflowError(msg)
+        stop = self._end if stop is None else min(stop, self._end)
+        return self._entries[start - self._offset : stop - self._offset]
+
+    def cursor(self, from_start: bool = False) -> JournalCursor:
+        """Return a cursor that reads the changes recorded after its creation.
+
+        Args:
+            from_start: If True, the cursor starts at the oldest change that is still kept.
+        """
+        return JournalCursor(self, self.start if from_start else self._end)
+
+
+class JournalCursor:
+    """Reads the changes of a journal since the last read."""
+
+    def __init__(self, journal: Journal, position: int) -> None:
+        """Create a cursor at a position of a journal.
+
+        Args:
+            journal: The journal.
+            position: The sequence number of the first change to read.
+        """
+        self.journal = journal
+        self.position = position
+
+    @property
+    def pending(self) -> int:
+        """The number of changes that were recorded since the last read."""
+        return self.journal.end - self.position
+
+    def read(self, limit: int | None = None) -> list[Change]:
+        """Return the changes since the last read and move behind them.
+
+        Args:
+            limit: The maximum number of changes to return. Defaults to None, which returns all.
+
+        Raises:
+            JournalOverflowError: Raised if more changes were recorded since the last read than
+                the journal keeps.
+
+        Returns:
+            The changes in the order in which they happened.
+        """
+        stop = None if limit is None else self.position + limit
+        changes = self.journal.changes(self.position, stop)
+        self.position += len(changes)
+        return changes
+
+    def skip(self) -> None:
+        """Move behind the latest change without reading the changes in between."""
+        self.position = self.journal.end
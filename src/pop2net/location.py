@@ -2,22 +2,17 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from . import actor as _actor
 
 
-class Location:
-    """Base class for location objects."""
+class LocationBase:
+    """The methods shared by `Location` and `CompactLocation`."""
 
-    label: str | None = None
+    __slots__ = ()
 
-    def __init__(self, *args, **kwargs) -> None:
-        """Location constructor."""
-        self.label = self.__class__.__name__ if self.label is None else self.label
-        self.env = None
-        self.id_p2n = None
-        self.model = None
-        self.type = type(self).__name__
-        super().__init__(*args, **kwargs)
+    label: str | None = None
 
     def setup(self):
         pass
@@ -69,11 +64,34 @@ class Location:
     def remove_actors(self, actors: list) -> None:
         """Remove multiple actors at once.
 
+        The memberships are removed from the network in a single batch, unless a subclass
+        overrides `remove_actor()`. Then `remove_actor()` is called for each actor.
+
         Args:
             actors (list): An iterable over actors.
+
+        Raises:
+            Exception: Raised if the location or one of the actors does not exist in the
+                environment.
         """
+        if type(self).remove_actor is not LocationBase.remove_actor:
+            for actor in actors:
+                self.remove_actor(actor=actor)
+            return
+
+        if self.id_p2n not in self.env._locations:
+            msg = f"Location {self} does not exist in Environment!"
+            raise Exception(msg)
+        actors = list(actors)
         for actor in actors:
-            self.remove_actor(actor=actor)
+            if actor.id_p2n not in self.env._actors:
+                msg = f"Actor {actor} does not exist in Environment!"
+                raise Exception(msg)
+
+        self.env.remove_memberships(
+            [actor.id_p2n for actor in actors],
+            [self.id_p2n] * len(actors),
+        )
 
     def neighbors(self, actor: _actor.Actor) -> ActorList:
         """Returns a list of actors which are connected to the given actor via this location.
@@ -84,9 +102,9 @@ class Location:
         Returns:
             ActorList: A list of all actors at this location except the passed actor.
         """
-        actors = self.env.actors_of_location(self)
+        actors = list(self.env.actors_of_location(self))
         actors.remove(actor)
-        return actors
+        return self.env._to_framework(actors)
 
     def set_weight(self, actor, weight: float | None = None) -> None:
         """Set the weight of an actor at the current location.
@@ -125,6 +143,22 @@ class Location:
         """
         return 1
 
+    def weight_batch(self, actors: list) -> np.ndarray:
+        """Generates the edge weights between all given actors and the location instance at once.
+
+        Vectorized counterpart of `weight()` that is used by `Environment.update_weights()`.
+        By default, it calls `weight()` for each actor. Override it together with `weight()`
+        to compute the weights of all members of a location in one step, e.g. from an array of
+        actor attributes.
+
+        Args:
+            actors: The actors at this location.
+
+        Returns:
+            An array containing the weight of each actor.
+        """
+        return np.array([self.weight(actor) for actor in actors])
+
     def project_weights(self, actor1: _actor.Actor, actor2: _actor.Actor) -> float:
         """Calculates the edge weight between two actors assigned to the same location instance.
 
@@ -143,3 +177,100 @@ class Location:
             Combined edge weight.
         """
         return min([self.get_weight(actor1), self.get_weight(actor2)])
+
+    def project_weights_batch(self, actors: list, weights: np.ndarray) -> np.ndarray:  # noqa: ARG002
+        """Calculates the edge weights between all pairs of actors at this location at once.
+
+        Vectorized counterpart of `project_weights()` that is used by
+        `Environment.export_actor_network()`. Override it together with `project_weights()` if
+        you change how weights are combined and want the projection of large networks to stay
+        fast. The returned matrix must contain the same values `project_weights()` would return
+        for each pair; only the entries above the diagonal are used.
+
+        Args:
+            actors: The actors at this location.
+            weights: An array of the edge weights between these actors and this location.
+
+        Returns:
+            A square matrix whose entry [i, j] is the combined weight of actors[i] and actors[j].
+        """
+        return np.minimum.outer(weights, weights)
+
+
+class _Label:
+    """The `label` of a `Location` that keeps the label index of its environment up to date.
+
+    Instances store their label in their instance dict. Labels that subclasses define as class
+    attributes are moved to `_default_label`, so that reading `label` from a class still returns
+    the label of the class.
+    """
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return objtype._default_label
+        return _instance_dict(obj).get("label", obj._default_label)
+
+    def __set__(self, obj, value) -> None:
+        attributes = _instance_dict(obj)
+        old_label = attributes.get("label", obj._default_label)
+        attributes["label"] = value
+        env = attributes.get("env")
+        if env is not None:
+            env._relabel_location(obj, old_label)
+
+
+class Location(LocationBase):
+    """Base class for location objects."""
+
+    _default_label: str | None = None
+    label = _Label()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Move a label that is defined as a class attribute to `_default_label`."""
+        super().__init_subclass__(**kwargs)
+        if "label" in cls.__dict__ and not isinstance(cls.__dict__["label"], _Label):
+            cls._default_label = cls.__dict__["label"]
+            cls.label = Location.__dict__["label"]
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Location constructor."""
+        self.label = self.__class__.__name__ if self.label is None else self.label
+        self.env = None
+        self.id_p2n = None
+        self.model = None
+        self.type = type(self).__name__
+        super().__init__(*args, **kwargs)
+
+
+# the descriptor is looked up directly, because classes created by the Creator shadow `__dict__`
+_instance_dict = Location.__dict__["__dict__"].__get__
+
+
+class CompactLocation(LocationBase):
+    """A memory-efficient base class for locations in simulations without a framework.
+
+    The core fields are stored in `__slots__` instead of an instance dict. `type` and `label` are
+    class attributes, so all instances of a class share the same label. `label` defaults to the
+    name of the class. Subclasses must declare `__slots__` for their own attributes to keep
+    instances free of an instance dict. CompactLocations cannot be used together with agentpy or
+    mesa.
+    """
+
+    __slots__ = ("env", "id_p2n", "model")
+
+    type = "CompactLocation"
+    label = "CompactLocation"
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Set the `type` and the default `label` of each subclass to its name."""
+        super().__init_subclass__(**kwargs)
+        if "type" not in cls.__dict__:
+            cls.type = cls.__name__
+        if cls.__dict__.get("label") is None:
+            cls.label = cls.__name__
+
+    def __init__(self) -> None:
+        """CompactLocation Constructor."""
+        self.env = None
+        self.id_p2n = None
+        self.model = None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import networkx as nx
+import numpy as np
 
 from pop2net.location import Location
 import pop2net.utils as utils
@@ -49,6 +50,21 @@ class LocationDesigner(Location):
         """
         return True
 
+    def filter_batch(self, actors: list) -> np.ndarray:
+        """Check for all given actors at once whether they are meant to join this type of location.
+
+        Vectorized counterpart of `filter()` that is used by the creator. By default, it calls
+        `filter()` for each actor. Override it together with `filter()` to check all actors in
+        one step, e.g. on the attributes returned by `Environment.actor_column()`.
+
+        Args:
+            actors: The actors that are currently processed by the Creator.
+
+        Returns:
+            An array containing True for each actor that is allowed to join the location.
+        """
+        return np.array([self.filter(actor) for actor in actors], dtype=bool)
+
     def bridge(self, actor: _actor.Actor) -> float | str | list | None:  # noqa: ARG002
         """Create locations with one actor for each unique value returned.
 
@@ -170,6 +186,19 @@ class MeltLocationDesigner(Location):
         """
         return True
 
+    def filter_batch(self, actors: list) -> np.ndarray:
+        """Check for all given actors at once whether they are meant to join this type of location.
+
+        Vectorized counterpart of `filter()`. By default, it calls `filter()` for each actor.
+
+        Args:
+            actors: The actors that are currently processed by the Creator.
+
+        Returns:
+            An array containing True for each actor that is allowed to join the location.
+        """
+        return np.array([self.filter(actor) for actor in actors], dtype=bool)
+
     def stick_together(self, actor: _actor.Actor) -> float | str:
         """Assigns actors with a shared value on an attribute to the same location instance.
 
@@ -0,0 +1,247 @@
+"""Partitioning of an Environment into shards with few cross-shard memberships."""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+
+from . import projection
+from . import snapshot
+
+if typing.TYPE_CHECKING:
+    from .environment import Environment
+
+
+def _components(n_actors: int, n_locations: int, rows: np.ndarray, cols: np.ndarray):
+    """Return the bipartite graph and the connected component of each actor."""
+    n_nodes = n_actors + n_locations
+    graph = sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.int8), (rows, cols + n_actors)), shape=(n_nodes, n_nodes)
+    )
+    _, labels = csgraph.connected_components(graph, directed=False)
+    return graph, labels[:n_actors]
+
+
+def _split(
+    graph: sp.csr_matrix,
+    start: int,
+    actor_units: np.ndarray,
+    unit_sizes: np.ndarray,
+    unit_shards: np.ndarray,
+    loads: np.ndarray,
+    target: float,
+) -> None:
+    """Distribute the units of a component in breadth-first order over the shards.
+
+    Each shard is filled up to the target size before the next least loaded shard is used, so
+    that actors close to each other in the network end up in the same shard.
+    """
+    nodes = csgraph.breadth_first_order(graph, start, directed=False, return_predecessors=False)
+    units = actor_units[nodes[nodes < len(actor_units)]]
+    _, first = np.unique(units, return_index=True)
+    shard = int(np.argmin(loads))
+    for unit in units[np.sort(first)].tolist():
+        size = unit_sizes[unit]
+        if loads[shard] + size > target:
+            shard = int(np.argmin(loads))
+        unit_shards[unit] = shard
+        loads[shard] += size
+
+
+class Partition:
+    """A partition of the actors of an environment into shards.
+
+    The actors are first grouped into units that must not be split: the members of locations
+    with a label in `keep_together`, or single actors. Connected components of the bipartite
+    network are assigned as a whole to the least loaded shard, starting with the largest one.
+    Components that do not fit into any shard are split by filling the shards with their units
+    in breadth-first order.
+
+    Each location is assigned to the shard that holds most of its members (the first shard for
+    locations without members). Memberships of actors in other shards cross the shard boundary.
+
+    Attributes:
+        shards: One environment per shard with copies of its actors, the locations they belong
+            to and their memberships. Locations with members in several shards have one copy in
+            each of these shards. Objects keep their `id_p2n`.
+        actor_ids: The `id_p2n` of all actors in the order of their positions.
+        actor_shards: The shard of each actor.
+        location_ids: The `id_p2n` of all locations in the order of their positions.
+        location_shards: The shard of each location.
+        boundary: A DataFrame with the `actor_id`, `location_id`, `weight`, `actor_shard` and
+            `location_shard` of each membership that crosses the shard boundary.
+        shard_sizes: The number of actors in each shard.
+        edge_cut: The number of memberships that cross the shard boundary.
+        weighted_edge_cut: The sum of the weights of these memberships.
+        balance: The size of the largest shard relative to the mean shard size. 1.0 means that
+            all shards have the same size.
+    """
+
+    def __init__(
+        self,
+        env: Environment,
+        n_shards: int,
+        keep_together: list[str] | None = None,
+        imbalance: float = 0.05,
+    ) -> None:
+        """Partition an environment.
+
+        Args:
+            env: The environment.
+            n_shards: The number of shards.
+            keep_together: A list of location labels. All members of a location with one of
+                these labels are placed in the same shard. Defaults to None.
+            imbalance: How much larger than the mean shard size a shard may become when a
+                whole component is assigned to it. Larger components are split.
+                Defaults to 0.05.
+
+        Raises:
+            ValueError: Raised if n_shards is smaller than 1 or the environment uses a framework.
+        """
+        if n_shards < 1:
+            msg = "n_shards must be at least 1."
+            raise ValueError(msg)
+        if env.framework is not None:
+            msg = "Only environments without a framework can be partitioned."
+            raise ValueError(msg)
+        if env._tombstones:
+            env.compact()
+
+        actor_ids = np.fromiter(env._actors, dtype=np.int64, count=len(env._actors))
+        location_ids = np.fromiter(env._locations, dtype=np.int64, count=len(env._locations))
+        member_actor_ids, member_location_ids, weights = env._backend.memberships(env._actors)
+        edge_weights, edge_attributes = env._backend.edge_data(env._actors)
+        weights = np.asarray(weights, dtype=np.float64)
+        # integer weights are restored in the shards after adding the memberships as floats
+        is_int = (
+            np.zeros(len(weights), dtype=bool)
+            if isinstance(edge_weights, np.ndarray)
+            else np.array([type(weight) in snapshot._INT_TYPES for weight in edge_weights], bool)
+        )
+        rows = projection._positions(actor_ids, member_actor_ids)
+        cols = projection._positions(location_ids, member_location_ids)
+        n_actors, n_locations = len(actor_ids), len(location_ids)
+
+        graph, components = _components(n_actors, n_locations, rows, cols)
+        if keep_together:
+            labels = np.array([location.label for location in env._locations.values()], object)
+            kept = np.isin(labels[cols], list(keep_together))
+            _, actor_units = _components(n_actors, n_locations, rows[kept], cols[kept])
+        else:
+            actor_units = np.arange(n_actors)
+        _, actor_units = np.unique(actor_units, return_inverse=True)
+        unit_sizes = np.bincount(actor_units)
+
+        target = n_actors / n_shards
+        loads = np.zeros(n_shards, dtype=np.int64)
+        unit_shards = np.zeros(len(unit_sizes), dtype=np.int64)
+        _, starts, sizes = np.unique(components, return_index=True, return_counts=True)
+        members = np.split(np.argsort(components, kind="stable"), np.cumsum(sizes)[:-1])
+        for i in np.argsort(-sizes, kind="stable").tolist():
+            shard = int(np.argmin(loads))
+            if loads[shard] + sizes[i] <= target * (1 + imbalance) or n_shards == 1:
+                unit_shards[actor_units[members[i]]] = shard
+                loads[shard] += sizes[i]
+            else:
+                _split(graph, starts[i], actor_units, unit_sizes, unit_shards, loads, target)
+        actor_shards = unit_shards[actor_units]
+
+        # each location belongs to the shard with most of its members
+        member_shards = actor_shards[rows]
+        counts = np.bincount(
+            cols * n_shards + member_shards, minlength=n_locations * n_shards
+        ).reshape(n_locations, n_shards)
+        location_shards = counts.argmax(axis=1)
+        crossing = member_shards != location_shards[cols]
+
+        self.actor_ids = actor_ids
+        self.actor_shards = actor_shards
+        self.location_ids = location_ids
+        self.location_shards = location_shards
+        self.boundary = pd.DataFrame(
+            {
+                "actor_id": member_actor_ids[crossing],
+                "location_id": member_location_ids[crossing],
+                "weight": weights[crossing],
+                "actor_shard": member_shards[crossing],
+                "location_shard": location_shards[cols[crossing]],
+            }
+        )
+        self._shard_of_actor = dict(zip(actor_ids.tolist(), actor_shards.tolist()))
+        self.shard_sizes = np.bincount(actor_shards, minlength=n_shards)
+        self.edge_cut = int(crossing.sum())
+        self.weighted_edge_cut = float(weights[crossing].sum())
+        self.balance = float(self.shard_sizes.max() / target) if n_actors else 1.0
+        self.shards = [
+            self._shard(
+                env, shard, member_shards, rows, cols, counts, weights, is_int, edge_attributes
+            )
+            for shard in range(n_shards)
+        ]
+
+    def _shard(
+        self,
+        env: Environment,
+        shard: int,
+        member_shards: np.ndarray,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        counts: np.ndarray,
+        weights: np.ndarray,
+        is_int: np.ndarray,
+        edge_attributes: list[dict] | None,
+    ) -> Environment:
+        """Create the environment of a shard with the weights and attributes of its memberships."""
+        selected = member_shards == shard
+        actor_ids = self.actor_ids[self.actor_shards == shard].tolist()
+        has_members = counts[:, shard] > 0
+        if shard == 0:
+            has_members |= counts.sum(axis=1) == 0
+        location_ids = self.location_ids[has_members].tolist()
+
+        child = env._empty_like()
+        actors = env._fork_objects({i: env._actors[i] for i in actor_ids}, child)
+        locations = env._fork_objects({i: env._locations[i] for i in location_ids}, child)
+        child.add_actors(actors.values())
+        child.add_locations(locations.values())
+        child._columns = env._columns.select(actor_ids)
+        member_actor_ids = self.actor_ids[rows[selected]]
+        member_location_ids = self.location_ids[cols[selected]]
+        child.add_memberships(member_actor_ids, member_location_ids, weights[selected])
+        selected_int = is_int[selected]
+        if selected_int.any():
+            child._backend.set_weights(
+                member_actor_ids[selected_int],
+                member_location_ids[selected_int],
+                weights[selected][selected_int].astype(np.int64),
+            )
+        if edge_attributes is not None:
+            for i in np.flatnonzero(selected).tolist():
+                if edge_attributes[i]:
+                    child._backend.add_edge(
+                        int(self.actor_ids[rows[i]]),
+                        int(self.location_ids[cols[i]]),
+                        **edge_attributes[i],
+                    )
+        child._fresh_id = env._fresh_id
+        return child
+
+    @property
+    def n_shards(self) -> int:
+        """The number of shards."""
+        return len(self.shards)
+
+    def shard_of_actor(self, actor) -> int:
+        """Return the shard of an actor.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+
+        Raises:
+            KeyError: Raised if the actor was not in the environment when it was partitioned.
+        """
+        return self._shard_of_actor[getattr(actor, "id_p2n", actor)]
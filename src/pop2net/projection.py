@@ -0,0 +1,331 @@
+"""Projection of the bipartite actor-location network onto the actors."""
+
+from __future__ import annotations
+
+import typing
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+from .location import Location
+
+if typing.TYPE_CHECKING:
+    from .environment import Environment
+
+# how the weights of a location class are projected
+_DEFAULT = 0
+_BATCH = 1
+_PAIRWISE = 2
+
+
+def _projection_rule(location_cls: type) -> int:
+    if location_cls.project_weights_batch is not Location.project_weights_batch:
+        return _BATCH
+    if location_cls.project_weights is Location.project_weights:
+        return _DEFAULT
+    return _PAIRWISE
+
+
+def _positions(ids: np.ndarray, selected: np.ndarray) -> np.ndarray:
+    """Return the positions of the selected ids in the array ids."""
+    sorter = np.argsort(ids, kind="stable")
+    return sorter[np.searchsorted(ids, selected, sorter=sorter)]
+
+
+def _location_pairs(
+    location: Location,
+    rule: int,
+    actors: list,
+    weights: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Project the weights of all pairs of actors at one location.
+
+    Returns:
+        The positions of the first and the second actor of each pair in `actors` and the weight
+        of each pair.
+    """
+    first, second = np.triu_indices(len(actors), k=1)
+    if rule == _DEFAULT:
+        values = np.minimum.outer(weights, weights)[first, second]
+    elif rule == _BATCH:
+        matrix = location.project_weights_batch(actors, weights)
+        values = np.asarray(matrix, dtype=np.float64)[first, second]
+    else:
+        values = np.array(
+            [
+                location.project_weights(actor1=actors[i], actor2=actors[j])
+                for i, j in zip(first.tolist(), second.tolist())
+            ],
+            dtype=np.float64,
+        )
+    return first, second, values
+
+
+def project_actor_network(
+    env: Environment,
+    location_ids: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the weighted one-mode projection of an environment's bipartite network.
+
+    Two actors are connected if they share at least one location. The weight of their
+    connection is the sum of `Location.project_weights()` over all shared locations. The
+    locations are projected in three groups:
+
+    - Locations using the default `project_weights()` (the minimum of both weights) at which
+      all actors have the same weight contribute this weight to every pair. They are projected
+      all at once as the sparse matrix product of the weighted and the binary incidence matrix.
+    - The remaining locations using the default `project_weights()` and all locations
+      overriding `Location.project_weights_batch()` get their pairwise weights as one matrix
+      per location.
+    - Locations that only override `Location.project_weights()` fall back to calling it for each
+      pair of their actors.
+
+    Args:
+        env: The environment.
+        location_ids: The ids of the locations to project. Defaults to None, which projects all
+            locations.
+
+    Returns:
+        The actor ids in the order of `env.actors` and three arrays containing the positions of
+        the first and the second actor and the weight of each connection. Each pair of actors is
+        contained once and the position of the first actor is smaller than the second.
+    """
+    member_actor_ids, member_location_ids, weights = env._backend.memberships(env._actors)
+    if location_ids is not None:
+        selected = np.isin(member_location_ids, location_ids)
+        member_actor_ids = member_actor_ids[selected]
+        member_location_ids = member_location_ids[selected]
+        weights = weights[selected]
+
+    actor_ids = np.fromiter(env._actors, dtype=np.int64, count=len(env._actors))
+    location_ids = np.fromiter(env._locations, dtype=np.int64, count=len(env._locations))
+    actors = list(env._actors.values())
+    locations = list(env._locations.values())
+    shape = (len(actor_ids), len(location_ids))
+
+    rows = _positions(actor_ids, member_actor_ids)
+    cols = _positions(location_ids, member_location_ids)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    # group the memberships by location
+    order = np.lexsort((rows, cols))
+    rows, cols, weights = rows[order], cols[order], weights[order]
+    starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]]) if len(cols) else np.empty(0, int)
+    sizes = np.diff(np.r_[starts, len(cols)])
+
+    # the number of shared locations of each pair of actors defines the connections
+    ones = np.ones(len(rows))
+    incidence = sp.csr_matrix((ones, (rows, cols)), shape=shape)
+    connections = sp.triu(incidence @ incidence.T, k=1).tocsr()
+
+    # decide per location how its weights are projected
+    rules = {}
+    group_rules = np.array(
+        [
+            rules.setdefault(type(loc), _projection_rule(type(loc)))
+            for loc in (locations[col] for col in cols[starts])
+        ],
+        dtype=np.int64,
+    )
+    if len(starts):
+        uniform = (group_rules == _DEFAULT) & (
+            np.minimum.reduceat(weights, starts) == np.maximum.reduceat(weights, starts)
+        )
+    else:
+        uniform = np.empty(0, dtype=bool)
+
+    # fast path for uniform locations: sum_l w_l * B_il * B_jl
+    member_uniform = np.repeat(uniform, sizes)
+    uniform_rows, uniform_cols = rows[member_uniform], cols[member_uniform]
+    weighted_incidence = sp.csr_matrix(
+        (weights[member_uniform], (uniform_rows, uniform_cols)),
+        shape=shape,
+    )
+    binary_incidence = sp.csr_matrix(
+        (ones[member_uniform], (uniform_rows, uniform_cols)),
+        shape=shape,
+    )
+    projected = sp.triu(weighted_incidence @ binary_incidence.T, k=1).tocoo()
+
+    # all other locations, one pairwise weight matrix per location
+    pair_rows = [projected.row]
+    pair_cols = [projected.col]
+    pair_weights = [projected.data]
+    for group in np.flatnonzero(~uniform):
+        start = starts[group]
+        stop = start + sizes[group]
+        members = rows[start:stop]
+        if len(members) < 2:
+            continue
+        first, second, values = _location_pairs(
+            locations[cols[start]],
+            group_rules[group],
+            [actors[i] for i in members],
+            weights[start:stop],
+        )
+
+        pair_rows.append(members[first])
+        pair_cols.append(members[second])
+        pair_weights.append(values)
+
+    summed = sp.csr_matrix(
+        (np.concatenate(pair_weights), (np.concatenate(pair_rows), np.concatenate(pair_cols))),
+        shape=(len(actor_ids), len(actor_ids)),
+    )
+    summed.sum_duplicates()
+
+    # look up the summed weight of each connection (sums of 0 might not be stored)
+    n = len(actor_ids)
+    connections = connections.tocoo()
+    keys = connections.row.astype(np.int64) * n + connections.col
+    summed = summed.tocoo()
+    summed_keys = summed.row.astype(np.int64) * n + summed.col
+    key_order = np.argsort(summed_keys)
+    summed_keys = summed_keys[key_order]
+    summed_weights = summed.data[key_order]
+
+    connection_weights = np.zeros(len(keys), dtype=np.float64)
+    if len(summed_keys):
+        idx = np.minimum(np.searchsorted(summed_keys, keys), len(summed_keys) - 1)
+        found = summed_keys[idx] == keys
+        connection_weights[found] = summed_weights[idx[found]]
+
+    return actor_ids, connections.row, connections.col, connection_weights
+
+
+class LiveProjection:
+    """Keeps the one-mode projection of an environment's bipartite network up to date.
+
+    The environment marks every location whose memberships or weights change and every actor
+    that is added or removed. `update()` then only reprojects the marked locations: the
+    contribution each location made to the projection is stored, removed and replaced by its
+    new contribution. The weight of a pair that still shares other locations is summed again from
+    their contributions, so that removing contributions leaves no rounding residue. The weights
+    follow the same rules as `project_actor_network()`.
+    """
+
+    def __init__(self, env: Environment) -> None:
+        """Create the projection of an environment.
+
+        Args:
+            env: The environment.
+        """
+        self._env = env
+        self.graph = nx.Graph()
+
+        # location id -> ids of the first and the second actor and weight of each pair
+        self._contributions: dict[int, tuple[list, list, list]] = {}
+
+        # pair of actor ids -> location id -> weight the location contributes to the pair
+        self._shared: dict[tuple[int, int], dict[int, float]] = {}
+
+        self._rules: dict[type, int] = {}
+        self._dirty_locations: set[int] = set(env._locations)
+        self._dirty_actors: set[int] = set(env._actors)
+
+    def mark(self, location_ids=(), actor_ids=()) -> None:
+        """Mark locations whose memberships or weights changed and actors that were added."""
+        self._dirty_locations.update(location_ids)
+        self._dirty_actors.update(actor_ids)
+
+    def mark_removed(self, node_ids) -> None:
+        """Mark actors and locations that are about to be removed from the environment."""
+        env = self._env
+        for node_id in node_ids:
+            if node_id in env._actors:
+                self._dirty_actors.add(node_id)
+                self._dirty_locations.update(env._backend.neighbors(node_id))
+            else:
+                self._dirty_locations.add(node_id)
+
+    def mark_all(self) -> None:
+        """Mark all locations, e.g. because the attributes used to project the weights changed."""
+        self._dirty_locations.update(self._contributions)
+        self._dirty_locations.update(self._env._locations)
+
+    def update(self) -> nx.Graph:
+        """Apply the changes since the last update.
+
+        Returns:
+            The projection as a graph whose nodes are the `id_p2n` of the actors and whose edges
+            have the projected `weight` as attribute.
+        """
+        env = self._env
+        graph = self.graph
+
+        for location_id in self._dirty_locations:
+            old = self._contributions.pop(location_id, None)
+            if old is not None:
+                self._subtract(location_id, *old[:2])
+            location = env._locations.get(location_id)
+            if location is not None:
+                new = self._project(location)
+                if new[0]:
+                    self._contributions[location_id] = new
+                    self._add(location_id, *new)
+        self._dirty_locations.clear()
+
+        for actor_id in self._dirty_actors:
+            if actor_id in env._actors:
+                graph.add_node(actor_id)
+            elif actor_id in graph:
+                graph.remove_node(actor_id)
+        self._dirty_actors.clear()
+
+        return graph
+
+    def _project(self, location: Location) -> tuple[list, list, list]:
+        env = self._env
+        actor_ids, _, weights = env._backend.memberships_of([location.id_p2n])
+        known = np.fromiter(
+            (actor_id in env._actors for actor_id in actor_ids.tolist()),
+            dtype=bool,
+            count=len(actor_ids),
+        )
+        actor_ids = actor_ids[known]
+        if len(actor_ids) < 2:
+            return [], [], []
+
+        # members in the order of env.actors, like in project_actor_network()
+        order = np.argsort(env._actor_positions.positions(actor_ids.tolist()))
+        actor_ids = actor_ids[order]
+        weights = np.asarray(weights, dtype=np.float64)[known][order]
+
+        location_cls = type(location)
+        if location_cls not in self._rules:
+            self._rules[location_cls] = _projection_rule(location_cls)
+        first, second, values = _location_pairs(
+            location,
+            self._rules[location_cls],
+            [env._actors[actor_id] for actor_id in actor_ids.tolist()],
+            weights,
+        )
+        return actor_ids[first].tolist(), actor_ids[second].tolist(), values.tolist()
+
+    def _add(self, location_id: int, first: list, second: list, values: list) -> None:
+        graph = self.graph
+        shared = self._shared
+        for actor1, actor2, value in zip(first, second, values):
+            key = (actor1, actor2) if actor1 < actor2 else (actor2, actor1)
+            locations = shared.get(key)
+            if locations:
+                graph[actor1][actor2]["weight"] += value
+                locations[location_id] = value
+            else:
+                graph.add_edge(actor1, actor2, weight=value)
+                shared[key] = {location_id: value}
+
+    def _subtract(self, location_id: int, first: list, second: list) -> None:
+        graph = self.graph
+        shared = self._shared
+        for actor1, actor2 in zip(first, second):
+            key = (actor1, actor2) if actor1 < actor2 else (actor2, actor1)
+            locations = shared[key]
+            del locations[location_id]
+            if locations:
+                # summing the remaining contributions again avoids residues of subtraction
+                graph[actor1][actor2]["weight"] = sum(locations.values())
+            else:
+                del shared[key]
+                graph.remove_edge(actor1, actor2)
@@ -0,0 +1,297 @@
+"""Random sampling of the neighbors of actors, weighted by their contact weights."""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+import scipy.sparse as sp
+
+from . import projection
+
+if typing.TYPE_CHECKING:
+    from .environment import Environment
+
+# the tables of all actors are built at once if at least this fraction of the actors draws
+_FULL_FRACTION = 0.25
+
+
+def _draw(
+    starts: np.ndarray,
+    stops: np.ndarray,
+    positions: np.ndarray,
+    cumulative: np.ndarray,
+    k: int,
+    weighted: bool,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Draw k entries with replacement from each of the ranges starts[i]..stops[i]-1.
+
+    Args:
+        starts: The first entry of each range.
+        stops: The end of each range.
+        positions: The value of each entry.
+        cumulative: The cumulative weights of the entries with a leading 0, so that the entry j
+            covers the interval cumulative[j]..cumulative[j+1].
+        k: The number of draws per range.
+        weighted: Should the entries be drawn proportional to their weights?
+        rng: The random number generator.
+
+    Returns:
+        An array of shape (len(starts), k) with the drawn values, or -1 for ranges without any
+        entry (of positive weight).
+    """
+    drawn = np.full((len(starts), k), -1, dtype=np.int64)
+    if weighted:
+        low = cumulative[starts]
+        high = cumulative[stops]
+        valid = high > low
+        low, high = low[valid, None], high[valid, None]
+        values = low + rng.random((len(low), k)) * (high - low)
+        # rounding must not push a value into the next range
+        values = np.minimum(values, np.nextafter(high, -np.inf))
+        entries = np.searchsorted(cumulative, values, side="right") - 1
+    else:
+        valid = stops > starts
+        entries = rng.integers(starts[valid, None], stops[valid, None], size=(valid.sum(), k))
+    drawn[valid] = positions[entries]
+    return drawn
+
+
+class NeighborSampler:
+    """Tables of the cumulative contact weights of the neighbors of actors.
+
+    The table of an actor holds the dense positions of its neighbors (see
+    `Environment.actor_index()`) and the cumulative sums of their contact weights, which are the
+    weights returned by `Actor.get_actor_weight()`. Drawing a neighbor proportional to its
+    contact weight is then a binary search of a uniform random number in the cumulative sums.
+
+    The tables are built lazily, either for single actors or for all actors at once with
+    `projection.project_actor_network()`. They stay valid until the memberships or weights change,
+    which makes the environment call `clear()`.
+    """
+
+    def __init__(self, env: Environment) -> None:
+        """Create an empty sampler.
+
+        Args:
+            env: The environment.
+        """
+        self._env = env
+        # location labels -> actor id -> positions and cumulative weights of the neighbors
+        self._rows: dict[tuple | None, dict[int, tuple[np.ndarray, np.ndarray]]] = {}
+        # location labels -> indptr, positions and cumulative weights of the neighbors of all
+        # actors in the order of env.actors
+        self._tables: dict[tuple | None, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._rules: dict[type, int] = {}
+
+    def clear(self) -> None:
+        """Remove all tables."""
+        if self._rows or self._tables:
+            self._rows.clear()
+            self._tables.clear()
+
+    def sample(
+        self,
+        actor_id: int,
+        k: int,
+        location_labels: list | None,
+        weighted: bool,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """Draw k neighbors of one actor.
+
+        Returns:
+            The positions of the drawn neighbors. The array is empty if the actor has no
+            neighbors (with a positive contact weight).
+        """
+        positions, cumulative = self._row(actor_id, location_labels)
+        drawn = _draw(
+            np.zeros(1, dtype=np.int64),
+            np.full(1, len(positions)),
+            positions,
+            cumulative,
+            k,
+            weighted,
+            rng,
+        )[0]
+        return drawn[drawn >= 0]
+
+    def sample_bulk(
+        self,
+        actor_ids: list[int],
+        k: int,
+        location_labels: list | None,
+        weighted: bool,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """Draw k neighbors of each of many actors.
+
+        Returns:
+            An array of shape (len(actor_ids), k) with the positions of the drawn neighbors, or
+            -1 for actors without neighbors (with a positive contact weight).
+        """
+        key = tuple(location_labels) if location_labels else None
+        env = self._env
+        if key not in self._tables:
+            rows = self._rows.get(key, {})
+            missing = sum(actor_id not in rows for actor_id in actor_ids)
+            if missing >= _FULL_FRACTION * len(env._actors):
+                self._build_table(key)
+
+        table = self._tables.get(key)
+        if table is not None:
+            indptr, positions, cumulative = table
+            actor_positions = env._actor_positions.positions(actor_ids)
+            return _draw(
+                indptr[actor_positions],
+                indptr[actor_positions + 1],
+                positions,
+                cumulative,
+                k,
+                weighted,
+                rng,
+            )
+
+        # concatenate the tables of the single actors
+        rows = [self._row(actor_id, location_labels) for actor_id in actor_ids]
+        sizes = np.fromiter((len(row[0]) for row in rows), dtype=np.int64, count=len(rows))
+        stops = np.cumsum(sizes)
+        totals = np.fromiter((row[1][-1] for row in rows), dtype=np.float64, count=len(rows))
+        offsets = np.cumsum(totals) - totals
+        cumulative = (
+            np.concatenate([np.zeros(1), *(row[1][1:] for row in rows)])
+            + np.r_[0.0, np.repeat(offsets, sizes)]
+        )
+        positions = np.concatenate([np.empty(0, dtype=np.int64), *(row[0] for row in rows)])
+        return _draw(stops - sizes, stops, positions, cumulative, k, weighted, rng)
+
+    def _row(self, actor_id: int, location_labels: list | None) -> tuple[np.ndarray, np.ndarray]:
+        """Return the positions and the cumulative weights (with a leading 0) of the neighbors."""
+        key = tuple(location_labels) if location_labels else None
+        rows = self._rows.setdefault(key, {})
+        row = rows.get(actor_id)
+        if row is not None:
+            return row
+
+        table = self._tables.get(key)
+        if table is None and len(rows) >= _FULL_FRACTION * len(self._env._actors):
+            # most actors draw, so it is cheaper to build the tables of all actors
+            self._build_table(key)
+            table = self._tables[key]
+        if table is None:
+            row = rows[actor_id] = self._build_row(actor_id, location_labels)
+            return row
+
+        indptr, positions, cumulative = table
+        position = self._env._actor_positions.position(actor_id)
+        start, stop = indptr[position], indptr[position + 1]
+        return positions[start:stop], cumulative[start : stop + 1] - cumulative[start]
+
+    def _labeled_locations(self, location_labels: list | None) -> dict:
+        env = self._env
+        if not location_labels:
+            return env._locations
+        return {
+            location_id: location
+            for label in location_labels
+            for location_id, location in env._locations_by_label.get(label, {}).items()
+        }
+
+    def _build_row(
+        self, actor_id: int, location_labels: list | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Project the contact weights between one actor and its neighbors."""
+        env = self._env
+        actors = env._actors
+        locations = self._labeled_locations(location_labels)
+
+        neighbor_ids = [np.empty(0, dtype=np.int64)]
+        neighbor_weights = [np.empty(0)]
+        for location_id in env._backend.neighbors(actor_id):
+            location = locations.get(location_id)
+            if location is None:
+                continue
+            member_ids, _, weights = env._backend.memberships_of([location_id])
+            known = np.fromiter(
+                (member_id in actors for member_id in member_ids.tolist()),
+                dtype=bool,
+                count=len(member_ids),
+            )
+            if known.sum() < 2:
+                continue
+
+            # members in the order of env.actors, like in project_actor_network()
+            member_ids = member_ids[known]
+            order = np.argsort(env._actor_positions.positions(member_ids.tolist()))
+            member_ids = member_ids[order]
+            weights = np.asarray(weights, dtype=np.float64)[known][order]
+            i = int(np.flatnonzero(member_ids == actor_id)[0])
+            others = np.arange(len(member_ids)) != i
+
+            location_cls = type(location)
+            if location_cls not in self._rules:
+                self._rules[location_cls] = projection._projection_rule(location_cls)
+            rule = self._rules[location_cls]
+            if rule == projection._DEFAULT:
+                values = np.minimum(weights[i], weights)
+            elif rule == projection._BATCH:
+                # only the entries above the diagonal of the matrix are used
+                matrix = np.asarray(
+                    location.project_weights_batch(
+                        [actors[member_id] for member_id in member_ids.tolist()], weights
+                    ),
+                    dtype=np.float64,
+                )
+                values = np.where(np.arange(len(member_ids)) > i, matrix[i], matrix[:, i])
+            else:
+                members = [actors[member_id] for member_id in member_ids.tolist()]
+                values = np.array(
+                    [
+                        location.project_weights(
+                            actor1=members[min(i, j)], actor2=members[max(i, j)]
+                        )
+                        if j != i
+                        else 0.0
+                        for j in range(len(members))
+                    ],
+                    dtype=np.float64,
+                )
+
+            neighbor_ids.append(member_ids[others])
+            neighbor_weights.append(values[others])
+
+        # sum the weights over all shared locations
+        unique_ids, inverse = np.unique(np.concatenate(neighbor_ids), return_inverse=True)
+        summed = np.bincount(inverse, weights=np.concatenate(neighbor_weights))
+        positions = env._actor_positions.positions(unique_ids.tolist())
+        order = np.argsort(positions)
+        cumulative = np.r_[0.0, np.cumsum(np.maximum(summed[order], 0))]
+        return positions[order], cumulative
+
+    def _build_table(self, key: tuple | None) -> None:
+        """Project the contact weights between all actors and their neighbors at once."""
+        env = self._env
+        if env._tombstones:
+            env.compact()
+        location_ids = None
+        if key is not None:
+            location_ids = np.fromiter(self._labeled_locations(list(key)), dtype=np.int64)
+        actor_ids, first, second, weights = projection.project_actor_network(
+            env, location_ids=location_ids
+        )
+
+        # contacts with a weight of 0 are stored as explicit zeros
+        n = len(actor_ids)
+        matrix = sp.csr_matrix(
+            (np.r_[weights, weights], (np.r_[first, second], np.r_[second, first])),
+            shape=(n, n),
+        )
+        matrix.sort_indices()
+        cumulative = np.r_[0.0, np.cumsum(np.maximum(matrix.data, 0))]
+        self._tables[key] = (
+            matrix.indptr.astype(np.int64),
+            matrix.indices.astype(np.int64),
+            cumulative,
+        )
+        self._rows.pop(key, None)
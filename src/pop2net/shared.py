@@ -0,0 +1,242 @@
+"""Frozen environments in shared memory for worker processes."""
+
+from __future__ import annotations
+
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+import pickle
+import sys
+import typing
+
+import numpy as np
+
+from . import frozen
+
+if typing.TYPE_CHECKING:
+    from .environment import Environment
+
+# the length of the pickled layout at the start of a block
+_HEADER = 8
+_ALIGNMENT = 64
+_ARRAYS = [
+    "actor_indptr",
+    "actor_locations",
+    "actor_weights",
+    "location_indptr",
+    "location_actors",
+    "location_weights",
+    "actor_ids",
+    "location_ids",
+    "location_label_codes",
+]
+# attached blocks are removed by their creator, not by the resource tracker of a worker
+_ATTACH_OPTIONS = {"track": False} if sys.version_info >= (3, 13) else {}
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    block = shared_memory.SharedMemory(name=name, **_ATTACH_OPTIONS)
+    if not _ATTACH_OPTIONS:
+        # before Python 3.13, attaching registers the block with the resource tracker, which
+        # would remove it or warn about a leak when the attaching process exits
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _lookup(ids: np.ndarray, order: np.ndarray, node_id: int) -> int:
+    found = np.searchsorted(ids, node_id, sorter=order)
+    if found == len(ids) or ids[order[found]] != node_id:
+        raise KeyError(node_id)
+    return int(order[found])
+
+
+class SharedEnvironment(frozen.FrozenEnvironment):
+    """A frozen environment whose arrays are stored in one shared memory block.
+
+    The memberships, weights and selected numeric actor attributes are written to a block of
+    `multiprocessing.shared_memory` together with a small header describing its layout. Other
+    processes attach to the block by its `name` and read the arrays without copying them.
+    Pickling a shared environment only transfers the name, so passing it to the initializer of
+    a process pool costs the same for every population size.
+
+    Like a `FrozenEnvironment`, the actor and location objects are only available in the
+    process that created the block. Workers use the array-based methods and
+    `actor_attribute()`.
+
+    The block exists until the creating process calls `unlink()`. Every process should call
+    `close()` when it is done. Using the creating instance as a context manager does both.
+    """
+
+    def __init__(self, env: Environment, attributes: list[str] | None = None) -> None:
+        """Freeze an environment and copy its arrays to a new shared memory block.
+
+        Args:
+            env: The environment.
+            attributes: A list of names of numeric actor attributes to share. Defaults to None.
+
+        Raises:
+            ValueError: Raised if an attribute is not numeric or boolean.
+        """
+        super().__init__(env)
+        arrays = {name: self.__dict__[name] for name in _ARRAYS}
+        arrays["actor_order"] = np.argsort(self.actor_ids, kind="stable")
+        arrays["location_order"] = np.argsort(self.location_ids, kind="stable")
+        for name in attributes or []:
+            values = np.array([getattr(actor, name) for actor in self._actors])
+            if values.dtype.kind not in "biuf":
+                msg = f"The actor attribute {name} is not numeric."
+                raise ValueError(msg)
+            arrays[f"attribute:{name}"] = values
+
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            offset = _aligned(size)
+            layout[name] = (offset, array.dtype.str, array.shape)
+            size = offset + array.nbytes
+        header = pickle.dumps(
+            {
+                "layout": layout,
+                "label_names": self.label_names,
+                "mutation_count": self.mutation_count,
+            }
+        )
+        start = _aligned(_HEADER + len(header))
+
+        block = shared_memory.SharedMemory(create=True, size=start + size)
+        block.buf[:_HEADER] = len(header).to_bytes(_HEADER, "little")
+        block.buf[_HEADER : _HEADER + len(header)] = header
+        for name, array in arrays.items():
+            offset, dtype, shape = layout[name]
+            np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start + offset)[...] = array
+        self._open(block, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedEnvironment:
+        """Attach to a shared environment created by another process.
+
+        Args:
+            name: The `name` of the shared environment.
+
+        Returns:
+            The shared environment.
+        """
+        shared = cls.__new__(cls)
+        shared.__dict__.update(_actors=None, _locations=None)
+        shared._open(_attach_block(name), owner=False)
+        return shared
+
+    def _open(self, block: shared_memory.SharedMemory, owner: bool) -> None:
+        length = int.from_bytes(block.buf[:_HEADER], "little")
+        header = pickle.loads(block.buf[_HEADER : _HEADER + length])
+        start = _aligned(_HEADER + length)
+        arrays = {
+            name: frozen._read_only(
+                np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start + offset)
+            )
+            for name, (offset, dtype, shape) in header["layout"].items()
+        }
+        attributes = {
+            name.partition(":")[2]: arrays.pop(name)
+            for name in list(arrays)
+            if name.startswith("attribute:")
+        }
+        self.__dict__.update(
+            arrays,
+            label_names=header["label_names"],
+            mutation_count=header["mutation_count"],
+            _actor_positions=None,
+            _location_positions=None,
+            _attributes=attributes,
+            _block=block,
+            _owner=owner,
+        )
+
+    def __getstate__(self) -> dict:
+        """Return the name of the block for pickling."""
+        return {"name": self.name}
+
+    def __setstate__(self, state: dict) -> None:
+        """Attach to the block of a pickled shared environment."""
+        self.__dict__.update(_actors=None, _locations=None)
+        self._open(_attach_block(state["name"]), owner=False)
+
+    def __enter__(self) -> SharedEnvironment:
+        """Return the shared environment."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the block and remove it if this process created it."""
+        if self._owner:
+            self.unlink()
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block."""
+        return self._block.name
+
+    @property
+    def attribute_names(self) -> list[str]:
+        """The names of the shared actor attributes."""
+        return list(self._attributes)
+
+    def actor_attribute(self, name: str) -> np.ndarray:
+        """Return the values of a shared actor attribute in the order of the actor positions.
+
+        Args:
+            name: The name of the attribute.
+
+        Raises:
+            KeyError: Raised if the attribute was not shared.
+        """
+        if name not in self._attributes:
+            msg = f"The actor attribute {name} is not shared."
+            raise KeyError(msg)
+        return self._attributes[name]
+
+    def actor_index(self, actor) -> int:
+        """Return the position of an actor.
+
+        Args:
+            actor: The actor or its `id_p2n`.
+
+        Raises:
+            KeyError: Raised if the actor was not in the environment when it was shared.
+        """
+        return _lookup(self.actor_ids, self.actor_order, getattr(actor, "id_p2n", actor))
+
+    def location_index(self, location) -> int:
+        """Return the position of a location.
+
+        Args:
+            location: The location or its `id_p2n`.
+
+        Raises:
+            KeyError: Raised if the location was not in the environment when it was shared.
+        """
+        return _lookup(
+            self.location_ids, self.location_order, getattr(location, "id_p2n", location)
+        )
+
+    def close(self) -> None:
+        """Release the arrays and close the block in this process.
+
+        Arrays returned by the array-based methods may be views into the block and have to be
+        deleted before.
+        """
+        for name, value in list(self.__dict__.items()):
+            if isinstance(value, np.ndarray):
+                self.__dict__[name] = None
+        self.__dict__["_attributes"] = {}
+        self._block.close()
+
+    def unlink(self) -> None:
+        """Remove the block once all processes have closed it.
+
+        Only the process that created the shared environment should call this.
+        """
+        self._block.unlink()
@@ -0,0 +1,334 @@
+"""Binary snapshots of an Environment."""
+
+from __future__ import annotations
+
+import gc
+import importlib
+import itertools
+import json
+import typing
+import warnings
+
+import numpy as np
+
+from . import utils
+
+if typing.TYPE_CHECKING:
+    from .environment import Environment
+
+FORMAT_VERSION = 2
+
+# attributes that are restored by the environment instead of being saved
+_RESTORED_ATTRIBUTES = ("env", "id_p2n", "model")
+
+# marks a value that an object does not have
+_MISSING = object()
+
+_INT_TYPES = {int, np.int8, np.int16, np.int32, np.int64}
+
+
+def _attributes(obj, layout: tuple) -> dict:
+    slots, descriptor, columns = layout
+    if not slots and not columns:
+        return descriptor.__get__(obj)
+    attributes = {name: getattr(obj, name) for name in slots if hasattr(obj, name)}
+    if descriptor is not None:
+        attributes.update(descriptor.__get__(obj))
+    for name in columns:
+        if name not in attributes and hasattr(obj, name):
+            attributes[name] = getattr(obj, name)
+    return attributes
+
+
+def _column(values: list) -> np.ndarray:
+    """Convert the values of one attribute to the most specific array type."""
+    kinds = {type(value) for value in values}
+    if kinds <= {bool, np.bool_}:
+        return np.array(values, dtype=bool)
+    if kinds <= _INT_TYPES:
+        return np.array(values, dtype=np.int64)
+    if kinds <= {int, float, np.int8, np.int16, np.int32, np.int64, np.float32, np.float64}:
+        return np.array(values, dtype=np.float64)
+    if kinds <= {str, np.str_}:
+        return np.array(values, dtype=str)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _import_class(path: str) -> type | None:
+    module_name, _, qualname = path.partition(":")
+    if "<locals>" in qualname:
+        return None
+    try:
+        obj = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError):
+        return None
+    return obj if isinstance(obj, type) else None
+
+
+def _save_objects(arrays: dict, prefix: str, objects: list) -> dict:
+    # classes created on the fly, e.g. by the Creator, share an entry if their paths are equal
+    class_keys: dict[type, tuple] = {}
+    class_codes: dict[tuple, int] = {}
+    codes = np.empty(len(objects), dtype=np.int64)
+    for i, obj in enumerate(objects):
+        cls = type(obj)
+        key = class_keys.get(cls)
+        if key is None:
+            key = class_keys[cls] = (
+                _class_path(cls),
+                tuple(_class_path(base) for base in cls.__mro__[1:]),
+            )
+        codes[i] = class_codes.setdefault(key, len(class_codes))
+    arrays[f"{prefix}_ids"] = np.fromiter(
+        (obj.id_p2n for obj in objects), dtype=np.int64, count=len(objects)
+    )
+    arrays[f"{prefix}_classes"] = codes
+
+    layouts = {cls: utils._instance_layout(cls) for cls in class_keys}
+    attributes = [_attributes(obj, layouts[type(obj)]) for obj in objects]
+    return {
+        "classes": [[path, list(base_paths)] for path, base_paths in class_codes],
+        "attributes": _save_attributes(arrays, prefix, attributes, skip=_RESTORED_ATTRIBUTES),
+    }
+
+
+def _save_attributes(arrays: dict, prefix: str, attributes: list[dict], skip=()) -> list[str]:
+    """Store one array per attribute name and return the names in their original order."""
+    names = list(dict.fromkeys(itertools.chain.from_iterable(attributes)))
+    for i, name in enumerate(names):
+        if name in skip:
+            continue
+        # missing values and None are stored as masks
+        present = np.array([name in attrs for attrs in attributes], dtype=bool)
+        values = [attrs[name] for attrs in attributes if name in attrs]
+        none = np.array([value is None for value in values], dtype=bool)
+        arrays[f"{prefix}_attribute_{i}"] = _column([v for v in values if v is not None])
+        if not present.all():
+            arrays[f"{prefix}_attribute_{i}_present"] = present
+        if none.any():
+            arrays[f"{prefix}_attribute_{i}_none"] = none
+    return names
+
+
+def _load_attribute(data, prefix: str, i: int) -> tuple[list, bool]:
+    """Return the values of a stored attribute and whether all objects have it.
+
+    Objects without the attribute get the value _MISSING.
+    """
+    values = data[f"{prefix}_attribute_{i}"].tolist()
+    none_key = f"{prefix}_attribute_{i}_none"
+    if none_key in data:
+        values_iter = iter(values)
+        values = [None if none else next(values_iter) for none in data[none_key].tolist()]
+    present_key = f"{prefix}_attribute_{i}_present"
+    if present_key not in data:
+        return values, True
+    values_iter = iter(values)
+    values = [next(values_iter) if present else _MISSING for present in data[present_key].tolist()]
+    return values, False
+
+
+def _maxsize(cache) -> int | None:
+    return None if cache is None else cache.maxsize
+
+
+def save_environment(env: Environment, path, compress: bool = False) -> None:
+    """Save an environment to a `.npz` file.
+
+    See `Environment.save()`.
+    """
+    if env.framework is not None:
+        msg = "Only environments without a framework can be saved."
+        raise ValueError(msg)
+    if env._tombstones:
+        env.compact()
+
+    arrays = {}
+    actor_ids, location_ids, _ = env._backend.memberships(env._actors)
+    weights, edge_attributes = env._backend.edge_data(env._actors)
+    arrays["membership_actor_ids"] = np.asarray(actor_ids, dtype=np.int64)
+    arrays["membership_location_ids"] = np.asarray(location_ids, dtype=np.int64)
+    if isinstance(weights, np.ndarray):
+        arrays["membership_weights"] = weights
+    else:
+        # integer weights stay integers, also next to float weights
+        arrays["membership_weights"] = _column(weights)
+        if arrays["membership_weights"].dtype == np.float64:
+            is_int = np.array([type(weight) in _INT_TYPES for weight in weights], dtype=bool)
+            if is_int.any():
+                arrays["membership_weights_int"] = is_int
+    membership_attributes = (
+        [] if edge_attributes is None else _save_attributes(arrays, "membership", edge_attributes)
+    )
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "backend": env.backend,
+        "enable_p2n_warnings": env.enable_p2n_warnings,
+        "neighbor_cache": _maxsize(env._neighbor_cache),
+        "weight_cache": _maxsize(env._weight_cache),
+        "live_projection": env._live_projection is not None,
+        "journal": _maxsize(env._journal),
+        "lazy_views": env._lazy_views,
+        "fresh_id": env._fresh_id,
+        "actors": _save_objects(arrays, "actor", list(env._actors.values())),
+        "locations": _save_objects(arrays, "location", list(env._locations.values())),
+        "membership_attributes": membership_attributes,
+    }
+    arrays["meta"] = np.array(json.dumps(meta))
+
+    if compress:
+        np.savez_compressed(path, **arrays)
+    else:
+        np.savez(path, **arrays)
+
+
+def _resolve_class(saved: list, classes: dict, warn: bool) -> type:
+    path, base_paths = saved
+    qualname = path.partition(":")[2]
+    for key in (path, qualname):
+        if key in classes:
+            return classes[key]
+    cls = _import_class(path)
+    if cls is not None:
+        return cls
+
+    for base_path in base_paths:
+        base_qualname = base_path.partition(":")[2]
+        cls = classes.get(base_path, classes.get(base_qualname)) or _import_class(base_path)
+        if cls is not None:
+            if warn:
+                warnings.warn(
+                    f"Class {path} could not be imported. Its instances are restored as "
+                    f"{base_path}. Pass the class to `classes` to restore it.",
+                    stacklevel=5,
+                )
+            return cls
+    msg = f"Class {path} could not be imported. Pass it to `classes`."
+    raise ValueError(msg)
+
+
+def _load_objects(data, meta: dict, prefix: str, classes: dict, warn: bool, model) -> list:
+    object_classes = []
+    for saved in meta["classes"]:
+        object_classes.append(_resolve_class(saved, classes, warn))
+    objects = [
+        object_classes[code].__new__(object_classes[code])
+        for code in data[f"{prefix}_classes"].tolist()
+    ]
+
+    # one column per attribute, in their original order
+    names = meta["attributes"]
+    restored = {
+        "env": [None] * len(objects),
+        "id_p2n": data[f"{prefix}_ids"].tolist(),
+        "model": [model] * len(objects),
+    }
+    columns = []
+    complete = True
+    for i, name in enumerate(names):
+        if name in restored:
+            columns.append(restored[name])
+            continue
+        values, all_present = _load_attribute(data, prefix, i)
+        complete = complete and all_present
+        columns.append(values)
+
+    layouts = {cls: utils._instance_layout(cls) for cls in object_classes}
+    for obj, row in zip(objects, zip(*columns)):
+        slots, descriptor, _ = layouts[type(obj)]
+        if complete:
+            attributes = zip(names, row)
+        else:
+            attributes = [(name, value) for name, value in zip(names, row) if value is not _MISSING]
+        if not slots:
+            descriptor.__set__(obj, dict(attributes))
+            continue
+        for name, value in attributes:
+            if name in slots or descriptor is None:
+                object.__setattr__(obj, name, value)
+            else:
+                descriptor.__get__(obj)[name] = value
+    return objects
+
+
+def load_environment(
+    env_class: type[Environment],
+    path,
+    model=None,
+    classes: dict | None = None,
+    allow_pickle: bool = False,
+) -> Environment:
+    """Load an environment from a `.npz` file.
+
+    See `Environment.load()`.
+    """
+    classes = {} if classes is None else classes
+    with np.load(path, allow_pickle=allow_pickle) as data:
+        meta = json.loads(data["meta"].item())
+        if meta["version"] > FORMAT_VERSION:
+            msg = f"Unsupported snapshot version: {meta['version']}"
+            raise ValueError(msg)
+
+        env = env_class(
+            model=model,
+            enable_p2n_warnings=meta["enable_p2n_warnings"],
+            backend=meta["backend"],
+            neighbor_cache=meta["neighbor_cache"],
+            weight_cache=meta["weight_cache"],
+            live_projection=meta["live_projection"],
+            journal=meta.get("journal"),
+            lazy_views=meta.get("lazy_views", False),
+        )
+        warn = env.enable_p2n_warnings
+        # the objects are created in bulk, so the cyclic garbage collector would run many times
+        # over the growing network without finding anything to collect
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            actors = _load_objects(data, meta["actors"], "actor", classes, warn, model)
+            locations = _load_objects(data, meta["locations"], "location", classes, warn, model)
+            env.add_actors(actors)
+            env.add_locations(locations)
+            env.add_memberships(
+                data["membership_actor_ids"],
+                data["membership_location_ids"],
+                data["membership_weights"],
+            )
+            if "membership_weights_int" in data:
+                is_int = data["membership_weights_int"]
+                env._backend.set_weights(
+                    data["membership_actor_ids"][is_int],
+                    data["membership_location_ids"][is_int],
+                    data["membership_weights"][is_int].astype(np.int64),
+                )
+            _load_edge_attributes(env, data, meta.get("membership_attributes", []))
+        finally:
+            if gc_enabled:
+                gc.enable()
+        env._fresh_id = meta["fresh_id"]
+
+    return env
+
+
+def _load_edge_attributes(env: Environment, data, names: list[str]) -> None:
+    """Restore the edge attributes of the memberships besides their weights."""
+    if not names:
+        return
+    columns = [_load_attribute(data, "membership", i)[0] for i in range(len(names))]
+    for actor_id, location_id, row in zip(
+        data["membership_actor_ids"].tolist(),
+        data["membership_location_ids"].tolist(),
+        zip(*columns),
+    ):
+        attributes = {name: value for name, value in zip(names, row) if value is not _MISSING}
+        if attributes:
+            env._backend.add_edge(actor_id, location_id, **attributes)
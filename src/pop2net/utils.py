@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import inspect
+import types
 import typing
 
 import numpy as np
@@ -92,3 +93,27 @@ def _get_cls_as_str(cls_):
 
 def _join_positions(pos1, pos2):
     return "-".join(sorted([str(pos1), str(pos2)]))
+
+
+def _get_attributes(obj) -> dict:
+    # like vars(), but includes the attributes stored in the columns of the environment
+    attributes = dict(vars(obj))
+    for name in getattr(type(obj), "_p2n_columns", ()):
+        if name not in attributes and hasattr(obj, name):
+            attributes[name] = getattr(obj, name)
+    return attributes
+
+
+def _instance_layout(cls: type) -> tuple:
+    # the slot names, the descriptor of the instance dict and the columnar attributes of a class
+    slots = []
+    descriptor = None
+    for klass in reversed(cls.__mro__):
+        names = klass.__dict__.get("__slots__", ())
+        slots.extend([names] if isinstance(names, str) else names)
+        # the descriptor is looked up directly, because classes may shadow `__dict__`
+        candidate = klass.__dict__.get("__dict__")
+        if isinstance(candidate, types.GetSetDescriptorType):
+            descriptor = candidate
+    slots = tuple(name for name in slots if name not in ("__dict__", "__weakref__"))
+    return slots, descriptor, getattr(cls, "_p2n_columns", ())
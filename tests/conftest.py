@@ -1,5 +1,6 @@
 import pytest
 
+import pop2net as p2n
 from pop2net.data_fakers import soep
 
 
@@ -21,3 +22,20 @@ def soep1000():
 @pytest.fixture(scope="session")
 def soep10_000():
     return soep(size=10_000, seed=10_000)
+
+
+@pytest.fixture(params=["networkx", "sparse"])
+def backend(request):
+    return request.param
+
+
+@pytest.fixture
+def create_env():
+    def create_env(location_designers, n_actors=30, seed=5, backend="networkx", **kwargs):
+        env = p2n.Environment(backend=backend, **kwargs)
+        creator = p2n.Creator(env=env, seed=seed)
+        creator.create_actors(n=n_actors)
+        creator.create_locations(location_designers=location_designers)
+        return env
+
+    return create_env
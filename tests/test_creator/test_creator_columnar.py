@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pop2net as p2n
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "age": [5, 17, 30, 42, 67, 80],
+            "income": [0.0, 100.5, 2000.0, 3100.0, 1500.25, 900.0],
+            "status": ["child", "child", "adult", "adult", "senior", "senior"],
+        }
+    )
+
+
+class Adult(p2n.LocationDesigner):
+    def filter(self, actor):
+        return actor.age >= 18
+
+    def filter_batch(self, actors):
+        return actors[0].env.actor_column("age", actors) >= 18
+
+
+def test_columnar_attributes(df):
+    env = p2n.Environment()
+    creator = p2n.Creator(env=env)
+    actors = creator.create_actors(df=df, columnar=True)
+
+    assert [actor.age for actor in actors] == df["age"].tolist()
+    assert [actor.status for actor in actors] == df["status"].tolist()
+    assert all(isinstance(actor, p2n.Actor) for actor in actors)
+    assert all(actor.type == "Actor" for actor in actors)
+    assert "age" not in vars(actors[0])
+
+    assert env.actor_column("age").dtype == np.int64
+    assert env.actor_column("income").mean() == pytest.approx(df["income"].mean())
+    assert env.actor_column("status", actors[2:4]).tolist() == ["adult", "adult"]
+
+    actors[0].age = 6
+    actors[1].income = 50
+    actors[2].status = 1
+    assert actors[0].age == 6
+    assert env.actor_column("age")[0] == 6
+    assert actors[1].income == 50
+    assert actors[2].status == 1
+
+    actors[3].age = 42.5
+    assert actors[3].age == 42.5
+    assert env.actor_column("age").dtype == np.float64
+
+
+def test_columnar_attributes_match_default_mode(df):
+    env1 = p2n.Environment()
+    env2 = p2n.Environment()
+    actors1 = p2n.Creator(env=env1).create_actors(df=df)
+    actors2 = p2n.Creator(env=env2).create_actors(df=df, columnar=True)
+
+    for actor1, actor2 in zip(actors1, actors2):
+        for column in df.columns:
+            assert getattr(actor1, column) == getattr(actor2, column)
+
+    df1 = pd.DataFrame([p2n.utils._get_attributes(actor) for actor in actors1])
+    df2 = pd.DataFrame([p2n.utils._get_attributes(actor) for actor in actors2])
+    pd.testing.assert_frame_equal(df1.drop(columns="env"), df2.drop(columns="env"))
+
+
+def test_actor_column_without_columns(df):
+    env = p2n.Environment()
+    creator = p2n.Creator(env=env)
+    creator.create_actors(df=df, columnar=True)
+    other = p2n.Actor()
+    other.age = 99
+    env.add_actor(other)
+
+    assert env.actor_column("age").tolist() == [*df["age"], 99]
+    assert env.actor_column("age", [other]).tolist() == [99]
+
+    new_actors = creator.create_actors(df=df[["income"]], columnar=True)
+    assert env.actor_column("income", new_actors).tolist() == df["income"].tolist()
+    with pytest.raises(AttributeError):
+        env.actor_column("age")
+
+
+def test_actor_class_dict(df):
+    class Child(p2n.Actor):
+        pass
+
+    class Grown(p2n.Actor):
+        pass
+
+    env = p2n.Environment()
+    actors = p2n.Creator(env=env).create_actors(
+        df=df,
+        actor_class_attr="status",
+        actor_class_dict={"child": Child, "adult": Grown, "senior": Grown},
+        columnar=True,
+    )
+    assert [actor.type for actor in actors] == [
+        "Child",
+        "Child",
+        "Grown",
+        "Grown",
+        "Grown",
+        "Grown",
+    ]
+    assert isinstance(actors[0], Child)
+    assert [actor.age for actor in actors] == df["age"].tolist()
+
+
+def test_removed_actors_keep_their_attributes(df):
+    env = p2n.Environment()
+    actors = p2n.Creator(env=env).create_actors(df=df, columnar=True)
+
+    env.remove_actor(actors[0])
+    env.remove_actors(actors[1:3], defer=True)
+    assert actors[0].age == 5
+    assert actors[2].status == "adult"
+
+    env.compact()
+    assert len(env._columns) == 3
+    assert env.actor_column("age").tolist() == [42, 67, 80]
+
+    actors[0].age = 7
+    env.add_actor(actors[0])
+    assert actors[0].age == 7
+    assert env.actor_column("age").tolist() == [42, 67, 80, 7]
+
+
+def test_filter_batch(df):
+    env = p2n.Environment()
+    creator = p2n.Creator(env=env)
+    actors = creator.create_actors(df=df, columnar=True)
+    creator.create_locations(location_designers=[Adult])
+
+    assert len(env.locations) == 1
+    assert env.locations[0].actors == actors[2:]
+
+
+def test_columnar_id_column():
+    env = p2n.Environment()
+    with pytest.raises(Exception, match="`id`"):
+        p2n.Creator(env=env).create_actors(df=pd.DataFrame({"id": [1, 2]}), columnar=True)
+
+
+class SlottedActor(p2n.CompactActor):
+    __slots__ = ()
+
+
+def test_columnar_compact_actors(df):
+    env = p2n.Environment()
+    actors = p2n.Creator(env=env).create_actors(actor_class=SlottedActor, df=df, columnar=True)
+
+    assert all(isinstance(actor, SlottedActor) for actor in actors)
+    assert [actor.age for actor in actors] == df["age"].tolist()
+    assert "age" not in vars(actors[0])
+    actors[1].income = 50.0
+    assert env.actor_column("income")[1] == 50.0
+
+    env.remove_actor(actors[0])
+    assert actors[0].status == "child"
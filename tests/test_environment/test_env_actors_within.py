@@ -0,0 +1,74 @@
+import pytest
+
+import pop2net as p2n
+
+
+@pytest.fixture
+def env(backend):
+    """A chain of actors 0 - 1 - 2 - 3 - 4 with alternating location labels and actor 5 at the
+    first location."""
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(6)]
+    env.add_actors(actors)
+    for i in range(4):
+        location = p2n.Location()
+        location.label = "home" if i % 2 == 0 else "work"
+        env.add_location(location)
+        location.add_actors(actors[i : i + 2])
+    env.locations[0].add_actor(actors[5])
+    return env
+
+
+def test_hops(env):
+    actors = env.actors
+    assert env.actors_within(actors[0], 0) == []
+    assert env.actors_within(actors[0], 1) == [actors[1], actors[5]]
+    assert env.actors_within(actors[0], 3) == [actors[1], actors[5], actors[2], actors[3]]
+    assert env.actors_within(actors[0], None) == [actors[1], actors[5], *actors[2:5]]
+    assert set(env.actors_within(actors[3], 1)) == set(actors[3].neighbors())
+
+
+def test_distances(env):
+    actors = env.actors
+    assert env.actors_within(actors[2], 2, return_distances=True) == {
+        actors[1]: 1,
+        actors[3]: 1,
+        actors[0]: 2,
+        actors[5]: 2,
+        actors[4]: 2,
+    }
+    assert env.actors_within(actors[0], 10, return_distances=True)[actors[4]] == 4
+
+
+def test_multiple_sources(env):
+    actors = env.actors
+    assert env.actors_within([actors[0], actors[4]], 1, return_distances=True) == {
+        actors[1]: 1,
+        actors[5]: 1,
+        actors[3]: 1,
+    }
+    assert env.actors_within([], 3) == []
+
+
+def test_location_labels(env):
+    actors = env.actors
+    assert set(env.actors_within(actors[0], None, location_labels=["home"])) == {
+        actors[1],
+        actors[5],
+    }
+    assert env.actors_within(actors[1], None, location_labels=["work"]) == [actors[2]]
+    assert env.actors_within(actors[0], None, location_labels=["missing"]) == []
+
+
+def test_removed_objects(env):
+    actors = env.actors
+    env.remove_locations([env.locations[1]], defer=True)
+    env.remove_actors([actors[5]], defer=True)
+    assert env.actors_within(actors[0], None) == [actors[1]]
+
+
+def test_errors(env):
+    with pytest.raises(ValueError, match="negative"):
+        env.actors_within(env.actors[0], -1)
+    with pytest.raises(Exception, match="does not exist"):
+        env.actors_within(p2n.Actor(), 1)
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+class School(p2n.Location):
+    def weight(self, actor):
+        return actor.id_p2n + 1
+
+
+def _create_env(backend):
+    env = p2n.Environment(backend=backend)
+    env.add_actors([p2n.Actor() for _ in range(6)])
+    env.add_locations([School() for _ in range(3)])
+    return env
+
+
+def _memberships(env):
+    return {
+        (actor.id_p2n, location.id_p2n): location.get_weight(actor)
+        for location in env.locations
+        for actor in location.actors
+    }
+
+
+def test_add_memberships_matches_single_inserts(backend):
+    rng = np.random.default_rng(1)
+    env_single = _create_env(backend)
+    env_batch = _create_env(backend)
+    actor_ids = rng.choice([a.id_p2n for a in env_single.actors], size=12)
+    location_ids = rng.choice([loc.id_p2n for loc in env_single.locations], size=12)
+
+    actors = {a.id_p2n: a for a in env_single.actors}
+    locations = {loc.id_p2n: loc for loc in env_single.locations}
+    for actor_id, location_id in zip(actor_ids, location_ids):
+        env_single.add_actor_to_location(locations[location_id], actors[actor_id])
+    summary = env_batch.add_memberships(actor_ids, location_ids)
+
+    assert _memberships(env_batch) == _memberships(env_single)
+    assert summary["added"] == len(_memberships(env_single))
+    assert summary["added"] + summary["duplicates"] == len(actor_ids)
+
+
+def test_add_memberships_summary(backend):
+    env = _create_env(backend)
+    actor1, actor2, actor3 = env.actors[:3]
+    location1, location2 = env.locations[:2]
+    location1.add_actor(actor1, weight=5)
+
+    summary = env.add_memberships(
+        actor_ids=iter([actor1.id_p2n, actor2.id_p2n, actor2.id_p2n, 999, actor3.id_p2n]),
+        location_ids=[location1.id_p2n, location1.id_p2n, location1.id_p2n, location2.id_p2n, 998],
+        weights=[1, 2, 3, 4, 5],
+    )
+
+    assert summary == {
+        "added": 1,
+        "updated": 1,
+        "duplicates": 1,
+        "unknown_actor_ids": [999],
+        "unknown_location_ids": [998],
+    }
+    assert location1.get_weight(actor1) == 1
+    assert location1.get_weight(actor2) == 3
+    assert list(location2.actors) == []
+    assert list(actor3.locations) == []
+
+
+def test_add_memberships_scalar_weight(backend):
+    env = _create_env(backend)
+    location = env.locations[0]
+    summary = env.add_memberships([a.id_p2n for a in env.actors], [location.id_p2n] * 6, 2)
+    assert summary["added"] == 6
+    assert all(location.get_weight(actor) == 2 for actor in env.actors)
+    assert env.export_actor_network().number_of_edges() == 15
+
+
+def test_add_memberships_invalid_lengths():
+    env = _create_env("networkx")
+    with pytest.raises(ValueError, match="same length"):
+        env.add_memberships([0, 1], [6])
+    with pytest.raises(ValueError, match="same length"):
+        env.add_memberships([0, 1], [6, 7], weights=[1])
+
+
+def test_add_memberships_empty(backend):
+    env = _create_env(backend)
+    summary = env.add_memberships([], [])
+    assert summary["added"] == summary["updated"] == summary["duplicates"] == 0
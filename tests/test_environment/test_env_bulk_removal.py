@@ -0,0 +1,138 @@
+import pytest
+
+import pop2net as p2n
+from pop2net.backends import SparseBackend
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 3
+
+
+class School(p2n.LocationDesigner):
+    n_actors = 8
+
+
+@pytest.fixture(autouse=True)
+def small_rebuild_threshold(monkeypatch):
+    monkeypatch.setattr(SparseBackend, "rebuild_threshold", 3)
+
+
+def _state(env):
+    return (
+        [actor.id_p2n for actor in env.actors],
+        [location.id_p2n for location in env.locations],
+        sorted(env.export_actor_network().edges(data="weight")),
+        sorted(
+            (actor.id_p2n, location.id_p2n)
+            for location in env.locations
+            for actor in location.actors
+        ),
+    )
+
+
+@pytest.mark.parametrize("defer", [False, True])
+def test_bulk_removal_matches_single_removal(backend, defer, create_env):
+    env_single = create_env([Home, School], backend=backend)
+    env_bulk = create_env([Home, School], backend=backend)
+
+    for actor in env_single.actors[::3]:
+        env_single.remove_actor(actor)
+    for location in env_single.locations_by_label("School")[::2]:
+        env_single.remove_location(location)
+
+    env_bulk.remove_actors(env_bulk.actors[::3], defer=defer)
+    env_bulk.remove_locations(env_bulk.locations_by_label("School")[::2], defer=defer)
+
+    assert _state(env_bulk) == _state(env_single)
+    assert env_bulk.g.number_of_edges() == env_single.g.number_of_edges()
+    assert not env_bulk._tombstones
+
+
+def test_deferred_removal_is_hidden_before_compact(backend, create_env):
+    env = create_env([Home, School], backend=backend)
+    actor = env.actors[0]
+    location = actor.locations[0]
+    neighbors = set(actor.neighbors())
+    n_edges = env._backend.number_of_edges()
+
+    env.remove_locations([location], defer=True)
+    removed = env.actors[1:4]
+    env.remove_actors(removed, defer=True)
+
+    assert env._backend.number_of_edges() == n_edges
+    assert location not in env.locations
+    assert location not in actor.locations
+    assert not set(removed) & set(env.actors)
+    assert all(not set(removed) & set(loc.actors) for loc in env.locations)
+    assert set(actor.neighbors()) <= neighbors - set(removed)
+
+    env.compact()
+    assert not env._tombstones
+    assert env._backend.number_of_edges() < n_edges
+    assert set(env.g.nodes) == {obj.id_p2n for obj in [*env.actors, *env.locations]}
+
+
+def test_readding_deferred_actor(backend, create_env):
+    env = create_env([Home, School], backend=backend)
+    actor = env.actors[0]
+    env.remove_actors([actor], defer=True)
+    env.add_actor(actor)
+
+    assert actor in env.actors
+    assert list(actor.locations) == []
+    assert not env._tombstones
+
+
+def test_remove_memberships(backend, create_env):
+    env = create_env([Home, School], backend=backend)
+    location = env.locations_by_label("School")[0]
+    members = list(location.actors)
+    outsider = next(actor for actor in env.actors if actor not in members)
+
+    summary = env.remove_memberships(
+        [members[0].id_p2n, members[1].id_p2n, outsider.id_p2n, 999],
+        [location.id_p2n] * 4,
+    )
+    assert summary == {
+        "removed": 2,
+        "missing": 1,
+        "unknown_actor_ids": [999],
+        "unknown_location_ids": [],
+    }
+    assert set(location.actors) == set(members[2:])
+
+    with pytest.raises(ValueError, match="same length"):
+        env.remove_memberships([0], [])
+
+
+def test_location_remove_actors(backend, create_env):
+    env = create_env([Home, School], backend=backend)
+    location = env.locations_by_label("School")[0]
+    members = list(location.actors)
+
+    location.remove_actors(members[:3])
+    assert set(location.actors) == set(members[3:])
+
+    with pytest.raises(Exception, match="does not exist"):
+        location.remove_actors([members[3], p2n.Actor()])
+    assert members[3] in location.actors
+
+
+class LoggedLocation(p2n.Location):
+    def remove_actor(self, actor):
+        self.removed.append(actor)
+        super().remove_actor(actor)
+
+
+def test_location_remove_actors_uses_overridden_remove_actor(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(3)]
+    location = LoggedLocation()
+    location.removed = []
+    env.add_actors(actors)
+    env.add_location(location)
+    location.add_actors(actors)
+
+    location.remove_actors(actors[:2])
+    assert location.removed == actors[:2]
+    assert list(location.actors) == actors[2:]
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+def _create_env(n_actors=5, n_locations=3):
+    env = p2n.Environment()
+    env.add_actors([p2n.Actor() for _ in range(n_actors)])
+    env.add_locations([p2n.Location() for _ in range(n_locations)])
+    return env
+
+
+def test_positions_follow_insertion_order():
+    env = _create_env()
+    for i, actor in enumerate(env.actors):
+        assert env.actor_index(actor) == i
+        assert env.actor_at(i) is actor
+    for i, location in enumerate(env.locations):
+        assert env.location_index(location) == i
+        assert env.location_at(i) is location
+
+    assert env.actor_indices(env.actors[::-1]).tolist() == [4, 3, 2, 1, 0]
+    assert env.location_indices([]).dtype == np.int64
+
+
+def test_positions_are_stable_when_adding():
+    env = _create_env()
+    actor = env.actors[3]
+    generation = env.index_generation
+    assert env.actor_index(actor) == 3
+
+    new_actor = p2n.Actor()
+    env.add_actor(new_actor)
+    assert env.actor_index(actor) == 3
+    assert env.actor_index(new_actor) == 5
+    assert env.actor_at(5) is new_actor
+    assert env.index_generation == generation
+
+
+def test_positions_are_remapped_after_removal():
+    env = _create_env()
+    actors = env.actors
+    locations = env.locations
+    env.actor_index(actors[0])
+    env.location_index(locations[0])
+    generation = env.index_generation
+
+    env.remove_actors([actors[1], actors[3]])
+    env.remove_location(locations[0])
+
+    assert env.index_generation == generation + 2
+    assert [env.actor_index(actor) for actor in env.actors] == [0, 1, 2]
+    assert [env.actor_at(i) for i in range(3)] == [actors[0], actors[2], actors[4]]
+    assert env.location_at(0) is locations[1]
+
+
+def test_positions_after_deferred_removal():
+    env = _create_env()
+    actors = env.actors
+    env.remove_actors(actors[:2], defer=True)
+    assert env.actor_index(actors[2]) == 0
+    env.compact()
+    assert env.actor_index(actors[2]) == 0
+
+
+def test_dense_index_errors():
+    env = _create_env()
+    removed = env.actors[0]
+    env.remove_actor(removed)
+
+    with pytest.raises(Exception, match="does not exist"):
+        env.actor_index(removed)
+    with pytest.raises(Exception, match="does not exist"):
+        env.actor_indices([env.actors[0], removed])
+    with pytest.raises(Exception, match="does not exist"):
+        env.location_index(p2n.Location())
+    with pytest.raises(IndexError):
+        env.actor_at(4)
+    with pytest.raises(IndexError):
+        env.location_at(-1)
+
+
+def test_positions_align_arrays():
+    env = _create_env(n_actors=6)
+    ages = np.arange(6) * 10
+    for actor in env.actors:
+        actor.age = ages[env.actor_index(actor)]
+
+    env.remove_actor(env.actors[2])
+    ages = np.array([actor.age for actor in env.actors])
+    assert all(ages[env.actor_index(actor)] == actor.age for actor in env.actors)
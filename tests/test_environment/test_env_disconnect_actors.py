@@ -0,0 +1,101 @@
+import itertools
+import random
+import warnings
+
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 4
+
+
+class School(p2n.LocationDesigner):
+    n_actors = 10
+
+
+def _memberships(env):
+    return {
+        (actor.id_p2n, location.id_p2n) for location in env.locations for actor in location.actors
+    }
+
+
+@pytest.mark.parametrize("location_labels", [None, ["School"]])
+def test_disconnect_matches_pairwise_search(backend, location_labels, create_env):
+    env = create_env([Home, School], n_actors=60, enable_p2n_warnings=False, backend=backend)
+    actors = random.Random(1).sample(list(env.actors), 15)
+
+    shared = {
+        location.id_p2n
+        for actor1, actor2 in itertools.combinations(actors, 2)
+        for location in env.locations_between_actors(actor1, actor2, location_labels)
+    }
+    actor_ids = {actor.id_p2n for actor in actors}
+    expected = {
+        (actor_id, location_id)
+        for actor_id, location_id in _memberships(env)
+        if not (actor_id in actor_ids and location_id in shared)
+    }
+
+    env.disconnect_actors(actors, location_labels=location_labels)
+    assert _memberships(env) == expected
+
+
+def test_disconnect_and_remove_locations(create_env):
+    env = create_env([Home, School], n_actors=60, enable_p2n_warnings=False, backend="sparse")
+    home = env.locations_by_label("Home")[0]
+    members = list(home.actors)
+    env.enable_p2n_warnings = True
+
+    with pytest.warns(UserWarning, match="other actors") as record:
+        env.disconnect_actors(members[:2], remove_locations=True)
+    assert len(record) == 2
+    assert home not in env.locations
+    assert all(home not in actor.locations for actor in members)
+
+
+def test_disconnect_with_removed_and_unknown_actors(create_env):
+    env = create_env([Home, School], n_actors=60, enable_p2n_warnings=False, backend="sparse")
+    home = env.locations_by_label("Home")[0]
+    members = list(home.actors)
+    env.remove_actors(members[2:], defer=True)
+    env.enable_p2n_warnings = True
+
+    # the deferred removed actors are no longer members, so there is no warning
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        env.disconnect_actors(members[:2], location_labels=["Home"])
+    assert home.actors == []
+
+    with pytest.raises(Exception, match="does not exist"):
+        env.disconnect_actors([members[0], p2n.Actor()])
+
+
+class LoggedHome(p2n.Location):
+    def remove_actor(self, actor):
+        self.removed.append(actor)
+        super().remove_actor(actor)
+
+
+class LoggedSchool(p2n.Location):
+    def remove_actors(self, actors):
+        self.removed.extend(actors)
+        super().remove_actors(actors)
+
+
+def test_disconnect_uses_overridden_remove_methods(backend):
+    env = p2n.Environment(backend=backend, enable_p2n_warnings=False)
+    actors = [p2n.Actor() for _ in range(3)]
+    home, school, other = LoggedHome(), LoggedSchool(), p2n.Location()
+    home.removed, school.removed = [], []
+    env.add_actors(actors)
+    env.add_locations([home, school, other])
+    for location in [home, school, other]:
+        location.add_actors(actors)
+
+    env.disconnect_actors(actors[:2])
+    assert home.removed == actors[:2]
+    assert school.removed == actors[:2]
+    for location in [home, school, other]:
+        assert list(location.actors) == actors[2:]
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 4
+
+
+class School(p2n.LocationDesigner):
+    n_actors = 10
+
+    def weight(self, actor):
+        return actor.id_p2n % 4
+
+
+class Work(p2n.LocationDesigner):
+    n_actors = 6
+
+    def project_weights(self, actor1, actor2):
+        return self.get_weight(actor1) + self.get_weight(actor2)
+
+
+class Club(p2n.LocationDesigner):
+    n_actors = 5
+
+    def weight(self, actor):
+        return actor.id_p2n % 3 + 1
+
+    def project_weights(self, actor1, actor2):
+        return self.get_weight(actor1) * self.get_weight(actor2)
+
+    def project_weights_batch(self, actors, weights):
+        return np.multiply.outer(weights, weights)
+
+
+def _reference_edges(env, include_0_weights=True):
+    edges = {}
+    for actor in env.actors:
+        for neighbor in actor.neighbors():
+            pair = tuple(sorted((actor.id_p2n, neighbor.id_p2n)))
+            if pair not in edges:
+                weight = actor.get_actor_weight(neighbor)
+                if include_0_weights or weight > 0:
+                    edges[pair] = weight
+    return edges
+
+
+def _edges(graph):
+    return {tuple(sorted((u, v))): w for u, v, w in graph.edges(data="weight")}
+
+
+@pytest.fixture
+def env(backend, create_env):
+    return create_env([Home, School, Work, Club], n_actors=40, seed=2, backend=backend)
+
+
+@pytest.mark.parametrize("include_0_weights", [True, False])
+def test_projection_matches_pairwise_weights(env, include_0_weights):
+    expected = _reference_edges(env, include_0_weights=include_0_weights)
+    graph = env.export_actor_network(include_0_weights=include_0_weights)
+
+    assert list(graph.nodes) == [actor.id_p2n for actor in env.actors]
+    result = _edges(graph)
+    assert result.keys() == expected.keys()
+    for pair, weight in expected.items():
+        assert result[pair] == pytest.approx(weight)
+
+
+def test_projection_node_attrs(env):
+    for actor in env.actors:
+        actor.age = actor.id_p2n * 2
+    graph = env.export_actor_network(node_attrs=["age"])
+    assert all(graph.nodes[actor.id_p2n]["age"] == actor.age for actor in env.actors)
+
+
+def test_projection_outputs(env):
+    graph = env.export_actor_network()
+
+    u, v, weights = env.export_actor_network(output="edgelist")
+    assert {tuple(sorted(pair)): w for *pair, w in zip(u, v, weights)} == pytest.approx(
+        _edges(graph)
+    )
+
+    matrix = env.export_actor_network(output="scipy")
+    positions = {actor.id_p2n: i for i, actor in enumerate(env.actors)}
+    assert matrix.shape == (env.n_actors, env.n_actors)
+    assert matrix.nnz == 2 * graph.number_of_edges()
+    assert (matrix != matrix.T).nnz == 0
+    for a, b, weight in graph.edges(data="weight"):
+        assert matrix[positions[a], positions[b]] == pytest.approx(weight)
+
+    with pytest.raises(ValueError, match="Invalid output"):
+        env.export_actor_network(output="pandas")
+
+
+def test_projection_keeps_zero_weights():
+    env = p2n.Environment()
+    actor1 = p2n.Actor()
+    actor2 = p2n.Actor()
+    actor3 = p2n.Actor()
+    env.add_actors([actor1, actor2, actor3])
+    location = p2n.Location()
+    env.add_location(location)
+    location.add_actor(actor1, weight=0)
+    location.add_actor(actor2, weight=2)
+
+    graph = env.export_actor_network()
+    assert list(graph.nodes) == [actor1.id_p2n, actor2.id_p2n, actor3.id_p2n]
+    assert _edges(graph) == {(actor1.id_p2n, actor2.id_p2n): 0}
+    assert env.export_actor_network(include_0_weights=False).number_of_edges() == 0
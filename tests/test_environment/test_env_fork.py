@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 2
+
+
+def _memberships(env):
+    return sorted(
+        (actor.id_p2n, location.id_p2n, location.get_weight(actor))
+        for location in env.locations
+        for actor in location.actors
+    )
+
+
+@pytest.fixture
+def env(backend):
+    env = p2n.Environment(backend=backend, enable_p2n_warnings=False)
+    creator = p2n.Creator(env=env, seed=4)
+    creator.create_actors(df=pd.DataFrame({"age": [10, 20, 30, 40, 50, 60]}))
+    creator.create_locations(location_designers=[Home])
+    return env
+
+
+def test_fork_is_equal(env):
+    child = env.fork()
+    assert [actor.id_p2n for actor in child.actors] == [actor.id_p2n for actor in env.actors]
+    assert [actor.age for actor in child.actors] == [actor.age for actor in env.actors]
+    assert all(actor.env is child for actor in child.actors)
+    assert all(location.env is child for location in child.locations)
+    assert not set(map(id, child.actors)) & set(map(id, env.actors))
+    assert _memberships(child) == _memberships(env)
+    assert [loc.id_p2n for loc in child.locations_by_label("Home")] == [
+        loc.id_p2n for loc in env.locations_by_label("Home")
+    ]
+    assert child.actors[0].neighbors() == [child.actors[1]]
+
+
+def test_branches_are_independent(env):
+    baseline = _memberships(env)
+    child = env.fork()
+
+    home = child.locations[0]
+    home.set_weight(home.actors[0], 7)
+    child.actors[0].age = 99
+    child.remove_actor(child.actors[5])
+    new_actor = p2n.Actor()
+    child.add_actor(new_actor)
+    child.locations[1].add_actor(new_actor)
+
+    assert _memberships(env) == baseline
+    assert env.actors[0].age == 10
+    assert env.n_actors == 6
+
+    env.remove_location(env.locations[0])
+    assert child.n_locations == 3
+    assert child.locations[0].get_weight(child.locations[0].actors[0]) == 7
+
+    grandchild = child.fork()
+    grandchild.locations[1].remove_actor(new_actor)
+    assert new_actor in child.locations[1].actors
+
+
+def test_fork_with_live_projection(backend):
+    env = p2n.Environment(backend=backend, live_projection=True)
+    actors = [p2n.Actor() for _ in range(4)]
+    locations = [p2n.Location(), p2n.Location()]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    locations[0].add_actors(actors[:3])
+    locations[1].add_actors(actors[2:], weight=2)
+    env.actor_network()
+
+    child = env.fork()
+    expected = sorted(env.actor_network().edges(data="weight"))
+    assert expected
+    assert sorted(child.actor_network().edges(data="weight")) == expected
+
+    child.locations[1].remove_actor(child.actors[3])
+    assert sorted(child.actor_network().edges()) == [(0, 1), (0, 2), (1, 2)]
+    assert sorted(env.actor_network().edges(data="weight")) == expected
+
+
+def test_sparse_arrays_are_shared_until_written():
+    env = p2n.Environment(backend="sparse")
+    actors = [p2n.Actor() for _ in range(4)]
+    location = p2n.Location()
+    env.add_actors(actors)
+    env.add_location(location)
+    env.add_memberships([actor.id_p2n for actor in actors], [location.id_p2n] * 4, 1)
+
+    child = env.fork()
+    assert child._backend._weights is env._backend._weights
+    assert child._backend._edge_row is env._backend._edge_row
+
+    child.set_weights(child.actors, [child.locations[0]] * 4, [1, 2, 3, 4])
+    assert child._backend._weights is not env._backend._weights
+    assert child._backend._edge_row is env._backend._edge_row
+    assert env.get_weights(actors, [location] * 4).tolist() == [1, 1, 1, 1]
+
+    env.locations[0].remove_actor(actors[0])
+    assert child._backend._alive is not env._backend._alive
+    assert len(child.locations[0].actors) == 4
+
+
+def test_columns_are_shared_until_written():
+    env = p2n.Environment(backend="sparse")
+    creator = p2n.Creator(env=env)
+    creator.create_actors(
+        df=pd.DataFrame({"age": [1, 2, 3], "income": [1.0, 2.0, 3.0]}), columnar=True
+    )
+
+    child = env.fork()
+    assert child._columns._columns["age"] is env._columns._columns["age"]
+
+    child.actors[0].age = 10
+    assert child.actor_column("age").tolist() == [10, 2, 3]
+    assert env.actor_column("age").tolist() == [1, 2, 3]
+    assert child._columns._columns["income"] is env._columns._columns["income"]
+
+    env.remove_actor(env.actors[1])
+    assert env.actors[1].age == 3
+    assert child.actor_column("age").tolist() == [10, 2, 3]
+    assert np.array_equal(child.actor_column("income"), [1.0, 2.0, 3.0])
+
+
+def test_fork_with_framework():
+    env = p2n.Environment(framework="mesa")
+    with pytest.raises(ValueError, match="without a framework"):
+        env.fork()
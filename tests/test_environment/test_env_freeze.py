@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+@pytest.fixture
+def env(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(5)]
+    locations = [p2n.Location(), p2n.Location(), p2n.Location()]
+    locations[0].label = "home"
+    locations[1].label = "work"
+    env.add_actors(actors)
+    env.add_locations(locations)
+    locations[0].add_actors(actors[:3], weight=2)
+    locations[1].add_actors(actors[2:])
+    locations[2].add_actor(actors[4], weight=3)
+    return env
+
+
+def test_freeze(env):
+    actors, locations = env.actors, env.locations
+    frozen = env.freeze()
+
+    assert frozen.n_actors == 5
+    assert frozen.n_locations == 3
+    assert frozen.actors == tuple(actors)
+    assert frozen.mutation_count == env.mutation_count
+    assert frozen.actors_of_location(locations[1]) == tuple(actors[2:])
+    assert frozen.locations_of_actor(actors[4]) == (locations[1], locations[2])
+    assert set(frozen.neighbors_of_actor(actors[2])) == set(actors[2].neighbors())
+    assert frozen.neighbors_of_actor(actors[2], location_labels=["home"]) == tuple(actors[:2])
+    assert frozen.neighbor_indices(4).tolist() == [2, 3]
+    assert frozen.get_weight(actors[0], locations[0]) == 2
+    assert frozen.get_weight(actors[4].id_p2n, locations[2].id_p2n) == 3
+    with pytest.raises(KeyError):
+        frozen.get_weight(actors[0], locations[1])
+
+
+def test_frozen_environment_is_read_only(env):
+    frozen = env.freeze()
+    with pytest.raises(AttributeError, match="read-only"):
+        frozen.actor_ids = None
+    with pytest.raises(ValueError, match="read-only"):
+        frozen.actor_weights[0] = 10
+    with pytest.raises(TypeError):
+        frozen._actor_positions[100] = 0
+
+    env.locations[0].remove_actor(env.actors[0])
+    env.remove_actor(env.actors[1])
+    assert frozen.neighbor_indices(0).tolist() == [1, 2]
+    assert frozen.n_actors == 5
+
+
+def test_pickled_frozen_environment(env):
+    frozen = env.freeze()
+    env.remove_actors([env.actors[0]], defer=True)
+    assert env.freeze().n_actors == 4
+
+    copy = pickle.loads(pickle.dumps(frozen))
+    assert copy.neighbor_indices(2).tolist() == [0, 1, 3, 4]
+    assert copy.actor_index(env.actors[0].id_p2n) == 1
+    assert not copy.location_actors.flags.writeable
+    with pytest.raises(ValueError, match="not pickled"):
+        _ = copy.actors
+
+
+def test_apply_mutations_in_order(env):
+    actors, locations = env.actors, env.locations
+    frozen = env.freeze()
+
+    def step(index):
+        buffer = p2n.MutationBuffer()
+        neighbors = frozen.neighbor_indices(index)
+        buffer.set_attribute(frozen.actor_ids[index], "n_neighbors", len(neighbors))
+        buffer.add_membership(actors[index], locations[2], weight=index)
+        buffer.set_weight(actors[index], locations[2], index + 10)
+        buffer.add_membership(actors[index], locations[2])
+        if index == 4:
+            buffer.remove_membership(actors[4], locations[1])
+        return buffer
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        buffers = list(pool.map(step, range(5)))
+    assert [len(buffer) for buffer in buffers] == [4, 4, 4, 4, 5]
+
+    summary = env.apply_mutations(buffers)
+    assert summary == {
+        "added": 4,
+        "updated": 6,
+        "removed": 1,
+        "missing": 0,
+        "unknown_actor_ids": [],
+        "unknown_location_ids": [],
+    }
+    assert [actor.n_neighbors for actor in actors] == [2, 2, 4, 2, 2]
+    # the last change of each actor sets the default weight of 1
+    assert env.get_weights(actors, [locations[2]] * 5).tolist() == [1, 1, 1, 1, 1]
+    assert locations[1].actors == [actors[2], actors[3]]
+
+
+def test_apply_mutations_skips_unknown_ids(env):
+    buffer = p2n.MutationBuffer()
+    buffer.add_membership(99, env.locations[0], 1)
+    buffer.remove_membership(env.actors[0], 98)
+    summary = env.apply_mutations(buffer)
+    assert summary["unknown_actor_ids"] == [99]
+    assert summary["unknown_location_ids"] == [98]
+    assert env.apply_mutations([])["added"] == 0
+
+    buffer = p2n.MutationBuffer()
+    buffer.set_weight(env.actors[0], env.locations[1], 5)
+    with pytest.raises(KeyError):
+        env.apply_mutations(buffer)
+    assert np.isclose(env.get_weight(env.actors[0], env.locations[0]), 2)
@@ -0,0 +1,104 @@
+import pytest
+
+import pop2net as p2n
+
+
+@pytest.fixture
+def env(backend):
+    return p2n.Environment(backend=backend, journal=100)
+
+
+def _kinds(changes):
+    return [(change.kind, change.actor_id, change.location_id, change.weight) for change in changes]
+
+
+def test_single_changes(env):
+    cursor = env.journal_cursor()
+    actor = p2n.Actor()
+    location = p2n.Location()
+    env.add_actor(actor)
+    env.add_location(location)
+    location.add_actor(actor, weight=2)
+    location.add_actor(actor, weight=3)
+    location.set_weight(actor, 4)
+    location.remove_actor(actor)
+    location.remove_actor(actor)
+    env.remove_location(location)
+    env.remove_actor(actor)
+
+    assert cursor.pending == 8
+    changes = cursor.read()
+    assert [change.seq for change in changes] == list(range(8))
+    assert _kinds(changes) == [
+        ("add_actor", 0, None, None),
+        ("add_location", None, 1, None),
+        ("add_membership", 0, 1, 2),
+        ("set_weight", 0, 1, 3),
+        ("set_weight", 0, 1, 4),
+        ("remove_membership", 0, 1, None),
+        ("remove_location", None, 1, None),
+        ("remove_actor", 0, None, None),
+    ]
+    assert cursor.read() == []
+
+
+def test_batch_changes(env):
+    actors = [p2n.Actor() for _ in range(3)]
+    locations = [p2n.Location(), p2n.Location()]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    cursor = env.journal_cursor()
+
+    env.add_memberships([0, 1, 2], [3, 3, 4], [1, 2, 3])
+    env.add_memberships([0, 1], [3, 4], 5)
+    env.set_weights(actors[:2], [locations[0]] * 2, [7, 8])
+    env.remove_memberships([0, 0, 2, 2], [3, 3, 3, 4])
+    env.remove_actors(actors[1:], defer=True)
+
+    assert _kinds(cursor.read()) == [
+        ("add_membership", 0, 3, 1),
+        ("add_membership", 1, 3, 2),
+        ("add_membership", 2, 4, 3),
+        ("add_membership", 1, 4, 5),
+        ("set_weight", 0, 3, 5),
+        ("set_weight", 0, 3, 7),
+        ("set_weight", 1, 3, 8),
+        ("remove_membership", 0, 3, None),
+        ("remove_membership", 2, 4, None),
+        ("remove_actor", 1, None, None),
+        ("remove_actor", 2, None, None),
+    ]
+
+
+def test_cursors_are_independent(env):
+    first = env.journal_cursor()
+    env.add_actor(p2n.Actor())
+    second = env.journal_cursor()
+    env.add_actor(p2n.Actor())
+
+    assert [change.actor_id for change in first.read(limit=1)] == [0]
+    assert [change.actor_id for change in second.read()] == [1]
+    assert [change.actor_id for change in first.read()] == [1]
+    assert [change.actor_id for change in env.journal_cursor(from_start=True).read()] == [0, 1]
+
+
+def test_overflow():
+    env = p2n.Environment(journal=5)
+    cursor = env.journal_cursor()
+    env.add_actors([p2n.Actor() for _ in range(20)])
+    with pytest.raises(p2n.JournalOverflowError, match="15 changes were dropped"):
+        cursor.read()
+    cursor.skip()
+    assert cursor.read() == []
+
+    late = env.journal_cursor(from_start=True)
+    assert [change.seq for change in late.read()] == [15, 16, 17, 18, 19]
+    assert len(env._journal._entries) <= 10
+
+
+def test_journal_disabled():
+    env = p2n.Environment()
+    with pytest.raises(ValueError, match="journal"):
+        env.journal_cursor()
+    assert env.fork()._journal is None
+    assert p2n.Environment(journal=3).fork()._journal.maxsize == 3
@@ -0,0 +1,95 @@
+import pop2net as p2n
+
+
+class Home(p2n.Location):
+    pass
+
+
+class School(p2n.Location):
+    label = "school"
+
+
+def _setup_env():
+    env = p2n.Environment()
+    actors = [p2n.Actor() for _ in range(4)]
+    env.add_actors(actors)
+    home1 = Home()
+    home2 = Home()
+    school = School()
+    env.add_locations([home1, school, home2])
+    home1.add_actors(actors[:2])
+    home2.add_actors(actors[2:])
+    school.add_actors([actors[1], actors[2]])
+    return env, actors, home1, home2, school
+
+
+def test_locations_by_label():
+    env, _, home1, home2, school = _setup_env()
+
+    assert env.locations_by_label("Home") == [home1, home2]
+    assert env.locations_by_label("school") == [school]
+    assert env.locations_by_label("Work") == []
+
+
+def test_actors_by_label():
+    env, actors, *_ = _setup_env()
+
+    assert env.actors_by_label("Home") == actors
+    assert env.actors_by_label("school") == [actors[1], actors[2]]
+    assert env.actors_by_label("Work") == []
+
+
+def test_label_index_after_removal():
+    env, actors, home1, home2, school = _setup_env()
+
+    env.remove_location(home1)
+    assert env.locations_by_label("Home") == [home2]
+    assert env.actors_by_label("Home") == [actors[2], actors[3]]
+
+    env.remove_location(school)
+    assert env.locations_by_label("school") == []
+    assert "school" not in env._locations_by_label
+
+
+def test_label_index_after_relabel():
+    env, actors, home1, home2, school = _setup_env()
+
+    home1.label = "Flat"
+    assert env.locations_by_label("Home") == [home2]
+    assert env.locations_by_label("Flat") == [home1]
+    assert env.actors_by_label("Flat") == [actors[0], actors[1]]
+    assert actors[0].neighbors(location_labels=["Flat"]) == [actors[1]]
+    assert actors[1].neighbors(location_labels=["Home"]) == []
+
+
+def test_relabel_location_with_class_label():
+    env, actors, _, _, school = _setup_env()
+
+    assert School.label == "school"
+    assert "__setattr__" not in vars(p2n.Location)
+    school.label = "college"
+    school.y = 1
+    assert vars(school)["label"] == "college"
+    assert env.locations_by_label("school") == []
+    assert env.locations_by_label("college") == [school]
+    assert actors[1].neighbors(location_labels=["college"]) == [actors[2]]
+    assert School().label == "school"
+
+
+def test_neighbors_and_update_weights_use_labels():
+    class WeightedSchool(School):
+        def weight(self, actor):
+            return 5
+
+    env, actors, _, _, school = _setup_env()
+    weighted = WeightedSchool()
+    env.add_location(weighted)
+    weighted.add_actor(actors[0], weight=1)
+    weighted.add_actor(actors[3], weight=1)
+
+    assert set(actors[1].neighbors(location_labels=["school"])) == {actors[2]}
+    assert set(actors[0].neighbors(location_labels=["school", "Home"])) == {actors[1], actors[3]}
+
+    env.update_weights(location_labels=["school"])
+    assert weighted.get_weight(actors[0]) == 5
+    assert school.get_weight(actors[1]) == 1
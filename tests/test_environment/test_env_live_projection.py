@@ -0,0 +1,171 @@
+import random
+
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 3
+
+    def weight(self, actor):
+        return actor.id_p2n % 3 + 1
+
+
+class School(p2n.LocationDesigner):
+    n_actors = 6
+
+
+class Club(p2n.Location):
+    def project_weights(self, actor1, actor2):
+        return self.get_weight(actor1) + self.get_weight(actor2)
+
+
+class Team(p2n.Location):
+    calls = 0
+
+    def project_weights(self, actor1, actor2):
+        return actor1.skill * actor2.skill
+
+    def project_weights_batch(self, actors, weights):  # noqa: ARG002
+        Team.calls += 1
+        skills = np.array([actor.skill for actor in actors])
+        return np.multiply.outer(skills, skills)
+
+
+def _assert_same_graph(live, exported):
+    assert set(live.nodes) == set(exported.nodes)
+    assert {frozenset(edge) for edge in live.edges} == {frozenset(edge) for edge in exported.edges}
+    for u, v, weight in exported.edges(data="weight"):
+        assert live[u][v]["weight"] == pytest.approx(weight)
+
+
+@pytest.fixture
+def env(backend, create_env):
+    env = create_env([Home, School], seed=3, backend=backend, live_projection=True)
+    for actor in env.actors:
+        actor.skill = actor.id_p2n % 5
+    club = Club()
+    team = Team()
+    env.add_locations([club, team])
+    club.add_actors(env.actors[:8], weight=2)
+    team.add_actors(env.actors[5:12])
+    return env
+
+
+def test_initial_projection(env):
+    _assert_same_graph(env.actor_network(), env.export_actor_network())
+
+
+def test_projection_follows_changes(env):
+    rng = random.Random(1)
+    for _ in range(20):
+        actors = env.actors
+        locations = env.locations
+        change = rng.randrange(7)
+        if change == 0:
+            location = rng.choice(locations)
+            candidates = [actor for actor in actors if actor not in location.actors]
+            if candidates:
+                location.add_actor(rng.choice(candidates), weight=rng.randint(0, 3))
+        elif change == 1:
+            location = rng.choice(locations)
+            if location.actors:
+                location.remove_actor(rng.choice(location.actors))
+        elif change == 2:
+            location = rng.choice(locations)
+            if location.actors:
+                location.set_weight(rng.choice(location.actors), rng.randint(0, 4))
+        elif change == 3:
+            env.remove_actor(rng.choice(actors))
+        elif change == 4:
+            actor = p2n.Actor()
+            actor.skill = 3
+            env.add_actor(actor)
+            rng.choice(locations).add_actor(actor)
+        elif change == 5:
+            env.remove_actors(rng.sample(list(actors), 2), defer=rng.random() < 0.5)
+        else:
+            location = rng.choice(locations)
+            members = location.actors
+            env.set_weights(members, [location] * len(members), rng.randint(1, 3))
+        _assert_same_graph(env.actor_network(), env.export_actor_network())
+
+
+def test_projection_follows_batch_changes(env):
+    actors = env.actors
+    school = env.locations_by_label("School")[0]
+    env.add_memberships(
+        [actor.id_p2n for actor in actors[:10]],
+        [school.id_p2n] * 10,
+        np.arange(10),
+    )
+    _assert_same_graph(env.actor_network(), env.export_actor_network())
+
+    env.remove_memberships([actor.id_p2n for actor in actors[:5]], [school.id_p2n] * 5)
+    _assert_same_graph(env.actor_network(), env.export_actor_network())
+
+    env.remove_location(school)
+    env.update_weights()
+    _assert_same_graph(env.actor_network(), env.export_actor_network())
+
+
+def test_projection_only_updates_changed_locations(env):
+    graph = env.actor_network()
+    team = next(location for location in env.locations if isinstance(location, Team))
+    Team.calls = 0
+
+    assert env.actor_network() is graph
+    assert Team.calls == 0
+
+    home = env.locations_by_label("Home")[0]
+    home.set_weight(home.actors[0], 5)
+    env.actor_network()
+    assert Team.calls == 0
+
+    team.set_weight(team.actors[0], 5)
+    env.actor_network()
+    assert Team.calls == 1
+
+
+def test_rebuild_and_zero_weights(env):
+    env.actor_network()
+    for actor in env.actors:
+        actor.skill += 1
+    with pytest.raises(AssertionError):
+        _assert_same_graph(env.actor_network(), env.export_actor_network())
+    _assert_same_graph(env.actor_network(rebuild=True), env.export_actor_network())
+
+    club = next(location for location in env.locations if isinstance(location, Club))
+    env.set_weights(club.actors, [club] * len(club.actors), 0)
+    _assert_same_graph(
+        env.actor_network(include_0_weights=False),
+        env.export_actor_network(include_0_weights=False),
+    )
+
+
+def test_live_projection_disabled():
+    env = p2n.Environment()
+    with pytest.raises(ValueError, match="live_projection=True"):
+        env.actor_network()
+
+
+def test_removing_contributions_leaves_no_residue(backend):
+    env = p2n.Environment(backend=backend, live_projection=True)
+    actors = [p2n.Actor(), p2n.Actor()]
+    locations = [p2n.Location() for _ in range(3)]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    locations[0].add_actors(actors, weight=0.1)
+    for _ in range(20):
+        for location, weight in zip(locations[1:], [0.2, 0.7]):
+            location.add_actors(actors, weight=weight)
+            env.actor_network()
+        for location in locations[1:]:
+            location.remove_actors(actors)
+            env.actor_network()
+
+    exported = env.export_actor_network()
+    assert list(env.actor_network().edges(data="weight")) == list(exported.edges(data="weight"))
+    assert env.actor_network()[actors[0].id_p2n][actors[1].id_p2n]["weight"] == 0.1
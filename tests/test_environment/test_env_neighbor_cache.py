@@ -0,0 +1,140 @@
+import random
+
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 3
+
+
+class School(p2n.LocationDesigner):
+    n_actors = 6
+
+
+def _neighbors(env, labels=None):
+    return {
+        actor.id_p2n: {n.id_p2n for n in actor.neighbors(location_labels=labels)}
+        for actor in env.actors
+    }
+
+
+def test_neighbor_cache_disabled_by_default(create_env):
+    env = create_env([Home, School], n_actors=24, seed=11)
+    assert env.neighbor_cache_info() is None
+
+
+def test_neighbor_cache_hits_and_misses(create_env):
+    env = create_env([Home, School], n_actors=24, seed=11, neighbor_cache=100)
+    actor = env.actors[0]
+    actor.neighbors()
+    actor.neighbors()
+    actor.neighbors(location_labels=["Home"])
+
+    info = env.neighbor_cache_info()
+    assert info["hits"] == 1
+    assert info["misses"] == 2
+    assert info["currsize"] == 2
+
+
+def test_neighbor_cache_returns_new_lists(create_env):
+    env = create_env([Home, School], n_actors=24, seed=11, neighbor_cache=100)
+    actor = env.actors[0]
+    neighbors = actor.neighbors()
+    neighbors.remove(neighbors[0])
+    assert len(actor.neighbors()) == len(neighbors) + 1
+
+
+def test_neighbor_cache_lru_eviction(create_env):
+    env = create_env([Home, School], n_actors=24, seed=11, neighbor_cache=2)
+    actor1, actor2, actor3 = env.actors[:3]
+    actor1.neighbors()
+    actor2.neighbors()
+    actor1.neighbors()
+    actor3.neighbors()
+
+    info = env.neighbor_cache_info()
+    assert info["evictions"] == 1
+    assert info["currsize"] == 2
+    actor1.neighbors()
+    assert env.neighbor_cache_info()["hits"] == 2
+    actor2.neighbors()
+    assert env.neighbor_cache_info()["hits"] == 2
+
+
+def test_neighbor_cache_invalidates_only_affected_actors(create_env):
+    env = create_env([Home, School], n_actors=24, seed=11, neighbor_cache=100)
+    location = env.locations_by_label("Home")[0]
+    members = list(location.actors)
+    others = [
+        actor
+        for actor in env.actors
+        if not set(actor.neighbors()) & set(members) and actor not in members
+    ]
+    newcomer = others[0]
+    bystander = next(actor for actor in others[1:] if actor not in newcomer.neighbors())
+    for actor in env.actors:
+        actor.neighbors()
+
+    count = env.mutation_count
+    location.add_actor(newcomer)
+    assert env.mutation_count == count + 1
+
+    hits = env.neighbor_cache_info()["hits"]
+    assert set(members) <= set(newcomer.neighbors())
+    assert newcomer in members[0].neighbors()
+    assert env.neighbor_cache_info()["hits"] == hits
+    assert newcomer not in bystander.neighbors()
+    assert env.neighbor_cache_info()["hits"] == hits + 1
+
+
+def test_neighbor_cache_matches_uncached(backend, create_env):
+    rng = random.Random(3)
+    env_cached = create_env(
+        [Home, School], n_actors=24, seed=11, backend=backend, neighbor_cache=50
+    )
+    env_plain = create_env([Home, School], n_actors=24, seed=11, backend=backend)
+
+    for step in range(40):
+        assert _neighbors(env_cached) == _neighbors(env_plain)
+        assert _neighbors(env_cached, ["School"]) == _neighbors(env_plain, ["School"])
+
+        i = rng.randrange(env_plain.n_actors)
+        j = rng.randrange(env_plain.n_locations)
+        operation = step % 6
+        for env in (env_cached, env_plain):
+            actor = env.actors[i % env.n_actors]
+            location = env.locations[j % env.n_locations]
+            if operation == 0:
+                location.add_actor(actor)
+            elif operation == 1 and actor in location.actors:
+                location.remove_actor(actor)
+            elif operation == 2:
+                location.label = "School" if location.label == "Home" else "Home"
+            elif operation == 3:
+                env.remove_actor(actor)
+            elif operation == 4:
+                env.add_memberships([actor.id_p2n], [location.id_p2n])
+            elif operation == 5:
+                env.remove_location(location)
+
+    assert env_cached.neighbor_cache_info()["hits"] > 0
+
+
+def test_neighbor_cache_stamps_are_bounded():
+    env = p2n.Environment(neighbor_cache=5)
+    actors = [p2n.Actor() for _ in range(40)]
+    locations = [p2n.Location() for _ in range(20)]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    for i, actor in enumerate(actors):
+        locations[i % 20].add_actor(actor)
+
+    cache = env._neighbor_cache
+    for i, actor in enumerate(actors):
+        actor.neighbors()
+        locations[(i + 7) % 20].add_actor(actors[(i + 13) % 40])
+        locations[(i + 3) % 20].remove_actor(actors[(i + 23) % 40])
+        assert len(cache._stamps) <= len(cache) <= 5
+    assert {key[0] for key in cache._entries} >= set(cache._stamps)
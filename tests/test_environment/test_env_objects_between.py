@@ -0,0 +1,78 @@
+import networkx as nx
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.Location):
+    pass
+
+
+class School(p2n.Location):
+    pass
+
+
+class Pupil(p2n.Actor):
+    pass
+
+
+def test_locations_between_actors_with_labels():
+    env = p2n.Environment()
+    actor1 = p2n.Actor()
+    actor2 = p2n.Actor()
+    actor3 = p2n.Actor()
+    env.add_actors([actor1, actor2, actor3])
+    home = Home()
+    school = School()
+    env.add_locations([home, school])
+    home.add_actors([actor1, actor2])
+    school.add_actors([actor1, actor2, actor3])
+
+    assert set(env.locations_between_actors(actor1, actor2)) == {home, school}
+    assert env.locations_between_actors(actor1, actor2, location_labels=["School"]) == [school]
+    assert env.locations_between_actors(actor1, actor3) == [school]
+    assert env.locations_between_actors(actor1, actor3, location_labels=["Home"]) == []
+    assert env.locations_between_actors(actor1, actor3, location_labels=["Work"]) == []
+    assert set(actor1.shared_locations(actor2, location_labels=["Home", "School"])) == {
+        home,
+        school,
+    }
+
+
+def test_actors_between_locations_with_types():
+    env = p2n.Environment()
+    actor = p2n.Actor()
+    pupil = Pupil()
+    env.add_actors([actor, pupil])
+    home = Home()
+    school = School()
+    env.add_locations([home, school])
+    home.add_actors([actor, pupil])
+    school.add_actors([actor, pupil])
+
+    assert set(env.actors_between_locations(home, school)) == {actor, pupil}
+    assert env.actors_between_locations(home, school, actor_types=["Pupil"]) == [pupil]
+
+    with pytest.raises(ValueError, match="identical"):
+        env.actors_between_locations(home, home)
+
+
+def test_intersection_matches_path_enumeration():
+    class Household(p2n.LocationDesigner):
+        n_actors = 3
+
+    class Classroom(p2n.LocationDesigner):
+        n_actors = 10
+
+    env = p2n.Environment()
+    creator = p2n.Creator(env=env, seed=3)
+    creator.create_actors(n=40)
+    creator.create_locations(location_designers=[Household, Classroom])
+
+    for actor1 in env.actors[:10]:
+        for actor2 in env.actors:
+            if actor1 is actor2:
+                continue
+            paths = nx.all_simple_paths(env.g, actor1.id_p2n, actor2.id_p2n, cutoff=2)
+            expected = {path[1] for path in paths}
+            assert {loc.id_p2n for loc in actor1.shared_locations(actor2)} == expected
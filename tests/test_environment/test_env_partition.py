@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pop2net as p2n
+
+
+class Household(p2n.Location):
+    pass
+
+
+class School(p2n.Location):
+    pass
+
+
+def build_env(backend, n_households=8, household_size=3, n_schools=2):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(n_households * household_size)]
+    for i, actor in enumerate(actors):
+        actor.number = i
+    households = [Household() for _ in range(n_households)]
+    schools = [School() for _ in range(n_schools)]
+    env.add_actors(actors)
+    env.add_locations(households + schools)
+    for i, actor in enumerate(actors):
+        households[i // household_size].add_actor(actor, weight=2)
+        schools[i % n_schools].add_actor(actor)
+    return env
+
+
+def test_components_are_kept_together(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(6)]
+    locations = [p2n.Location() for _ in range(3)]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    locations[0].add_actors(actors[:3])
+    locations[1].add_actors(actors[3:5])
+    locations[2].add_actors(actors[4:])
+
+    partition = env.partition(2)
+    assert partition.n_shards == 2
+    assert partition.actor_shards.tolist() == [0, 0, 0, 1, 1, 1]
+    assert partition.location_shards.tolist() == [0, 1, 1]
+    assert partition.edge_cut == 0
+    assert partition.weighted_edge_cut == 0
+    assert partition.boundary.empty
+    assert partition.balance == 1.0
+    assert partition.shard_of_actor(actors[4]) == 1
+    with pytest.raises(KeyError):
+        partition.shard_of_actor(-1)
+
+
+def test_large_components_are_split(backend):
+    env = build_env(backend)
+    partition = env.partition(4)
+
+    assert partition.shard_sizes.tolist() == [6, 6, 6, 6]
+    assert partition.balance == 1.0
+    assert partition.edge_cut == len(partition.boundary) > 0
+    boundary = partition.boundary
+    assert (boundary["actor_shard"] != boundary["location_shard"]).all()
+    assert set(boundary.columns) == {
+        "actor_id",
+        "location_id",
+        "weight",
+        "actor_shard",
+        "location_shard",
+    }
+    assert partition.weighted_edge_cut == boundary["weight"].sum()
+
+
+def test_keep_together(backend):
+    env = build_env(backend, household_size=3)
+    partition = env.partition(5, keep_together=["Household"])
+    household_shards = partition.actor_shards.reshape(-1, 3)
+    assert (household_shards == household_shards[:, :1]).all()
+    assert partition.shard_sizes.sum() == 24
+
+
+def test_shard_environments(backend):
+    env = build_env(backend)
+    partition = env.partition(2, keep_together=["Household"])
+
+    shard_actors = []
+    for shard, sub_env in enumerate(partition.shards):
+        assert sub_env.backend == backend
+        for actor in sub_env.actors:
+            assert actor.env is sub_env
+            assert actor is not env._actors[actor.id_p2n]
+            assert actor.number == env._actors[actor.id_p2n].number
+            assert partition.shard_of_actor(actor) == shard
+            for location in actor.locations:
+                assert location.env is sub_env
+                original = env._actors[actor.id_p2n]
+                assert sub_env.get_weight(actor, location) == env.get_weight(
+                    original, env._locations[location.id_p2n]
+                )
+        shard_actors.extend(actor.id_p2n for actor in sub_env.actors)
+    assert sorted(shard_actors) == sorted(env._actors)
+
+    # every membership is stored in the shard of its actor
+    n_memberships = sum(
+        len(actor.locations) for sub_env in partition.shards for actor in sub_env.actors
+    )
+    assert n_memberships == 48
+
+    new_actor = p2n.Actor()
+    partition.shards[0].add_actor(new_actor)
+    assert new_actor.id_p2n not in env._actors
+    assert env.n_actors == 24
+
+
+def test_shards_keep_int_weights_and_edge_attributes(backend):
+    env = build_env(backend)
+    actor, household = env.actors[0], env.locations[0]
+    env.add_actor_to_location(household, actor, weight=3, role="parent")
+    env.set_weight(env.actors[1], household, 0.5)
+    partition = env.partition(2, keep_together=["Household"])
+
+    def edges(env):
+        return {(u, v) if u < v else (v, u): data for u, v, data in env.g.edges(data=True)}
+
+    shard_edges = {}
+    for sub_env in partition.shards:
+        shard_edges.update(edges(sub_env))
+    assert shard_edges == edges(env)
+    sub_env = partition.shards[partition.shard_of_actor(actor)]
+    data = sub_env.g.edges[actor.id_p2n, household.id_p2n]
+    assert data["role"] == "parent"
+    if backend == "networkx":
+        assert type(data["weight"]) is int
+        assert type(shard_edges[env.actors[1].id_p2n, household.id_p2n]["weight"]) is float
+
+
+def test_columnar_actors_are_partitioned():
+    env = p2n.Environment()
+    p2n.Creator(env).create_actors(df=pd.DataFrame({"age": [0, 10, 20, 30]}), columnar=True)
+    partition = env.partition(2)
+    assert np.array_equal(partition.shard_sizes, [2, 2])
+    for sub_env in partition.shards:
+        assert "age" not in vars(sub_env.actors[0])
+        assert sub_env.actor_column("age").tolist() == [actor.age for actor in sub_env.actors]
+    ages = sorted(actor.age for sub_env in partition.shards for actor in sub_env.actors)
+    assert ages == [0, 10, 20, 30]
+
+    partition.shards[0].actors[0].age = 100
+    assert sorted(env.actor_column("age").tolist()) == [0, 10, 20, 30]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="n_shards"):
+        p2n.Environment().partition(0)
+    with pytest.raises(ValueError, match="framework"):
+        p2n.Environment(framework="mesa").partition(2)
+    partition = p2n.Environment().partition(3)
+    assert partition.shard_sizes.tolist() == [0, 0, 0]
+    assert all(shard.n_actors == 0 for shard in partition.shards)
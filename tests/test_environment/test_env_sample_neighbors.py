@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+class Pairwise(p2n.Location):
+    def project_weights(self, actor1, actor2):
+        return abs(actor1.age - actor2.age)
+
+
+class Batch(p2n.Location):
+    def project_weights(self, actor1, actor2):
+        return actor1.age + actor2.age
+
+    def project_weights_batch(self, actors, weights):
+        ages = np.array([actor.age for actor in actors], dtype=float)
+        return np.add.outer(ages, ages)
+
+
+@pytest.fixture
+def env(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(5)]
+    for age, actor in enumerate(actors):
+        actor.age = age
+    env.add_actors(actors)
+    home, work, team, club = p2n.Location(), p2n.Location(), Pairwise(), Batch()
+    home.label = "home"
+    work.label = "work"
+    env.add_locations([home, work, team, club])
+    home.add_actors(actors[:3], weight=2)
+    home.set_weight(actors[2], 1)
+    work.add_actors([actors[0], actors[3]], weight=0)
+    team.add_actors([actors[0], actors[1], actors[4]])
+    club.add_actors([actors[1], actors[2]])
+    return env
+
+
+def _check_frequencies(actor, draws):
+    env = actor.env
+    expected = np.zeros(env.n_actors)
+    for neighbor in actor.neighbors():
+        expected[env.actor_index(neighbor)] = max(actor.get_actor_weight(neighbor), 0)
+    if not expected.sum():
+        # all contacts of the actor have a weight of 0
+        assert (np.asarray(draws) == -1).all()
+        return
+    counts = np.bincount(draws, minlength=env.n_actors)
+    assert np.allclose(counts / counts.sum(), expected / expected.sum(), atol=0.02)
+
+
+def test_weighted_sampling_follows_contact_weights(env):
+    for actor in env.actors:
+        _check_frequencies(actor, env.actor_indices(actor.sample_neighbors(20_000, rng=1)))
+    assert env.actors[3].sample_neighbors(5) == []
+
+
+def test_bulk_sampling_follows_contact_weights(env):
+    # few actors use single tables, all actors use the table of the whole population
+    for actors in [env.actors[:1], None]:
+        drawn = env.sample_neighbors_bulk(actors, 20_000, rng=2)
+        for actor, draws in zip(actors or env.actors, drawn):
+            _check_frequencies(actor, draws)
+
+
+def test_unweighted_sampling(env):
+    actor = env.actors[0]
+    drawn = env.sample_neighbors_bulk([actor], 9_000, weighted=False, rng=3)[0]
+    assert set(drawn.tolist()) == {1, 2, 3, 4}
+    assert np.allclose(np.bincount(drawn)[1:] / len(drawn), 0.25, atol=0.02)
+    assert set(actor.sample_neighbors(1_000, weighted=False, rng=3)) == set(actor.neighbors())
+
+
+def test_location_labels(env):
+    actor = env.actors[0]
+    assert set(actor.sample_neighbors(100, location_labels=["home"], rng=4)) == set(env.actors[1:3])
+    # all contacts at work have a weight of 0
+    assert actor.sample_neighbors(10, location_labels=["work"]) == []
+    drawn = env.sample_neighbors_bulk(None, 3, location_labels=["work"], weighted=False, rng=4)
+    assert drawn[:, 0].tolist() == [3, -1, -1, 0, -1]
+
+
+def test_seeds_are_reproducible(env):
+    actor = env.actors[1]
+    assert actor.sample_neighbors(50, rng=5) == actor.sample_neighbors(50, rng=5)
+    first = env.sample_neighbors_bulk(None, 10, rng=np.random.default_rng(6))
+    second = env.sample_neighbors_bulk(None, 10, rng=np.random.default_rng(6))
+    assert np.array_equal(first, second)
+
+
+def test_tables_are_invalidated(env):
+    actor, other = env.actors[0], env.actors[3]
+    home, work = env.locations[:2]
+    env.sample_neighbors_bulk(None, 1)
+    assert other not in actor.sample_neighbors(100)
+
+    work.set_weight(other, 5)
+    work.set_weight(actor, 5)
+    assert other in actor.sample_neighbors(100, location_labels=["work"])
+
+    env.set_weights([actor], [work], [0])
+    assert actor.sample_neighbors(100, location_labels=["work"]) == []
+
+    env.remove_actor(env.actors[1])
+    env.remove_actor(env.actors[1])
+    assert set(actor.sample_neighbors(100, weighted=False)) == {other, env.actors[-1]}
+    assert env.sample_neighbors_bulk(None, 1, location_labels=["home"])[:, 0].tolist() == [
+        -1,
+        -1,
+        -1,
+    ]
+
+    home.add_actor(other)
+    assert actor.sample_neighbors(5, location_labels=["home"]) == [other] * 5
+
+
+def test_deferred_removal():
+    env = p2n.Environment(backend="sparse")
+    actors = [p2n.Actor() for _ in range(4)]
+    location = p2n.Location()
+    env.add_actors(actors)
+    env.add_location(location)
+    location.add_actors(actors)
+    env.remove_actors(actors[:2], defer=True)
+    assert env.sample_neighbors_bulk(None, 4, rng=7).tolist() == [[1] * 4, [0] * 4]
+
+
+def test_errors_and_empty_draws(env):
+    lonely = p2n.Actor()
+    with pytest.raises(Exception, match="does not exist"):
+        env.sample_neighbors(lonely, 1)
+    env.add_actor(lonely)
+    assert lonely.sample_neighbors(3) == []
+    assert env.sample_neighbors_bulk([lonely], 2).tolist() == [[-1, -1]]
+    assert env.sample_neighbors_bulk([], 2).shape == (0, 2)
+    with pytest.raises(Exception, match="does not exist"):
+        env.sample_neighbors_bulk([p2n.Actor()], 1)
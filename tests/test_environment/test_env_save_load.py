@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pop2net as p2n
+
+
+class Person(p2n.Actor):
+    def greet(self):
+        return f"Hi, I am {self.name}"
+
+
+class Home(p2n.Location):
+    def weight(self, actor):
+        return actor.age / 10
+
+
+class Flat(p2n.CompactLocation):
+    __slots__ = ("floor",)
+
+
+class Pet(p2n.CompactActor):
+    __slots__ = ()
+
+
+def _create_env(backend):
+    env = p2n.Environment(backend=backend, weight_cache=10)
+    actors = [Person() for _ in range(6)]
+    for i, actor in enumerate(actors):
+        actor.age = i * 10
+        actor.name = f"person{i}"
+        actor.income = 1000.5 * i
+        actor.student = i % 2 == 0
+        actor.partner = None if i % 3 else i + 1
+        if i < 3:
+            actor.nickname = f"p{i}"
+    pet = Pet()
+    homes = [Home(), Home()]
+    homes[1].label = "Second Home"
+    flat = Flat()
+    flat.floor = 3
+    env.add_actors([*actors, pet])
+    env.add_locations([*homes, flat])
+    homes[0].add_actors(actors[:4])
+    homes[1].add_actors(actors[3:])
+    flat.add_actors([actors[0], pet], weight=2)
+    return env
+
+
+def _memberships(env):
+    return sorted(
+        (actor.id_p2n, location.id_p2n, location.get_weight(actor))
+        for location in env.locations
+        for actor in location.actors
+    )
+
+
+def test_save_and_load(backend, tmp_path):
+    env = _create_env(backend)
+    path = tmp_path / "env.npz"
+    env.save(path)
+    loaded = p2n.Environment.load(path)
+
+    assert loaded.backend == backend
+    assert loaded.weight_cache_info()["maxsize"] == 10
+    assert [actor.id_p2n for actor in loaded.actors] == [actor.id_p2n for actor in env.actors]
+    assert _memberships(loaded) == _memberships(env)
+    for original, restored in zip(env.actors, loaded.actors):
+        assert type(restored) is type(original)
+        assert restored.env is loaded
+        if isinstance(original, Person):
+            assert vars(restored).keys() == vars(original).keys()
+            for name, value in vars(original).items():
+                if name != "env":
+                    assert getattr(restored, name) == value
+                    assert type(getattr(restored, name)) is type(value)
+    assert loaded.actors[0].greet() == "Hi, I am person0"
+    assert not hasattr(loaded.actors[5], "nickname")
+
+    assert [location.label for location in loaded.locations] == ["Home", "Second Home", "Flat"]
+    assert loaded.locations_by_label("Second Home") == [loaded.locations[1]]
+    assert loaded.locations[2].floor == 3
+    assert not hasattr(loaded.locations[2], "__dict__")
+
+    nx_original = env.export_actor_network()
+    nx_loaded = loaded.export_actor_network()
+    assert sorted(nx_loaded.edges(data="weight")) == sorted(nx_original.edges(data="weight"))
+
+    new_actor = p2n.Actor()
+    loaded.add_actor(new_actor)
+    assert new_actor.id_p2n not in {actor.id_p2n for actor in env.actors}
+
+
+def test_edge_attributes_and_int_weights(backend, tmp_path):
+    env = _create_env(backend)
+    actor, home = env.actors[1], env.locations[1]
+    env.add_actor_to_location(home, actor, weight=2, role="teacher")
+    env.add_actor_to_location(env.locations[2], env.actors[2], weight=None, note=None)
+    path = tmp_path / "env.npz"
+    env.save(path)
+    loaded = p2n.Environment.load(path)
+
+    def edges(env):
+        return sorted(env.g.edges(data=True), key=lambda edge: (edge[0], edge[1]))
+
+    assert edges(loaded) == edges(env)
+    data = loaded.g.edges[actor.id_p2n, home.id_p2n]
+    assert data["role"] == "teacher"
+    assert "note" in loaded.g.edges[env.actors[2].id_p2n, env.locations[2].id_p2n]
+    assert "role" not in loaded.g.edges[env.actors[0].id_p2n, env.locations[2].id_p2n]
+    if backend == "networkx":
+        assert type(data["weight"]) is int
+        assert type(loaded.get_weight(env.actors[0], env.locations[2])) is int
+        assert type(loaded.get_weight(env.actors[0], env.locations[0])) is float
+
+
+def test_save_compressed_and_removed_objects(tmp_path):
+    env = _create_env("sparse")
+    env.remove_actors(env.actors[:2], defer=True)
+    env.save(tmp_path / "env", compress=True)
+    loaded = p2n.Environment.load(tmp_path / "env.npz")
+    assert loaded.n_actors == env.n_actors
+    assert _memberships(loaded) == _memberships(env)
+
+
+def test_load_model_and_updated_weights(tmp_path):
+    env = _create_env("networkx")
+    env.save(tmp_path / "env.npz")
+    model = object()
+    loaded = p2n.Environment.load(tmp_path / "env.npz", model=model)
+    assert loaded.model is model
+    assert all(obj.model is model for obj in [*loaded.actors, *loaded.locations])
+
+    loaded.update_weights(location_labels=["Home"])
+    home = loaded.locations[0]
+    assert [home.get_weight(actor) for actor in home.actors] == [0, 1, 2, 3]
+
+
+def test_classes_that_cannot_be_imported(tmp_path):
+    class LocalActor(p2n.Actor):
+        pass
+
+    env = p2n.Environment()
+    env.add_actor(LocalActor())
+    env.save(tmp_path / "env.npz")
+
+    with pytest.warns(UserWarning, match="restored as pop2net.actor:Actor"):
+        loaded = p2n.Environment.load(tmp_path / "env.npz")
+    assert type(loaded.actors[0]) is p2n.Actor
+    assert loaded.actors[0].type == "LocalActor"
+
+    loaded = p2n.Environment.load(
+        tmp_path / "env.npz",
+        classes={"test_classes_that_cannot_be_imported.<locals>.LocalActor": LocalActor},
+    )
+    assert type(loaded.actors[0]) is LocalActor
+
+
+def test_creator_population(tmp_path):
+    class School(p2n.LocationDesigner):
+        n_actors = 3
+
+    env = p2n.Environment(enable_p2n_warnings=False)
+    creator = p2n.Creator(env=env, seed=2)
+    creator.create_actors(df=pd.DataFrame({"age": range(9)}))
+    creator.create_locations(location_designers=[School])
+    env.save(tmp_path / "env.npz")
+
+    loaded = p2n.Environment.load(tmp_path / "env.npz")
+    assert _memberships(loaded) == _memberships(env)
+    assert [location.label for location in loaded.locations] == ["School"] * 3
+    assert [location.group_id for location in loaded.locations] == [0, 1, 2]
+
+
+def test_object_attributes_need_pickle(tmp_path):
+    env = p2n.Environment()
+    actor = p2n.Actor()
+    actor.friends = [1, 2]
+    actor.values = np.arange(2)
+    env.add_actor(actor)
+    env.save(tmp_path / "env.npz")
+
+    with pytest.raises(ValueError, match="allow_pickle"):
+        p2n.Environment.load(tmp_path / "env.npz")
+    loaded = p2n.Environment.load(tmp_path / "env.npz", allow_pickle=True)
+    assert loaded.actors[0].friends == [1, 2]
+    assert loaded.actors[0].values.tolist() == [0, 1]
+
+
+def test_save_with_framework(tmp_path):
+    env = p2n.Environment(framework="mesa")
+    with pytest.raises(ValueError, match="without a framework"):
+        env.save(tmp_path / "env.npz")
+
+
+def test_add_actors_and_locations_in_batch(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(3)]
+    env.add_actors(actors)
+    assert [actor.id_p2n for actor in env.actors] == [0, 1, 2]
+    assert env.actor_indices(actors).tolist() == [0, 1, 2]
+
+    with pytest.raises(ValueError, match="already has an entity"):
+        env.add_actors([p2n.Actor(), actors[0]])
+    assert env.n_actors == 3
+    actors.extend([p2n.Actor(), p2n.Actor()])
+    env.add_actors(actors[3:])
+    assert env.actor_indices(actors[3:]).tolist() == [3, 4]
+
+    locations = [p2n.Location(), p2n.Location()]
+    env.add_locations(iter(locations))
+    assert env.locations_by_label("Location") == locations
+    assert all(location.env is env for location in locations)
+    locations[0].add_actors(actors)
+    assert len(actors[0].neighbors()) == 4
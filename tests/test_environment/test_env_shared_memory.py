@@ -0,0 +1,114 @@
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+_shared = None
+
+
+def _attach(shared):
+    global _shared
+    _shared = shared
+
+
+def _neighbor_ages(index):
+    ages = _shared.actor_attribute("age")
+    return ages[_shared.neighbor_indices(index)].tolist()
+
+
+@pytest.fixture
+def env(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(5)]
+    locations = [p2n.Location(), p2n.Location()]
+    locations[0].label = "home"
+    for i, actor in enumerate(actors):
+        actor.age = 10 * i
+        actor.name = f"actor {i}"
+    env.add_actors(actors)
+    env.add_locations(locations)
+    locations[0].add_actors(actors[:3], weight=2)
+    locations[1].add_actors(actors[2:])
+    return env
+
+
+def test_shared_environment_matches_frozen_environment(env):
+    frozen = env.freeze()
+    actors, locations = env.actors, env.locations
+    with env.to_shared_memory(attributes=["age"]) as shared:
+        assert isinstance(shared, p2n.FrozenEnvironment)
+        assert shared.actors == frozen.actors
+        assert shared.location_labels == frozen.location_labels
+        for index in range(5):
+            assert (
+                shared.neighbor_indices(index).tolist() == frozen.neighbor_indices(index).tolist()
+            )
+        assert shared.neighbors_of_actor(actors[2], location_labels=["home"]) == tuple(actors[:2])
+        assert shared.locations_of_actor(actors[2]) == tuple(locations)
+        assert shared.get_weight(actors[1], locations[0]) == 2
+        assert shared.actor_index(actors[4].id_p2n) == 4
+        assert shared.actor_attribute("age").tolist() == [0, 10, 20, 30, 40]
+        assert shared.attribute_names == ["age"]
+        with pytest.raises(KeyError):
+            shared.actor_index(-1)
+        with pytest.raises(KeyError, match="not shared"):
+            shared.actor_attribute("name")
+
+
+def test_attach_without_copying(env):
+    with env.to_shared_memory(attributes=["age"]) as shared:
+        assert len(pickle.dumps(shared)) < 200
+        worker = pickle.loads(pickle.dumps(shared))
+        attached = p2n.SharedEnvironment.attach(shared.name)
+        for other in [worker, attached]:
+            assert other.location_actors.base is not None
+            assert not other.location_actors.flags.writeable
+            assert other.neighbor_indices(0).tolist() == [1, 2]
+            assert other.location_index(env.locations[1]) == 1
+            assert other.mutation_count == shared.mutation_count
+            with pytest.raises(ValueError, match="not pickled"):
+                _ = other.actors
+            other.close()
+
+
+def test_shared_environment_in_worker_processes(env):
+    with env.to_shared_memory(attributes=["age"]) as shared:
+        with ProcessPoolExecutor(max_workers=2, initializer=_attach, initargs=(shared,)) as pool:
+            ages = list(pool.map(_neighbor_ages, range(5)))
+    assert ages == [[10, 20], [0, 20], [0, 10, 30, 40], [20, 40], [20, 30]]
+
+
+def test_worker_process_does_not_remove_the_block(env):
+    code = (
+        "import sys\n"
+        "import pop2net as p2n\n"
+        "shared = p2n.SharedEnvironment.attach(sys.argv[1])\n"
+        "print(shared.neighbor_indices(0).tolist())\n"
+        "shared.close()\n"
+    )
+    with env.to_shared_memory() as shared:
+        result = subprocess.run(
+            [sys.executable, "-c", code, shared.name], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "[1, 2]"
+        assert "leaked" not in result.stderr
+        # the block still exists after the worker exited
+        attached = p2n.SharedEnvironment.attach(shared.name)
+        assert attached.neighbor_indices(0).tolist() == [1, 2]
+        attached.close()
+
+
+def test_non_numeric_attribute(env):
+    with pytest.raises(ValueError, match="not numeric"):
+        env.to_shared_memory(attributes=["name"])
+
+
+def test_empty_environment():
+    with p2n.Environment().to_shared_memory() as shared:
+        assert shared.n_actors == 0
+        assert np.array_equal(shared.location_indptr, [0])
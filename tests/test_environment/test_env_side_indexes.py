@@ -0,0 +1,55 @@
+import pop2net as p2n
+
+
+def test_actors_and_locations_keep_insertion_order():
+    env = p2n.Environment()
+    actor1 = p2n.Actor()
+    location1 = p2n.Location()
+    actor2 = p2n.Actor()
+    location2 = p2n.Location()
+
+    env.add_actor(actor1)
+    env.add_location(location1)
+    env.add_actor(actor2)
+    env.add_location(location2)
+
+    assert env.actors == [actor1, actor2]
+    assert env.locations == [location1, location2]
+    assert env.n_actors == 2
+    assert env.n_locations == 2
+
+
+def test_side_indexes_after_removal():
+    env = p2n.Environment()
+    actors = [p2n.Actor() for _ in range(3)]
+    locations = [p2n.Location() for _ in range(2)]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    locations[0].add_actors(actors)
+
+    env.remove_actor(actors[1])
+    env.remove_location(locations[0])
+
+    assert env.actors == [actors[0], actors[2]]
+    assert env.locations == [locations[1]]
+    assert env.n_actors == 2
+    assert env.n_locations == 1
+    assert actors[0].locations == []
+
+    # removing twice does nothing
+    env.remove_actors([actors[1], actors[2]])
+    assert env.actors == [actors[0]]
+    assert env.n_actors == 1
+
+
+def test_n_actors_and_n_locations_with_creator():
+    class Home(p2n.LocationDesigner):
+        n_actors = 2
+
+    env = p2n.Environment()
+    creator = p2n.Creator(env=env)
+    creator.create_actors(n=10)
+    creator.create_locations(location_designers=[Home])
+
+    assert env.n_actors == len(env.actors) == 10
+    assert env.n_locations == len(env.locations) == 5
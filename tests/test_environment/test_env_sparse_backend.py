@@ -0,0 +1,120 @@
+import networkx as nx
+import pytest
+
+import pop2net as p2n
+from pop2net.backends import SparseBackend
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 3
+
+    def weight(self, actor):
+        return actor.id_p2n % 3 + 1
+
+
+class School(p2n.LocationDesigner):
+    n_actors = 8
+
+
+def _ids(objects):
+    return {obj.id_p2n for obj in objects}
+
+
+@pytest.fixture
+def small_rebuild_threshold(monkeypatch):
+    monkeypatch.setattr(SparseBackend, "rebuild_threshold", 3)
+
+
+def _assert_same_network(env_nx, env_sp):
+    assert [a.id_p2n for a in env_nx.actors] == [a.id_p2n for a in env_sp.actors]
+    assert [loc.id_p2n for loc in env_nx.locations] == [loc.id_p2n for loc in env_sp.locations]
+
+    actors_sp = {a.id_p2n: a for a in env_sp.actors}
+    locations_sp = {loc.id_p2n: loc for loc in env_sp.locations}
+    for actor in env_nx.actors:
+        other = actors_sp[actor.id_p2n]
+        assert _ids(actor.locations) == _ids(other.locations)
+        assert _ids(actor.neighbors()) == _ids(other.neighbors())
+        assert _ids(actor.neighbors(location_labels=["Home"])) == _ids(
+            other.neighbors(location_labels=["Home"])
+        )
+        for location in actor.locations:
+            assert actor.get_location_weight(location) == other.get_location_weight(
+                locations_sp[location.id_p2n]
+            )
+    for location in env_nx.locations:
+        assert _ids(location.actors) == _ids(locations_sp[location.id_p2n].actors)
+
+    assert sorted(env_nx.export_actor_network().edges(data="weight")) == sorted(
+        env_sp.export_actor_network().edges(data="weight")
+    )
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError, match="Invalid backend"):
+        p2n.Environment(backend="dense")
+
+
+@pytest.mark.usefixtures("small_rebuild_threshold")
+def test_sparse_backend_matches_networkx(create_env):
+    env_nx = create_env([Home, School], seed=7, backend="networkx")
+    env_sp = create_env([Home, School], seed=7, backend="sparse")
+    _assert_same_network(env_nx, env_sp)
+
+
+@pytest.mark.usefixtures("small_rebuild_threshold")
+def test_sparse_backend_mutations(create_env):
+    env_nx = create_env([Home, School], seed=7, backend="networkx")
+    env_sp = create_env([Home, School], seed=7, backend="sparse")
+
+    for env in (env_nx, env_sp):
+        actors = env.actors
+        locations = env.locations
+        env.remove_actor(actors[0])
+        env.remove_location(locations[1])
+        locations[0].remove_actor(actors[1])
+        locations[-1].add_actor(actors[1], weight=2.5)
+        locations[-1].add_actor(actors[2])
+        locations[-1].set_weight(actors[2], 4)
+        env.update_weights(location_labels=["Home"])
+
+    _assert_same_network(env_nx, env_sp)
+    assert env_sp._backend.number_of_edges() == env_nx.g.number_of_edges()
+
+
+def test_sparse_backend_materialises_read_only_graph():
+    env = p2n.Environment(backend="sparse")
+    actor1 = p2n.Actor()
+    actor2 = p2n.Actor()
+    location = p2n.Location()
+    env.add_actors([actor1, actor2])
+    env.add_location(location)
+    location.add_actor(actor1, weight=3)
+
+    graph = env.g
+    assert graph is env.g
+    assert graph.nodes[actor1.id_p2n]["bipartite"] == 0
+    assert graph.nodes[location.id_p2n]["_obj"] is location
+    assert graph[actor1.id_p2n][location.id_p2n]["weight"] == 3
+    with pytest.raises(nx.NetworkXError):
+        graph.add_edge(actor2.id_p2n, location.id_p2n)
+
+    location.add_actor(actor2)
+    assert env.g is not graph
+    assert env.g.has_edge(actor2.id_p2n, location.id_p2n)
+
+    bipartite = env.export_bipartite_network()
+    assert "_obj" not in bipartite.nodes[actor1.id_p2n]
+    assert env.g.nodes[actor1.id_p2n]["_obj"] is actor1
+
+
+def test_sparse_backend_edge_attributes():
+    env = p2n.Environment(backend="sparse")
+    actor = p2n.Actor()
+    location = p2n.Location()
+    env.add_actor(actor)
+    env.add_location(location)
+    env.add_actor_to_location(location, actor, weight=2, role="teacher")
+
+    assert location.get_weight(actor) == 2
+    assert env.g[actor.id_p2n][location.id_p2n] == {"role": "teacher", "weight": 2}
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.LocationDesigner):
+    n_actors = 3
+
+    def weight(self, actor):
+        return actor.id_p2n % 4 + 1
+
+
+class School(p2n.LocationDesigner):
+    n_actors = 8
+
+
+@pytest.fixture
+def env(backend, create_env):
+    return create_env([Home, School], n_actors=24, seed=4, backend=backend, weight_cache=100)
+
+
+def _objects(env, actor_ids, location_ids):
+    actors = {actor.id_p2n: actor for actor in env.actors}
+    locations = {location.id_p2n: location for location in env.locations}
+    return [actors[i] for i in actor_ids], [locations[i] for i in location_ids]
+
+
+def test_weights_by_label(env):
+    actor_ids, location_ids, weights = env.weights_by_label("Home")
+    assert len(actor_ids) == len(location_ids) == len(weights) == 24
+    actors, locations = _objects(env, actor_ids, location_ids)
+    assert weights.tolist() == [loc.get_weight(a) for a, loc in zip(actors, locations)]
+    assert all(location.label == "Home" for location in locations)
+
+    assert [len(array) for array in env.weights_by_label("Work")] == [0, 0, 0]
+    empty = p2n.Location()
+    empty.label = "Empty"
+    env.add_location(empty)
+    assert [len(array) for array in env.weights_by_label("Empty")] == [0, 0, 0]
+
+
+def test_get_and_set_weights(env):
+    actor_ids, location_ids, weights = env.weights_by_label("School")
+    actors, locations = _objects(env, actor_ids, location_ids)
+
+    env.set_weights(actors, locations, weights * 2 + np.arange(len(weights)))
+    expected = [2 + i for i in range(len(weights))]
+    assert env.get_weights(actors, locations).tolist() == expected
+    assert [loc.get_weight(a) for a, loc in zip(actors, locations)] == expected
+
+    env.set_weights(actors, locations, 3)
+    assert env.get_weights(actors, locations).tolist() == [3] * len(actors)
+
+    env.set_weights(actors, locations)
+    assert env.get_weights(actors, locations).tolist() == [1] * len(actors)
+
+
+def test_set_weights_invalidates_weight_cache(env):
+    actor1 = env.actors[0]
+    school = next(loc for loc in actor1.locations if loc.label == "School")
+    actor2 = next(actor for actor in school.actors if actor is not actor1)
+    weight = actor1.get_actor_weight(actor2)
+
+    env.set_weights([actor1, actor2], [school, school], [1, 1])
+    assert actor1.get_actor_weight(actor2) == weight
+    assert env.weight_cache_info()["hits"] == 1
+
+    env.set_weights([actor1, actor2], [school, school], [5, 7])
+    assert actor1.get_actor_weight(actor2) == weight - 1 + 5
+    assert env.weight_cache_info()["hits"] == 1
+
+
+def test_weight_arrays_errors(env):
+    actor = env.actors[0]
+    location = next(loc for loc in env.locations if actor not in loc.actors)
+    with pytest.raises(KeyError):
+        env.get_weights([actor], [location])
+    with pytest.raises(KeyError):
+        env.set_weights([actor], [location], [2])
+    with pytest.raises(ValueError, match="same length"):
+        env.get_weights([actor], [])
+    with pytest.raises(ValueError, match="same length"):
+        env.set_weights([actor], [location], [1, 2])
+
+
+def test_weights_by_label_after_changes(env):
+    new_home = p2n.Location()
+    new_home.label = "Home"
+    env.add_location(new_home)
+    removed = env.actors[:2]
+    env.remove_actors(removed, defer=True)
+    new_home.add_actor(env.actors[0], weight=9)
+
+    actor_ids, location_ids, weights = env.weights_by_label("Home")
+    assert not {actor.id_p2n for actor in removed} & set(actor_ids.tolist())
+    assert (env.actors[0].id_p2n, new_home.id_p2n, 9) in set(
+        zip(actor_ids.tolist(), location_ids.tolist(), weights.tolist())
+    )
+
+
+def test_bulk_lookups_of_the_sparse_backend_do_not_rebuild(monkeypatch):
+    env = p2n.Environment(backend="sparse")
+    actors = [p2n.Actor() for _ in range(4)]
+    locations = [p2n.Location() for _ in range(2)]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    env.add_memberships([actor.id_p2n for actor in actors], [locations[0].id_p2n] * 4, 2)
+    backend = env._backend
+    backend.get_weights(np.array([actors[0].id_p2n]), np.array([locations[0].id_p2n]))
+    keys = backend._csr_keys
+
+    # a pending membership next to indexed ones
+    locations[1].add_actor(actors[0], weight=5)
+    rebuilds = []
+    monkeypatch.setattr(type(backend), "rebuild", lambda self: rebuilds.append(self))
+    pairs = [(actors[0], locations[0]), (actors[1], locations[0]), (actors[0], locations[1])]
+    weights = env.get_weights([actor for actor, _ in pairs], [location for _, location in pairs])
+    assert weights.tolist() == [2, 2, 5]
+    env.set_weights([actors[0], actors[1]], [locations[1], locations[0]], [6, 7])
+    assert env.get_weight(actors[0], locations[1]) == 6
+    assert env.get_weight(actors[1], locations[0]) == 7
+    assert backend._csr_keys is keys
+
+    summary = env.remove_memberships([actors[0].id_p2n], [locations[1].id_p2n])
+    assert summary["removed"] == 1
+    assert not backend.has_edge(actors[0].id_p2n, locations[1].id_p2n)
+    assert list(locations[1].actors) == []
+    assert rebuilds == []
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+import pop2net as p2n
+
+
+class Home(p2n.Location):
+    def weight(self, actor):
+        return actor.id_p2n % 3 + 1
+
+
+class School(p2n.Location):
+    def project_weights(self, actor1, actor2):
+        return self.get_weight(actor1) + self.get_weight(actor2)
+
+
+def _create_env(backend="networkx", weight_cache=None):
+    env = p2n.Environment(backend=backend, weight_cache=weight_cache)
+    actors = [p2n.Actor() for _ in range(4)]
+    env.add_actors(actors)
+    home = Home()
+    school = School()
+    other_school = School()
+    env.add_locations([home, school, other_school])
+    home.add_actors(actors[:2])
+    school.add_actors(actors[:3])
+    other_school.add_actors(actors[2:])
+    return env, actors, home, school, other_school
+
+
+def test_weight_cache_disabled_by_default():
+    env, *_ = _create_env()
+    assert env.weight_cache_info() is None
+
+
+def test_weight_cache_survives_unchanged_weights():
+    env, actors, home, school, _ = _create_env(weight_cache=100)
+    weight = actors[0].get_actor_weight(actors[1])
+    assert actors[0].get_actor_weight(actors[1]) == weight
+    assert env.weight_cache_info()["hits"] == 1
+
+    env.update_weights()
+    home.set_weight(actors[0], home.get_weight(actors[0]))
+    assert actors[0].get_actor_weight(actors[1]) == weight
+    assert env.weight_cache_info()["hits"] == 2
+
+
+def test_weight_cache_invalidated_by_weight_change():
+    env, actors, home, school, other_school = _create_env(weight_cache=100)
+    actors[0].get_actor_weight(actors[1])
+    actors[2].get_actor_weight(actors[3])
+
+    school.set_weight(actors[0], 10)
+    assert actors[0].get_actor_weight(actors[1]) == 1 + 10 + 1
+    assert env.weight_cache_info()["hits"] == 0
+
+    actors[2].get_actor_weight(actors[3])
+    assert env.weight_cache_info()["hits"] == 1
+
+
+def test_weight_cache_invalidated_by_memberships():
+    env, actors, home, school, other_school = _create_env(weight_cache=100)
+    assert actors[0].get_actor_weight(actors[3]) == 0
+    other_school.add_actor(actors[0])
+    assert actors[0].get_actor_weight(actors[3]) == 2
+    school.remove_actor(actors[0])
+    assert actors[0].get_actor_weight(actors[1]) == 1
+    assert env.weight_cache_info()["hits"] == 0
+
+
+def test_weight_cache_cleared_by_structural_edits():
+    env, actors, home, school, other_school = _create_env(weight_cache=100)
+    actors[0].get_actor_weight(actors[1])
+    env.remove_location(home)
+    assert env.weight_cache_info()["currsize"] == 0
+    assert actors[0].get_actor_weight(actors[1]) == 2
+
+    actors[0].get_actor_weight(actors[2], location_labels=["Home"])
+    school.label = "Home"
+    assert actors[0].get_actor_weight(actors[2], location_labels=["Home"]) == 2
+
+    env.clear_weight_cache()
+    assert env.weight_cache_info()["currsize"] == 0
+
+
+def test_weight_cache_lru_eviction():
+    env, actors, *_ = _create_env(weight_cache=2)
+    actors[0].get_actor_weight(actors[1])
+    actors[0].get_actor_weight(actors[2])
+    actors[0].get_actor_weight(actors[3])
+    info = env.weight_cache_info()
+    assert info["evictions"] == 1
+    assert info["currsize"] == 2
+    assert not env._weight_cache._by_actor.get(actors[1].id_p2n)
+
+
+def test_weight_cache_matches_uncached(backend):
+    rng = random.Random(8)
+    env_cached, *_ = _create_env(backend=backend, weight_cache=20)
+    env_plain, *_ = _create_env(backend=backend)
+
+    def weights(env):
+        return [
+            actor1.get_actor_weight(actor2, location_labels=labels)
+            for actor1 in env.actors
+            for actor2 in env.actors
+            for labels in (None, ["School"])
+            if actor1 is not actor2
+        ]
+
+    for step in range(60):
+        assert weights(env_cached) == weights(env_plain)
+        i = rng.randrange(env_plain.n_actors)
+        j = rng.randrange(env_plain.n_locations)
+        weight = rng.choice([1, 2, 5])
+        for env in (env_cached, env_plain):
+            actor = env.actors[i]
+            location = env.locations[j]
+            if step % 3 == 0:
+                location.add_actor(actor, weight=weight)
+            elif step % 3 == 1 and actor in location.actors:
+                location.set_weight(actor, weight)
+            elif actor in location.actors:
+                location.remove_actor(actor)
+
+    assert env_cached.weight_cache_info()["hits"] > 0
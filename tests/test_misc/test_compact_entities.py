@@ -0,0 +1,77 @@
+import pytest
+
+import pop2net as p2n
+
+
+class Person(p2n.CompactActor):
+    __slots__ = ("age",)
+
+
+class Home(p2n.CompactLocation):
+    __slots__ = ()
+
+
+class School(p2n.CompactLocation):
+    __slots__ = ()
+    label = "school"
+
+
+def test_compact_entities_have_no_instance_dict():
+    for obj in [p2n.CompactActor(), p2n.CompactLocation(), Person(), Home(), School()]:
+        assert not hasattr(obj, "__dict__")
+        assert obj.env is None
+        assert obj.id_p2n is None
+        assert obj.model is None
+
+
+def test_per_class_type_and_label():
+    assert p2n.CompactActor().type == "CompactActor"
+    assert Person().type == "Person"
+    assert Home().type == "Home"
+    assert Home().label == "Home"
+    assert School().type == "School"
+    assert School().label == "school"
+    assert p2n.CompactLocation().label == "CompactLocation"
+
+    with pytest.raises(AttributeError):
+        Home().label = "other"
+    with pytest.raises(AttributeError):
+        Person().income = 100
+
+
+def test_compact_entities_in_environment(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [Person() for _ in range(4)]
+    for i, actor in enumerate(actors):
+        actor.age = i
+    home = Home()
+    school = School()
+    env.add_actors(actors)
+    env.add_locations([home, school])
+    home.add_actors(actors[:2])
+    school.add_actors(actors[1:], weight=2)
+
+    assert env.locations_by_label("school") == [school]
+    assert actors[0].neighbors() == [actors[1]]
+    assert actors[1].location_labels == ["Home", "school"]
+    assert actors[1].get_actor_weight(actors[2]) == 2
+    assert env.actors_by_label("school") == actors[1:]
+    assert str(env.actors) == "EntityList [4 actors]"
+    assert str(env.locations) == "EntityList [2 locations]"
+
+    env.remove_actor(actors[3])
+    assert school.actors == actors[1:3]
+    assert env.export_actor_network().number_of_edges() == 2
+
+
+def test_mixed_with_default_entities():
+    env = p2n.Environment()
+    compact_actor = Person()
+    actor = p2n.Actor()
+    location = p2n.Location()
+    env.add_actors([compact_actor, actor])
+    env.add_location(location)
+    location.add_actors([compact_actor, actor])
+
+    assert compact_actor.neighbors() == [actor]
+    assert str(env.actors) == "EntityList [2 actors]"
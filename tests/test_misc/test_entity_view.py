@@ -0,0 +1,151 @@
+import agentpy as ap
+import mesa
+import pytest
+
+import pop2net as p2n
+
+
+@pytest.fixture
+def env(backend):
+    env = p2n.Environment(backend=backend, lazy_views=True)
+    actors = [p2n.Actor() for _ in range(4)]
+    locations = [p2n.Location(), p2n.Location()]
+    env.add_actors(actors)
+    env.add_locations(locations)
+    locations[0].add_actors(actors[:3])
+    locations[1].add_actors(actors[2:])
+    return env
+
+
+def test_views_do_not_copy(env):
+    actors = env.actors
+    actor = actors[2]
+    home = actor.locations
+
+    assert isinstance(actors, p2n.EntityView)
+    assert len(actors) == 4
+    assert list(actors) == list(env._actors.values())
+    assert actor in actors
+    assert p2n.Actor() not in actors
+    assert len(home) == 2
+    assert env.locations[1] in home
+    assert env.locations[0].actors[2] is actor
+    assert set(actor.neighbors()) == {actors[0], actors[1], actors[3]}
+    assert actors[3] in actor.neighbors()
+    assert actors[2] not in actor.neighbors()
+    assert actors[-1] is actors[3]
+    with pytest.raises(IndexError):
+        actors[4]
+    assert actors._cached is None
+    assert home._cached is None
+
+
+def test_views_are_live(env):
+    actors = env.actors
+    location = env.locations[0]
+    members = location.actors
+    new_actor = p2n.Actor()
+    env.add_actor(new_actor)
+    location.add_actor(new_actor)
+    assert len(actors) == 5
+    assert new_actor in members
+
+    env.remove_actor(actors[0])
+    assert len(actors) == 4
+    assert len(members) == 3
+    assert actors[0] is env.actor_at(0)
+
+
+def test_views_of_removed_nodes(env):
+    actor = env.actors[0]
+    location = env.locations[0]
+    members = location.actors
+    home = actor.locations
+
+    env.remove_location(location)
+    assert list(home) == []
+    with pytest.raises(KeyError, match="location of this view was removed"):
+        len(members)
+    with pytest.raises(KeyError, match="location of this view was removed"):
+        members.materialize()
+    assert actor not in members
+
+    env.remove_actor(actor)
+    with pytest.raises(KeyError, match="actor of this view was removed"):
+        list(home)
+
+
+def test_list_methods(env):
+    actors = env.actors
+    assert actors == list(env._actors.values())
+    assert actors == env.actors
+    assert actors[1:3] == [env.actor_at(1), env.actor_at(2)]
+    assert actors.index(env.actor_at(2)) == 2
+    assert actors + [1] == [*env._actors.values(), 1]
+    assert str(actors) == "EntityList [4 actors]"
+    assert str(env.locations[0].actors) == "EntityList [3 actors]"
+
+    with pytest.raises(AttributeError, match="read-only"):
+        actors.append(p2n.Actor())
+    with pytest.raises(AttributeError, match="read-only"):
+        actors.remove(actors[0])
+    assert len(actors) == 4
+
+
+def test_materialized_container_is_reused(env):
+    actors = env.actors
+    container = actors.materialize()
+    assert isinstance(container, p2n.EntityList)
+    assert actors.materialize() is container
+    env.remove_actor(actors[0])
+    assert len(actors.materialize()) == 3
+
+
+def test_changing_the_environment_through_views(env):
+    actor = env.actors[2]
+    location = env.locations[0]
+    assert location.neighbors(actor) == [env.actors[0], env.actors[1]]
+    actor.remove_locations(actor.locations)
+    assert len(actor.locations) == 0
+    env.remove_actors(env.actors)
+    assert len(env.actors) == 0
+
+
+def test_setting_is_kept(env):
+    assert isinstance(env.fork().actors, p2n.EntityView)
+    assert isinstance(p2n.Environment().actors, p2n.EntityList)
+
+
+def test_agentpy_methods():
+    class Actor(p2n.Actor, ap.Agent):
+        def setup(self):
+            self.x = 0
+
+        def increase_x(self):
+            self.x += 1
+
+    model = ap.Model()
+    env = p2n.Environment(model=model, framework="agentpy", lazy_views=True)
+    env.add_actors(ap.AgentList(model, 3, Actor))
+    env.actors.increase_x()
+    assert [actor.x for actor in env.actors] == [1, 1, 1]
+    assert isinstance(env.actors.materialize(), ap.AgentList)
+    assert len(env.actors.select(env.actors.x == 1)) == 3
+
+
+def test_mesa_methods():
+    class Actor(p2n.Actor, mesa.Agent):
+        def __init__(self, model):
+            super().__init__(model)
+            self.x = 0
+
+        def increase_x(self):
+            self.x += 1
+
+    model = mesa.Model()
+    env = p2n.Environment(model=model, framework="mesa", lazy_views=True)
+    env.add_actors(Actor.create_agents(model=model, n=3))
+    env.actors.do("increase_x")
+    assert [actor.x for actor in env.actors] == [1, 1, 1]
+    assert isinstance(env.actors.materialize(), mesa.agent.AgentSet)
+    assert len(env.actors.select(lambda actor: actor.x == 1)) == 3
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+import pop2net as p2n
+
+
+class AgeWeightedSchool(p2n.Location):
+    calls = 0
+
+    def weight(self, actor):
+        return actor.age / 10
+
+    def weight_batch(self, actors):
+        AgeWeightedSchool.calls += 1
+        return np.array([actor.age for actor in actors]) / 10
+
+
+class Home(p2n.Location):
+    def weight(self, actor):
+        return actor.age % 3
+
+
+def _create_env(backend):
+    env = p2n.Environment(backend=backend)
+    actors = [p2n.Actor() for _ in range(6)]
+    for i, actor in enumerate(actors):
+        actor.age = i * 5
+    env.add_actors(actors)
+    schools = [AgeWeightedSchool(), AgeWeightedSchool()]
+    homes = [Home(), Home(), Home()]
+    env.add_locations([*schools, *homes])
+    schools[0].add_actors(actors[:4])
+    schools[1].add_actors(actors[3:])
+    for i, actor in enumerate(actors):
+        homes[i % 3].add_actor(actor)
+    return env, actors
+
+
+def test_default_weight_batch_uses_weight():
+    location = Home()
+    actors = [p2n.Actor() for _ in range(3)]
+    for i, actor in enumerate(actors):
+        actor.age = i + 1
+    assert location.weight_batch(actors).tolist() == [1, 2, 0]
+    assert location.weight_batch([]).tolist() == []
+
+
+def test_update_weights_uses_weight_batch(backend):
+    env, actors = _create_env(backend)
+    for actor in actors:
+        actor.age += 1
+
+    AgeWeightedSchool.calls = 0
+    env.update_weights()
+    assert AgeWeightedSchool.calls == 2
+
+    for location in env.locations:
+        for actor in location.actors:
+            assert location.get_weight(actor) == location.weight(actor)
+
+
+def test_update_weights_by_label(backend):
+    env, actors = _create_env(backend)
+    for actor in actors:
+        actor.age += 1
+
+    env.update_weights(location_labels=["Home"])
+    for location in env.locations:
+        for actor in location.actors:
+            expected = actor.age % 3 if location.label == "Home" else (actor.age - 1) / 10
+            assert location.get_weight(actor) == expected
+
+
+def test_update_weights_checks_weight_batch_length():
+    class BrokenLocation(p2n.Location):
+        def weight_batch(self, actors):
+            return np.ones(len(actors) + 1)
+
+    env = p2n.Environment()
+    actor = p2n.Actor()
+    location = BrokenLocation()
+    env.add_actor(actor)
+    env.add_location(location)
+    location.add_actor(actor)
+
+    with pytest.raises(ValueError, match="returned 2 weights for 1 actors"):
+        env.update_weights()
+
+
+class LoggedHome(Home):
+    def set_weight(self, actor, weight=None):
+        self.logged.append((actor.id_p2n, weight))
+        super().set_weight(actor, weight=2 * weight)
+
+
+def test_update_weights_uses_overridden_set_weight(backend):
+    env, actors = _create_env(backend)
+    home = LoggedHome()
+    home.logged = []
+    env.add_location(home)
+    home.add_actors(actors[:2])
+    home.logged.clear()
+    for actor in actors:
+        actor.age += 1
+
+    env.update_weights()
+    assert home.logged == [(actors[0].id_p2n, 1), (actors[1].id_p2n, 0)]
+    assert [home.get_weight(actor) for actor in actors[:2]] == [2, 0]
+    assert env.locations[0].get_weight(actors[0]) == actors[0].age / 10